@@ -0,0 +1,239 @@
+"""
+Skriptbarer Generator für synthetische Datensätze beliebiger Größe
+(10 bis 100.000 Personen), reproduzierbar über einen festen Seed.
+
+Erzeugt dieselben Layouts wie data.ipynb (personen.csv, teilaufgaben.csv)
+und zusätzlich projekte.csv, sodass die Dateien sowohl vom genetischen
+Matching als auch vom Massenimport der API gelesen werden können:
+
+    python generator.py --personen 10 1000 100000 --ziel synthetisch
+"""
+import argparse
+import os
+import uuid
+
+import numpy as np
+import pandas as pd
+
+# Kompetenzgruppen nach Fachrichtung (wie in data.ipynb)
+KOMPETENZEN_POOL = {
+    "Maschinenbau": ["CAD", "FEM", "Thermodynamik", "Mechanik"],
+    "Elektrotechnik": ["Schaltungstechnik", "Leistungselektronik", "Signalverarbeitung"],
+    "Informatik": ["Python", "Datenbanken", "KI", "Softwarearchitektur"],
+    "Physik": ["Quantenphysik", "Optik", "Statistische Mechanik"],
+    "Mathematik": ["Lineare Algebra", "Stochastik", "Numerik"],
+}
+FACHRICHTUNG_GEWICHTE = [0.25, 0.2, 0.3, 0.1, 0.15]
+
+# Anzahl Kompetenzen je Person (1 bis 4), wenige Generalisten
+ANZAHL_KOMPETENZEN_GEWICHTE = [0.35, 0.35, 0.2, 0.1]
+# Anteil der Kompetenzen aus der eigenen Fachrichtung
+ANTEIL_EIGENE_FACHRICHTUNG = 0.8
+
+# Kompetenzstufen A (niedrig) bis E (hoch) für Person.kompetenz bzw.
+# Aufgabe.minimale_kompetenz
+STUFEN = np.array(list("ABCDE"))
+STUFEN_GEWICHTE_PERSONEN = [0.3, 0.3, 0.2, 0.15, 0.05]
+STUFEN_GEWICHTE_AUFGABEN = [0.4, 0.3, 0.2, 0.1, 0.0]
+
+# Vollzeitanteil; Teilzeit gleichverteilt zwischen 0,4 und 0,9
+ANTEIL_VOLLZEIT = 0.6
+
+# Projektbelegung als Markow-Kette: Belegungen erstrecken sich meist über
+# mehrere Monate
+WAHRSCHEINLICHKEIT_BLEIBEN = 0.75
+ANTEIL_FREI = 0.3
+
+JAHR = 2025
+MONATE = [f"{m:02d}/{JAHR}" for m in range(1, 13)]
+PERSONEN_JE_PROJEKT = 50
+
+VORNAMEN = [
+    "Anna", "Lukas", "Marie", "Jonas", "Sophie", "Felix", "Lena", "Paul", "Laura", "Leon",
+    "Julia", "Finn", "Hannah", "Elias", "Emma", "Noah", "Mia", "Ben", "Clara", "Tim",
+    "Flora", "Irmtraut", "Karl", "Greta", "Otto", "Ida", "Emil", "Frieda", "Anton", "Luise",
+]
+NACHNAMEN = [
+    "Müller", "Schmidt", "Schneider", "Fischer", "Weber", "Meyer", "Wagner", "Becker", "Schulz", "Hoffmann",
+    "Koch", "Richter", "Klein", "Wolf", "Schröder", "Neumann", "Schwarz", "Braun", "Zimmermann", "Krüger",
+    "Kaul", "Sauer", "Hartmann", "Lange", "Werner", "Krause", "Lehmann", "Köhler", "Maier", "Fuchs",
+]
+
+
+def _uuids(rng, anzahl):
+    """Reproduzierbare UUIDs aus dem Zufallsgenerator."""
+    roh = rng.bytes(16 * anzahl)
+    return [str(uuid.UUID(bytes=roh[i:i + 16], version=4)) for i in range(0, 16 * anzahl, 16)]
+
+
+def _kompetenzen(rng, anzahl):
+    """
+    Kompetenzlisten je Person: eine Fachrichtung, daraus die meisten
+    Kompetenzen, vereinzelt fachfremde.
+    """
+    fachrichtungen = list(KOMPETENZEN_POOL)
+    alle = [k for gruppe in KOMPETENZEN_POOL.values() for k in gruppe]
+    fach = rng.choice(len(fachrichtungen), size=anzahl, p=FACHRICHTUNG_GEWICHTE)
+    anzahl_je_person = rng.choice(len(ANZAHL_KOMPETENZEN_GEWICHTE), size=anzahl, p=ANZAHL_KOMPETENZEN_GEWICHTE) + 1
+    zufall = rng.random((anzahl, 4))
+    reihenfolge = rng.random((anzahl, len(alle))).argsort(axis=1)
+
+    listen = []
+    for i in range(anzahl):
+        eigene = KOMPETENZEN_POOL[fachrichtungen[fach[i]]]
+        eigene_reihenfolge = rng.permutation(len(eigene))
+        gewaehlt = []
+        fremd = iter(reihenfolge[i])
+        for j in range(anzahl_je_person[i]):
+            if zufall[i, j] < ANTEIL_EIGENE_FACHRICHTUNG and j < len(eigene):
+                kandidat = eigene[eigene_reihenfolge[j]]
+            else:
+                kandidat = alle[next(fremd)]
+            while kandidat in gewaehlt:
+                kandidat = alle[next(fremd)]
+            gewaehlt.append(kandidat)
+        listen.append(gewaehlt)
+    return listen
+
+
+def _belegung(rng, anzahl, projekte):
+    """
+    Projektbelegung (Personen × Monate) als Markow-Kette: mit
+    WAHRSCHEINLICHKEIT_BLEIBEN bleibt es bei der Belegung des Vormonats,
+    sonst wird neu gezogen ("Frei" mit ANTEIL_FREI, sonst ein Projekt).
+    Index 0 steht für "Frei", k > 0 für projekte[k - 1].
+    """
+    def ziehe(n):
+        frei = rng.random(n) < ANTEIL_FREI
+        return np.where(frei, 0, rng.integers(1, len(projekte) + 1, size=n))
+
+    belegung = np.empty((anzahl, len(MONATE)), dtype=np.int64)
+    belegung[:, 0] = ziehe(anzahl)
+    for m in range(1, len(MONATE)):
+        bleiben = rng.random(anzahl) < WAHRSCHEINLICHKEIT_BLEIBEN
+        belegung[:, m] = np.where(bleiben, belegung[:, m - 1], ziehe(anzahl))
+    return belegung
+
+
+def generiere_personen(anzahl, rng, projekte):
+    """
+    Personen im Layout von personen.csv, ergänzt um die Kompetenzstufe
+    "kompetenz" (A-E) für die Datenbankalgorithmen.
+
+    Returns:
+        pd.DataFrame
+    """
+    vornamen = rng.choice(VORNAMEN, size=anzahl)
+    nachnamen = rng.choice(NACHNAMEN, size=anzahl)
+    vollzeit = rng.random(anzahl) < ANTEIL_VOLLZEIT
+    zeitbudget = np.where(vollzeit, 1.0, np.round(rng.uniform(0.4, 0.9, size=anzahl), 2))
+
+    belegung = _belegung(rng, anzahl, projekte)
+    verfuegbarkeit = np.where(belegung == 0, np.round(rng.uniform(0.4, 1.0, size=belegung.shape), 2), 0.0)
+    codes = np.array(["Frei"] + list(projekte), dtype=object)
+
+    daten = {
+        "id": _uuids(rng, anzahl),
+        "name": [f"{v} {n}" for v, n in zip(vornamen, nachnamen)],
+        "kompetenzen": [", ".join(k) for k in _kompetenzen(rng, anzahl)],
+        "zeitbudget": zeitbudget,
+    }
+    for m, monat in enumerate(MONATE):
+        daten[f"projektbelegung_{monat}"] = codes[belegung[:, m]]
+        daten[f"verfuegbarkeit_{monat}"] = verfuegbarkeit[:, m]
+    daten["kompetenz"] = rng.choice(STUFEN, size=anzahl, p=STUFEN_GEWICHTE_PERSONEN)
+    return pd.DataFrame(daten)
+
+
+def generiere_teilaufgaben(anzahl, rng, projekte, personen_df):
+    """
+    Teilaufgaben im Layout von teilaufgaben.csv, ergänzt um
+    "minimale_kompetenz" (A-D). Die geforderten Kompetenzen folgen ihrer
+    Häufigkeit im Personal, der Aufwand (PM) ist log-normalverteilt,
+    Zeiträume umfassen 1 bis 6 Monate innerhalb des Jahres.
+
+    Returns:
+        pd.DataFrame
+    """
+    haeufigkeit = personen_df["kompetenzen"].str.split(", ").explode().value_counts()
+    kompetenzen = haeufigkeit.index.to_numpy()
+    gewichte = haeufigkeit.to_numpy(dtype=np.float64)
+
+    dauer = rng.integers(1, 7, size=anzahl)
+    start = rng.integers(0, len(MONATE) - dauer + 1)
+    aufwand = np.clip(np.round(rng.lognormal(np.log(2.0), 0.6, size=anzahl) * 2) / 2, 0.5, 8.0)
+    kompetenz = rng.choice(kompetenzen, size=anzahl, p=gewichte / gewichte.sum())
+
+    return pd.DataFrame({
+        "bezeichnung": [f"{k} Arbeitspaket {i + 1}" for i, k in enumerate(kompetenz)],
+        "kompetenz": kompetenz,
+        "aufwand": aufwand,
+        "teilaufgabe_id": _uuids(rng, anzahl),
+        "projekt_id": rng.choice(np.array(projekte, dtype=object), size=anzahl),
+        "start": [MONATE[s] for s in start],
+        "ende": [MONATE[s + d - 1] for s, d in zip(start, dauer)],
+        "minimale_kompetenz": rng.choice(STUFEN, size=anzahl, p=STUFEN_GEWICHTE_AUFGABEN),
+    })
+
+
+def generiere_projekte(projekte, teilaufgaben_df):
+    """Projekte im Layout des Projektimports (projektname, projektstart, ...)."""
+    gruppen = teilaufgaben_df.groupby("projekt_id")
+    anzahl = gruppen.size()
+    start = gruppen["start"].agg(lambda s: min(s, key=lambda m: int(m[:2])))
+    ende = gruppen["ende"].agg(lambda s: max(s, key=lambda m: int(m[:2])))
+    stufe = gruppen["minimale_kompetenz"].max()
+    return pd.DataFrame({
+        "projektname": projekte,
+        "projektstart": [start.get(p, MONATE[0]) for p in projekte],
+        "projektende": [ende.get(p, MONATE[-1]) for p in projekte],
+        "anzahl_aufgaben": [int(anzahl.get(p, 0)) for p in projekte],
+        "kompetenz": [stufe.get(p, "A") for p in projekte],
+    })
+
+
+def generiere_datensatz(anzahl_personen, aufgaben_je_person=0.25, seed=42):
+    """
+    Erzeugt einen vollständigen Datensatz. Gleicher Seed und gleiche Größe
+    liefern immer dieselben Daten.
+
+    Args:
+        anzahl_personen (int): Anzahl der Personen
+        aufgaben_je_person (float): Verhältnis Teilaufgaben / Personen
+        seed (int): Seed des Zufallsgenerators
+
+    Returns:
+        tuple: (personen_df, teilaufgaben_df, projekte_df)
+    """
+    rng = np.random.default_rng([seed, anzahl_personen])
+    anzahl_projekte = max(3, anzahl_personen // PERSONEN_JE_PROJEKT)
+    projekte = [f"PROJ-{i + 1:04d}" for i in range(anzahl_projekte)]
+    anzahl_aufgaben = max(1, int(round(anzahl_personen * aufgaben_je_person)))
+
+    personen_df = generiere_personen(anzahl_personen, rng, projekte)
+    teilaufgaben_df = generiere_teilaufgaben(anzahl_aufgaben, rng, projekte, personen_df)
+    projekte_df = generiere_projekte(projekte, teilaufgaben_df)
+    return personen_df, teilaufgaben_df, projekte_df
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetische Personen- und Aufgabendaten erzeugen")
+    parser.add_argument("--personen", type=int, nargs="+", default=[10, 100, 1000, 10000, 100000],
+                        help="Datensatzgrößen (Anzahl Personen)")
+    parser.add_argument("--aufgaben-je-person", type=float, default=0.25)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--ziel", default="synthetisch", help="Zielverzeichnis")
+    args = parser.parse_args()
+
+    os.makedirs(args.ziel, exist_ok=True)
+    for anzahl in args.personen:
+        personen_df, teilaufgaben_df, projekte_df = generiere_datensatz(anzahl, args.aufgaben_je_person, args.seed)
+        personen_df.to_csv(os.path.join(args.ziel, f"personen_{anzahl}.csv"), index=False)
+        teilaufgaben_df.to_csv(os.path.join(args.ziel, f"teilaufgaben_{anzahl}.csv"), index=False)
+        projekte_df.to_csv(os.path.join(args.ziel, f"projekte_{anzahl}.csv"), index=False)
+        print(f"{anzahl} Personen, {len(teilaufgaben_df)} Teilaufgaben, {len(projekte_df)} Projekte "
+              f"gespeichert in '{args.ziel}'")
+
+
+if __name__ == "__main__":
+    main()
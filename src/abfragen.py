@@ -0,0 +1,93 @@
+import functools
+import os
+import threading
+from contextlib import contextmanager
+
+from flask import current_app
+from sqlalchemy import event
+
+# -----------------------------
+# Zählung der SQL-Abfragen je Request (Schutz vor N+1-Mustern)
+# -----------------------------
+
+_zaehler = threading.local()
+_beobachtete_engines = set()
+
+
+class AbfrageLimitUeberschritten(AssertionError):
+    """Ein Endpunkt hat mehr SQL-Abfragen abgesetzt als erlaubt."""
+
+
+def _zaehle(conn, cursor, statement, parameters, context, executemany):
+    stapel = getattr(_zaehler, "stapel", None)
+    if stapel:
+        for eintrag in stapel:
+            eintrag["anzahl"] += 1
+
+
+def beobachte_engine(engine):
+    """Hängt den Abfragezähler einmalig an eine Engine."""
+    if id(engine) not in _beobachtete_engines:
+        event.listen(engine, "before_cursor_execute", _zaehle)
+        _beobachtete_engines.add(id(engine))
+
+
+@contextmanager
+def zaehle_abfragen(engine):
+    """
+    Zählt alle SQL-Abfragen, die im aktuellen Thread innerhalb des Blocks
+    abgesetzt werden.
+
+    Beispiel:
+        with zaehle_abfragen(db.engine) as zaehler:
+            ...
+        zaehler["anzahl"]
+    """
+    beobachte_engine(engine)
+    eintrag = {"anzahl": 0}
+    if not hasattr(_zaehler, "stapel"):
+        _zaehler.stapel = []
+    _zaehler.stapel.append(eintrag)
+    try:
+        yield eintrag
+    finally:
+        _zaehler.stapel.remove(eintrag)
+
+
+def _streng():
+    """
+    Überschreitungen lösen unter pytest sowie im Test- und Debugbetrieb immer
+    eine Ausnahme aus; keine Konfiguration schaltet das ab.
+    """
+    return "PYTEST_CURRENT_TEST" in os.environ or current_app.testing or current_app.debug
+
+
+def abfrage_limit(maximal):
+    """
+    Dekorator für Views: Die Anzahl der SQL-Abfragen darf unabhängig von der
+    Zahl der gelieferten Zeilen höchstens `maximal` betragen.
+
+    In Tests (siehe _streng) löst eine Überschreitung
+    AbfrageLimitUeberschritten aus, im Produktivbetrieb wird sie geloggt.
+    Die gezählte Anzahl steht im Antwort-Header X-Anzahl-Abfragen.
+    """
+    def dekorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            from .models import db
+
+            with zaehle_abfragen(db.engine) as zaehler:
+                antwort = view(*args, **kwargs)
+
+            anzahl = zaehler["anzahl"]
+            if anzahl > maximal:
+                meldung = f"{view.__name__}: {anzahl} SQL-Abfragen (erlaubt: {maximal})"
+                if _streng():
+                    raise AbfrageLimitUeberschritten(meldung)
+                current_app.logger.warning(meldung)
+
+            antwort = current_app.make_response(antwort)
+            antwort.headers["X-Anzahl-Abfragen"] = str(anzahl)
+            return antwort
+        return wrapper
+    return dekorator
@@ -1,183 +1,350 @@
-from .models import Zuweisung, Person, Aufgabe, Projekt, db
-import numpy as np
-from scipy.optimize import linear_sum_assignment
-import re
+import logging
+import time
 
-def berechne_zuweisung_pro_projekt():
-    projekte = Projekt.query.all()
+from .models import Person, Aufgabe, Projekt, db
+from .kostenmatrix import baue_kostenmatrix, loese_kostenmatrix, kostenmatrix_aus_arrays
+from .projektloesung import ALGORITHMUS_PRO_PROJEKT, loese_projekte, unzulaessige_paare
+from .stundenplanung import verteile_stunden_aus_snapshot, stunden_eingaben_aus_snapshot
+from .stundenengines import ENGINES, verteile_python, verteile_numpy, verteile_fluss
+from .flussplanung import verteile_stunden_fluss, Flussfehler
+from .monate import monat_ordinal
+from .verfuegbarkeit import verfuegbarkeits_speicher, beobachte_personen
+from .laeufe import (neuer_lauf, aktiver_lauf_id, schreibe_eingaben, lade_eingaben, ersetze_teilergebnis,
+                     Zuweisungslauf)
+from .inkrementell import eingaben_personen, eingaben_aufgaben, geaendert, betroffene_projekte
+from .jobs import fortschritt
+from .metriken import metriken, protokolliere
+from .snapshot import lade_snapshot
+from .kompetenzindex import kompetenz_index, beobachte_personen as beobachte_kompetenzen
+from .verfuegbarkeitstabelle import (verfuegbare_personen, stelle_nachgefuehrt_sicher,
+                                     beobachte_personen as beobachte_verfuegbarkeiten)
 
-    if not projekte:
-        print("❌ Keine Projekte in der Datenbank gefunden.")
-        return
+# Geänderte Personen im Verfügbarkeitsspeicher invalidieren
+beobachte_personen(Person)
+beobachte_kompetenzen(Person)
+beobachte_verfuegbarkeiten(Person)
 
-    for projekt in projekte:
-        print(f"🔄 Verarbeite Projekt: {projekt.projektname}")
-        
-        # Alle Aufgaben und Personen für das aktuelle Projekt abrufen
-        aufgaben = Aufgabe.query.filter_by(projekt_id=projekt.id).all()
-        personen = Person.query.all()
+def _kompetenz_plaetze(personen):
+    """Kompetenzindex mit allen Personen und deren Plätze in Listenreihenfolge."""
+    index = kompetenz_index.lade(personen)
+    return index, index.plaetze([p.id for p in personen])
 
+
+def _berechne_projekte(personen, je_projekt, namen, index, plaetze, worker=None, inkrementell=False):
+    """
+    Löst alle Projekte und protokolliert jedes einzeln.
+
+    Args:
+        je_projekt (dict): Projekt-ID -> Aufgaben, in der gewünschten Reihenfolge
+        namen (dict): Projekt-ID -> Projektname
+
+    Returns:
+        tuple: ({Projekt-ID: [(person_id, aufgabe_id, kosten), ...]},
+                Status je Projekt [{"projekt_id", "projekt", "status", "aufgaben", "zuweisungen", ...}, ...])
+    """
+    status = {}
+    loesbar = {}
+    for projekt_id, aufgaben in je_projekt.items():
+        status[projekt_id] = {"projekt_id": projekt_id, "projekt": namen.get(projekt_id),
+                              "status": "uebersprungen", "aufgaben": len(aufgaben), "zuweisungen": 0}
         if not aufgaben or not personen:
-            print(f"⚠️ Projekt {projekt.projektname} hat keine Aufgaben oder es gibt keine Personen.")
-            continue
-
-        # Kostenmatrix erstellen
-        kostenmatrix = []
-        for person in personen:
-            kostenreihe = []
-            for aufgabe in aufgaben:
-                if ord(person.kompetenz) >= ord(aufgabe.minimale_kompetenz):
-                    kosten = aufgabe.arbeitsaufwand / person.teilzeitfaktor
-                else:
-                    kosten = float('inf')  # Hohe Kosten für ungeeignete Kandidaten
-                kostenreihe.append(kosten)
-            kostenmatrix.append(kostenreihe)
+            protokolliere("projekt_uebersprungen", logging.WARNING, projekt=namen.get(projekt_id),
+                          aufgaben=len(aufgaben), personen=len(personen))
+        else:
+            loesbar[projekt_id] = aufgaben
 
-        kostenmatrix = np.array(kostenmatrix)
+    ergebnisse = {}
+    with metriken.phase("loesen", algorithmus=ALGORITHMUS_PRO_PROJEKT, inkrementell=inkrementell):
+        for nr, (projekt_id, ergebnis, dauer) in enumerate(loese_projekte(personen, loesbar, index, plaetze, worker)):
+            eintrag = status[projekt_id]
+            if isinstance(ergebnis, Exception):
+                protokolliere("projekt_fehlgeschlagen", logging.ERROR, projekt=eintrag["projekt"], fehler=ergebnis)
+                eintrag.update(status="fehlgeschlagen", fehler=str(ergebnis))
+            else:
+                ergebnisse[projekt_id] = ergebnis
+                protokolliere("projekt_berechnet", projekt=eintrag["projekt"], zuweisungen=len(ergebnis))
+                eintrag.update(status="berechnet", zuweisungen=len(ergebnis), dauer_s=round(dauer, 6))
+            fortschritt(0.2 + 0.6 * (nr + 1) / len(loesbar))
+    return ergebnisse, list(status.values())
 
-        # Prüfen, ob die Kostenmatrix valide ist
-        if kostenmatrix.shape[0] == 0 or kostenmatrix.shape[1] == 0:
-            print(f"⚠️ Leere oder ungültige Kostenmatrix für Projekt {projekt.projektname}.")
-            continue
 
-        # Kuhn-Munkres-Algorithmus anwenden
-        try:
-            personen_index, aufgaben_index = linear_sum_assignment(kostenmatrix)
-        except Exception as e:
-            print(f"❌ Fehler beim Anwenden des Algorithmus für Projekt {projekt.projektname}: {e}")
-            continue
-
-        # Zuweisungen speichern
-        for p_idx, a_idx in zip(personen_index, aufgaben_index):
-            if kostenmatrix[p_idx][a_idx] < float('inf'):
-                neue_zuweisung = Zuweisung(
-                    person_id=personen[p_idx].id,
-                    aufgabe_id=aufgaben[a_idx].id,
-                    kosten=kostenmatrix[p_idx][a_idx]
-                )
-                db.session.add(neue_zuweisung)
+def berechne_zuweisung_pro_projekt(worker=None):
+    """
+    Kuhn-Munkres getrennt je Projekt als ein gemeinsamer neuer Lauf.
+    Personen, Aufgaben und Projekte werden je einmal geladen, die Aufgaben im
+    Speicher nach Projekt gruppiert und die Projekte parallel gelöst; alle
+    Ergebnisse werden in einer Transaktion gespeichert.
 
-        try:
-            db.session.commit()
-            print(f"✅ Zuweisungen für Projekt {projekt.projektname} erfolgreich berechnet und gespeichert.")
-        except Exception as e:
-            db.session.rollback()
-            print(f"❌ Fehler beim Speichern der Zuweisungen für Projekt {projekt.projektname}: {e}")
+    Args:
+        worker (int): Prozesse für die Projekte; None = Anzahl CPUs, 1 = ohne Pool
 
-# -----------------------------
-# ScoreMatching-Algorithmus (stundenbasiert, heuristisch)
-# -----------------------------
+    Returns:
+        dict: Lauf-ID, Anzahl Zuweisungen und Status je Projekt ("projektstatus")
+    """
+    start = time.perf_counter()
+    fortschritt(0.05, "Daten laden")
+    with metriken.phase("laden", algorithmus=ALGORITHMUS_PRO_PROJEKT):
+        projekte = Projekt.query.order_by(Projekt.id).all()
+
+        if not projekte:
+            protokolliere("keine_projekte", logging.WARNING, algorithmus=ALGORITHMUS_PRO_PROJEKT)
+            return {"error": "Keine Projekte in der Datenbank gefunden."}
+
+        # Feste Reihenfolge nach ID, damit inkrementelle Läufe dieselbe Lösung finden
+        personen = Person.query.order_by(Person.id).all()
+        aufgaben = Aufgabe.query.order_by(Aufgabe.id).all()
+        index, plaetze = _kompetenz_plaetze(personen)
+
+    # Aufgaben einmal im Speicher nach Projekt gruppieren
+    je_projekt = {projekt.id: [] for projekt in projekte}
+    for a in aufgaben:
+        if a.projekt_id in je_projekt:
+            je_projekt[a.projekt_id].append(a)
+    namen = {projekt.id: projekt.projektname for projekt in projekte}
+
+    fortschritt(0.2, f"{len(projekte)} Projekte berechnen")
+    ergebnisse, projektstatus = _berechne_projekte(personen, je_projekt, namen, index, plaetze, worker)
+
+    # Alle Projekte landen in einem gemeinsamen Lauf; Ergebnisse und Eingaben
+    # (für spätere inkrementelle Läufe) werden in einer Transaktion geschrieben
+    fortschritt(0.8, "Ergebnisse speichern")
+    with metriken.phase("speichern", algorithmus=ALGORITHMUS_PRO_PROJEKT):
+        with neuer_lauf(ALGORITHMUS_PRO_PROJEKT, eine_transaktion=True, start=start) as lauf:
+            lauf.schreibe(z for projekt_id in je_projekt for z in ergebnisse.get(projekt_id, ()))
+            schreibe_eingaben(lauf.lauf_id, eingaben_personen(personen),
+                              eingaben_aufgaben([a for liste in je_projekt.values() for a in liste]), commit=False)
+
+    metriken.zaehle("zuweisungen", lauf.anzahl, algorithmus=ALGORITHMUS_PRO_PROJEKT)
+    metriken.zaehle("berechnungen", algorithmus=ALGORITHMUS_PRO_PROJEKT)
+    protokolliere("lauf_gespeichert", algorithmus=ALGORITHMUS_PRO_PROJEKT, lauf_id=lauf.lauf_id, zuweisungen=lauf.anzahl)
+    return {"message": "Zuweisungen pro Projekt berechnet.", "lauf_id": lauf.lauf_id, "anzahl": lauf.anzahl,
+            "inkrementell": False, "projektstatus": projektstatus}
+
+def berechne_zuweisung_pro_projekt_inkrementell(worker=None):
+    """
+    Berechnet nach Änderungen an Personen oder Aufgaben nur die betroffenen
+    Projekte neu (siehe inkrementell.betroffene_projekte) und ersetzt deren
+    Zuweisungen im aktiven Lauf; alle übrigen Projekte bleiben unverändert.
+    Das Ergebnis entspricht einer vollständigen Neuberechnung mit
+    berechne_zuweisung_pro_projekt.
+
+    Ist kein Lauf pro Projekt aktiv, wird vollständig berechnet.
+    """
+    fortschritt(0.05, "Änderungen ermitteln")
+    lauf_id = aktiver_lauf_id()
+    lauf = db.session.get(Zuweisungslauf, lauf_id) if lauf_id is not None else None
+    eingaben = lade_eingaben(lauf_id) if lauf is not None and lauf.algorithmus == ALGORITHMUS_PRO_PROJEKT else None
+    if eingaben is None:
+        return berechne_zuweisung_pro_projekt(worker)
 
-def parse_verfuegbarkeit(verf_str):
+    with metriken.phase("laden", algorithmus=ALGORITHMUS_PRO_PROJEKT, inkrementell=True):
+        personen = Person.query.order_by(Person.id).all()
+        index, plaetze = _kompetenz_plaetze(personen)
+        namen = dict(db.session.query(Projekt.id, Projekt.projektname))
+        aufgaben = [a for a in Aufgabe.query.order_by(Aufgabe.id).all() if a.projekt_id in namen]
+
+    alt_personen, alt_aufgaben = eingaben
+    neu_personen, neu_aufgaben = eingaben_personen(personen), eingaben_aufgaben(aufgaben)
+    geaenderte_personen = geaendert(alt_personen, neu_personen)
+    geaenderte_aufgaben = geaendert(alt_aufgaben, neu_aufgaben)
+    projekte = betroffene_projekte(alt_personen, neu_personen, alt_aufgaben, neu_aufgaben)
+
+    if not geaenderte_personen and not geaenderte_aufgaben:
+        return {"message": "Keine Änderungen seit dem letzten Lauf.", "lauf_id": lauf_id, "projekte": [],
+                "inkrementell": True}
+
+    # Nur die betroffenen Projekte neu lösen
+    fortschritt(0.2, f"{len(projekte)} Projekte neu berechnen")
+    je_projekt = {projekt_id: [] for projekt_id in sorted(projekte) if projekt_id in namen}
+    for a in aufgaben:
+        if a.projekt_id in je_projekt:
+            je_projekt[a.projekt_id].append(a)
+    ergebnisse, projektstatus = _berechne_projekte(personen, je_projekt, namen, index, plaetze, worker,
+                                                   inkrementell=True)
+    zuweisungen = [z for projekt_id in je_projekt for z in ergebnisse.get(projekt_id, ())]
+
+    fortschritt(0.8, "Teilergebnis speichern")
+    aufgaben_ids = {a_id for a_id, eingabe in alt_aufgaben.items() if eingabe[0] in projekte}
+    aufgaben_ids.update(a.id for a in aufgaben if a.projekt_id in projekte)
+    with metriken.phase("speichern", algorithmus=ALGORITHMUS_PRO_PROJEKT, inkrementell=True):
+        anzahl = ersetze_teilergebnis(
+            lauf_id, aufgaben_ids, zuweisungen,
+            {p: neu_personen[p] for p in geaenderte_personen if p in neu_personen},
+            {a: neu_aufgaben[a] for a in geaenderte_aufgaben if a in neu_aufgaben},
+            [p for p in geaenderte_personen if p not in neu_personen],
+            [a for a in geaenderte_aufgaben if a not in neu_aufgaben],
+        )
+    metriken.zaehle("zuweisungen", len(zuweisungen), algorithmus=ALGORITHMUS_PRO_PROJEKT)
+    metriken.zaehle("berechnungen", algorithmus=ALGORITHMUS_PRO_PROJEKT, inkrementell=True)
+    return {
+        "message": "Betroffene Projekte neu berechnet.",
+        "lauf_id": lauf_id,
+        "anzahl": anzahl,
+        "projekte": sorted(projekte),
+        "geaenderte_personen": len(geaenderte_personen),
+        "geaenderte_aufgaben": len(geaenderte_aufgaben),
+        "inkrementell": True,
+        "projektstatus": projektstatus,
+    }
+
+def berechne_zuweisungen_kuhn_munkres(snapshot=None):
     """
-    Wandelt den Verfügbarkeitsstring aus der Datenbank (z. B. "01/2025:0.5,02/2025:1.0")
-    in ein Dictionary um: {"01/2025": 0.5, "02/2025": 1.0}
+    Optimale 1:1-Zuweisung aller Personen und Aufgaben (Kuhn-Munkres) als
+    neuer Lauf.
+
+    Args:
+        snapshot: optional Snapshot oder Pfad (siehe snapshot.py) als Eingabe
+                  statt der Datenbank; die IDs müssen in der Datenbank existieren
     """
-    monate = {}
-    for eintrag in verf_str.split(","):
-        match = re.match(r"(\d{2}/\d{4}):([\d.]+)", eintrag.strip())
-        if match:
-            monat, wert = match.groups()
-            monate[monat] = float(wert)
-    return monate
+    start = time.perf_counter()
+    fortschritt(0.05, "Daten laden")
+    parameter = {}
+    with metriken.phase("laden", algorithmus="kuhn-munkres"):
+        if snapshot is not None:
+            snapshot = lade_snapshot(snapshot)
+            personen_ids, aufgaben_ids = snapshot.person_id.tolist(), snapshot.aufgabe_id.tolist()
+            parameter["snapshot"] = snapshot.gespeicherter_fingerabdruck or snapshot.fingerabdruck()
+        else:
+            personen = Person.query.all()
+            aufgaben = Aufgabe.query.all()
+            personen_ids, aufgaben_ids = [p.id for p in personen], [a.id for a in aufgaben]
 
+    if not personen_ids or not aufgaben_ids:
+        return {"error": "Keine Personen oder Aufgaben in der Datenbank gefunden."}
 
-def berechne_zuweisungen_stundenbasiert():
+    fortschritt(0.2, "Kostenmatrix aufbauen")
+    with metriken.phase("kostenmatrix", algorithmus="kuhn-munkres"):
+        if snapshot is not None:
+            unzulaessig = ~snapshot.kompetenzindex().eignung(snapshot.anforderungen())
+            kostenmatrix, unzulaessig = kostenmatrix_aus_arrays(
+                snapshot.person_rang, snapshot.teilzeitfaktor, snapshot.aufgabe_rang, snapshot.aufwand, unzulaessig
+            )
+        else:
+            index, plaetze = _kompetenz_plaetze(personen)
+            kostenmatrix, unzulaessig = baue_kostenmatrix(personen, aufgaben, unzulaessige_paare(index, plaetze, aufgaben))
+    metriken.zaehle("unzulaessige_paare", int(unzulaessig.sum()), algorithmus="kuhn-munkres")
+
+    fortschritt(0.4, "Zuweisung berechnen")
+    with metriken.phase("loesen", algorithmus="kuhn-munkres"):
+        personen_index, aufgaben_index = loese_kostenmatrix(kostenmatrix)
+
+    # Ergebnis als neuer Lauf schreiben und erst danach aktivieren
+    fortschritt(0.8, "Ergebnisse speichern")
+    with metriken.phase("speichern", algorithmus="kuhn-munkres"):
+        with neuer_lauf("kuhn-munkres", parameter, start=start) as lauf:
+            lauf.schreibe(
+                (personen_ids[p_idx], aufgaben_ids[a_idx], kostenmatrix[p_idx, a_idx])
+                for p_idx, a_idx in zip(personen_index, aufgaben_index)
+            )
+    metriken.zaehle("zuweisungen", lauf.anzahl, algorithmus="kuhn-munkres")
+    metriken.zaehle("berechnungen", algorithmus="kuhn-munkres")
+
+    antwort = {
+        "message": "Optimale Zuweisungen erfolgreich berechnet und gespeichert.",
+        "lauf_id": lauf.lauf_id,
+        "anzahl": lauf.anzahl
+    }
+    return antwort
+
+# -----------------------------
+# ScoreMatching-Algorithmus (stundenbasiert, heuristisch)
+# -----------------------------
+
+def berechne_zuweisungen_stundenbasiert(engine="python", snapshot=None):
     """
     Hauptfunktion für stundenbasierte Aufgabenverteilung.
     Personen mit ausreichender Kompetenz und verfügbarer Zeit
     werden heuristisch auf Aufgaben verteilt.
+
+    Args:
+        engine (str): "python" (Schleife je Person), "numpy" (Matrix-Engine
+                      aus stundenplanung.py, liefert dieselbe Verteilung,
+                      siehe tests/test_stundenengines.py) oder
+                      "fluss" (alle Aufgaben in einem LP als kostenminimaler
+                      Fluss, siehe flussplanung.py; meldet die Bedarfsdeckung)
+        snapshot: optional Snapshot oder Pfad als Eingabe statt der Datenbank
+                  (NumPy- oder Fluss-Engine)
     """
 
+    if engine not in ENGINES:
+        return {"error": f"Unbekannte Engine {engine!r} (erlaubt: {', '.join(ENGINES)})"}
+
     # Alle relevanten Daten aus der Datenbank laden
-    personen = Person.query.all()
-    aufgaben = Aufgabe.query.all()
-
-    if not personen or not aufgaben:
-        return {"error": "Keine Personen oder Aufgaben gefunden."}
-
-    belegungen = {}  # Speichert pro Person und Monat die bereits belegten Stunden
-    matching_ergebnisse = []  # Liste für Reporting / Export
-
-    for ta in aufgaben:
-        # Zeitraum und Aufwand der Aufgabe vorbereiten
-        ta_start = int(ta.startmonat.split("/")[0])
-        ta_ende = int(ta.endmonat.split("/")[0])
-        aufwand_stunden = int(ta.arbeitsaufwand * 160)  # Aufwand in Stunden
-        reststunden = aufwand_stunden
-        kandidaten = []
-
-        # Über alle Personen iterieren
-        for p in personen:
-            # Kompetenzprüfung: Person muss mindestens geforderte Kompetenz haben
-            if ta.minimale_kompetenz > p.kompetenz:
-                continue
-
-            # Verfügbarkeiten der Person parsen
-            verf_dict = parse_verfuegbarkeit(p.verfuegbare_monate)
-            pid = p.id
-
-            verf_stunden = 0
-            monatlich = {}
-
-            # Verfügbarkeit je Monat berechnen
-            for m in range(ta_start, ta_ende + 1):
-                monat_label = f"{m:02d}/2025"
-                pm = verf_dict.get(monat_label, 0)  # PM aus Verfügbarkeit
-                ist_stunden = pm * 160 / p.teilzeitfaktor  # Umrechnen auf reale Stunden
-                belegt = belegungen.get(pid, {}).get(monat_label, 0)
-                frei = max(0, ist_stunden - belegt)
-                monatlich[monat_label] = frei
-                verf_stunden += frei
-
-            # Nur Personen mit verfügbarer Zeit in die Kandidatenliste aufnehmen
-            if verf_stunden > 0:
-                kandidaten.append((p, verf_stunden, monatlich))
-
-        # Kandidaten sortieren: wer hat am meisten Zeit, kommt zuerst
-        kandidaten.sort(key=lambda x: x[1], reverse=True)
-
-        # Versuche, Aufgabe auf einen Kandidaten zu verteilen
-        for person, verf_stunden, rest_by_month in kandidaten:
-            if reststunden <= 0:
-                break  # Aufgabe ist vollständig zugewiesen
-
-            pid = person.id
-            belegungen.setdefault(pid, {})
-            zugewiesen = 0
-
-            # Über Monate iterieren und Stunden zuteilen
-            for monat, rest in rest_by_month.items():
-                if rest <= 0 or reststunden <= 0:
-                    continue
-                anteil = min(reststunden, rest)
-                belegungen[pid][monat] = belegungen[pid].get(monat, 0) + anteil
-                zugewiesen += anteil
-                reststunden -= anteil
-                if reststunden <= 0:
-                    break  # Aufgabe ist fertig verplant
-
-            # Speichere die Zuweisung, wenn überhaupt Stunden zugewiesen wurden
-            if zugewiesen > 0:
-                z = Zuweisung(
-                    person_id=pid,
-                    aufgabe_id=ta.id,
-                    kosten=zugewiesen  # Speichere Zuweisungskosten als Stunden
-                )
-                db.session.add(z)
-
-                # Optional für Reporting oder Export
-                matching_ergebnisse.append({
-                    "person": f"{person.vorname} {person.nachname}",
-                    "aufgabe": ta.aufgabe,
-                    "projekt": ta.projekt.projektname,
-                    "stunden": zugewiesen
-                })
-
-    # Versuche, die Zuweisungen in der DB zu speichern
+    start = time.perf_counter()
+    fortschritt(0.05, "Daten laden")
+    parameter = {"engine": engine}
+    with metriken.phase("laden", algorithmus="stundenbasiert"):
+        if snapshot is not None:
+            snapshot = lade_snapshot(snapshot)
+            parameter = {"engine": "fluss" if engine == "fluss" else "numpy",
+                         "snapshot": snapshot.gespeicherter_fingerabdruck or snapshot.fingerabdruck()}
+            if not snapshot.anzahl_personen or not snapshot.anzahl_aufgaben:
+                return {"error": "Keine Personen oder Aufgaben gefunden."}
+        else:
+            aufgaben = Aufgabe.query.all()
+            if not aufgaben:
+                return {"error": "Keine Personen oder Aufgaben gefunden."}
+
+            # Nur Personen laden, die im Zeitraum der Aufgaben überhaupt Kapazität
+            # haben; alle anderen können keine Stunden übernehmen
+            von = min(monat_ordinal(ta.startmonat) for ta in aufgaben)
+            bis = max(monat_ordinal(ta.endmonat) for ta in aufgaben)
+            stelle_nachgefuehrt_sicher()
+            personen = verfuegbare_personen(von, bis).all()
+            if not personen:
+                return {"error": "Keine Personen oder Aufgaben gefunden."}
+
+            # Verfügbarkeiten einmalig aus dem Speicher holen statt pro Aufgabe zu parsen
+            verfuegbarkeit = verfuegbarkeits_speicher.lade(personen)
+            zeilen = [verfuegbarkeit.index[p.id] for p in personen]
+
+    fortschritt(0.2, "Stunden verteilen")
+    abdeckung = None
+    # Abbruchpunkte für Jobs: alle 100 Aufgaben bzw. vor und nach dem Fluss-LP
+    melde = lambda anteil: fortschritt(0.2 + 0.7 * anteil)
+    with metriken.phase("loesen", algorithmus="stundenbasiert", engine=parameter["engine"]):
+        try:
+            if snapshot is not None:
+                personen_ids, aufgaben_ids = snapshot.person_id.tolist(), snapshot.aufgabe_id.tolist()
+                if engine == "fluss":
+                    ergebnisse, abdeckung = verteile_stunden_fluss(
+                        *stunden_eingaben_aus_snapshot(snapshot), snapshot.teilzeitfaktor,
+                        kompetenzindex=snapshot.kompetenzindex(),
+                        anforderungen=snapshot.anforderungen(offen_ohne_anforderung=True),
+                        fortschritt=melde,
+                    )
+                else:
+                    ergebnisse = verteile_stunden_aus_snapshot(snapshot, fortschritt=melde)
+                zuweisungen = [
+                    (personen_ids[p_idx], aufgaben_ids[a_idx], stunden)
+                    for a_idx, p_idx, stunden in ergebnisse
+                ]
+            else:
+                index, plaetze = _kompetenz_plaetze(personen)
+                eingaben = (personen, aufgaben, verfuegbarkeit, zeilen, index, plaetze)
+                if engine == "fluss":
+                    ergebnisse, abdeckung = verteile_fluss(*eingaben, fortschritt=melde)
+                elif engine == "numpy":
+                    ergebnisse = verteile_numpy(*eingaben, fortschritt=melde)
+                else:
+                    ergebnisse = verteile_python(*eingaben, fortschritt=melde)
+                zuweisungen = [(person.id, ta.id, zugewiesen) for person, ta, zugewiesen in ergebnisse]
+        except Flussfehler as e:
+            protokolliere("fluss_fehlgeschlagen", logging.ERROR, algorithmus="stundenbasiert", fehler=e)
+            return {"error": str(e)}
+
+    # Zuweisungen als neuen Lauf speichern (Kosten = Stunden) und aktivieren
+    fortschritt(0.9, "Ergebnisse speichern")
     try:
-        db.session.commit()
-        return {"message": "Stundenbasierte Zuweisungen gespeichert.", "anzahl": len(matching_ergebnisse)}
+        with metriken.phase("speichern", algorithmus="stundenbasiert"):
+            with neuer_lauf("stundenbasiert", parameter, start=start) as lauf:
+                lauf.schreibe(zuweisungen)
+        metriken.zaehle("zuweisungen", lauf.anzahl, algorithmus="stundenbasiert")
+        metriken.zaehle("berechnungen", algorithmus="stundenbasiert")
+        antwort = {"message": "Stundenbasierte Zuweisungen gespeichert.", "anzahl": len(zuweisungen),
+                   "lauf_id": lauf.lauf_id}
+        if abdeckung is not None:
+            antwort["abdeckung"] = abdeckung
+        return antwort
     except Exception as e:
-        db.session.rollback()
         return {"error": str(e)}
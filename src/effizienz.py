@@ -0,0 +1,50 @@
+import numpy as np
+
+# -----------------------------
+# Effizienz-Score eines Plans: eingesetzte Personen + Pausen zwischen Blöcken
+# -----------------------------
+
+
+def effizienz_score(personen, start, ende):
+    """
+    Vektorisierte Fassung von berechne_effizienz_score aus dem Notebook
+    scoreMatching_stundenbasiert: Anzahl eingesetzter Personen plus die Summe
+    der Pausen in Stunden. Eine Pause ist der positive Abstand zwischen dem
+    Ende eines Blocks und dem Start des nächsten Blocks derselben Person
+    (nach Start sortiert). Je kleiner der Score, desto besser.
+
+    Args:
+        personen (np.ndarray): Personenschlüssel je Block (IDs oder Namen)
+        start, ende (np.ndarray): Zeitpunkte je Block (datetime64 oder Text)
+
+    Returns:
+        dict: {"score", "mitarbeiter", "pause_stunden",
+               "personen": [{"person", "bloecke", "pause_stunden"}, ...]}
+    """
+    schluessel, person = np.unique(np.asarray(personen), return_inverse=True)
+    person = person.ravel()
+    start = np.asarray(start, dtype="datetime64[s]")
+    ende = np.asarray(ende, dtype="datetime64[s]")
+
+    # Einmal nach (Person, Start) sortieren, bei gleichem Start nach Ende
+    reihenfolge = np.lexsort((ende, start, person))
+    person, start, ende = person[reihenfolge], start[reihenfolge], ende[reihenfolge]
+
+    pause = np.zeros(len(person), dtype=np.float64)
+    if len(person) > 1:
+        abstand = (start[1:] - ende[:-1]).astype(np.float64) / 3600.0
+        pause[1:] = np.where(person[1:] == person[:-1], np.clip(abstand, 0.0, None), 0.0)
+
+    pause_je_person = np.bincount(person, weights=pause, minlength=len(schluessel))
+    bloecke_je_person = np.bincount(person, minlength=len(schluessel))
+    pause_gesamt = float(pause_je_person.sum())
+
+    return {
+        "score": len(schluessel) + pause_gesamt,
+        "mitarbeiter": len(schluessel),
+        "pause_stunden": pause_gesamt,
+        "personen": [
+            {"person": p, "bloecke": b, "pause_stunden": h}
+            for p, b, h in zip(schluessel.tolist(), bloecke_je_person.tolist(), pause_je_person.tolist())
+        ],
+    }
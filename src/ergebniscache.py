@@ -0,0 +1,131 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from .models import Person, Aufgabe, Projekt, db
+from .laeufe import Zuweisungslauf, aktiver_lauf_id, aktiviere, STATUS_AKTIV, STATUS_ABGELOEST
+from .listen import tabellen_versionen
+from .verfuegbarkeitstabelle import Verfuegbarkeit
+
+# -----------------------------
+# Ergebniscache: Fingerabdruck der Eingabedaten -> gespeicherter Lauf
+# -----------------------------
+
+CACHE_GROESSE = 32
+
+# Tabellen, deren Inhalt in die Zuweisung eingeht
+_TABELLEN = tuple(modell.__tablename__ for modell in (Person, Aufgabe, Projekt, Verfuegbarkeit))
+
+
+def fingerabdruck(algorithmus, parameter=None):
+    """
+    Fingerabdruck aus Algorithmus, Parametern und den Änderungszählern
+    (Tabellenversion) aller Eingabetabellen: eine Abfrage, unabhängig von der
+    Zahl der Zeilen.
+    """
+    h = hashlib.blake2b(digest_size=20)
+    h.update(json.dumps([algorithmus, parameter or {}, tabellen_versionen(_TABELLEN)],
+                        sort_keys=True, default=str).encode("utf-8"))
+    return h.hexdigest()
+
+
+class Ergebniscache:
+    """
+    LRU-Zuordnung Fingerabdruck -> (Lauf-ID, Antwort) mit fester
+    Höchstgröße und Treffer-/Fehlschlagzählern. Die Ergebnisse selbst liegen
+    als Läufe in der Datenbank; ein Treffer schaltet nur den Zeiger um.
+    """
+
+    def __init__(self, groesse=CACHE_GROESSE):
+        self.groesse = groesse
+        self.treffer = 0
+        self.fehlschlaege = 0
+        self._eintraege = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hole(self, schluessel):
+        with self._lock:
+            eintrag = self._eintraege.get(schluessel)
+            if eintrag is not None:
+                self._eintraege.move_to_end(schluessel)
+            return eintrag
+
+    def lege_ab(self, schluessel, lauf_id, antwort):
+        with self._lock:
+            self._eintraege[schluessel] = (lauf_id, antwort)
+            self._eintraege.move_to_end(schluessel)
+            while len(self._eintraege) > self.groesse:
+                self._eintraege.popitem(last=False)
+
+    def verwerfe(self, schluessel):
+        with self._lock:
+            self._eintraege.pop(schluessel, None)
+
+    def verwerfe_lauf(self, lauf_id):
+        """Entfernt alle Einträge, die auf einen (veränderten) Lauf zeigen."""
+        with self._lock:
+            for schluessel in [s for s, (l_id, _) in self._eintraege.items() if l_id == lauf_id]:
+                del self._eintraege[schluessel]
+
+    def leere(self):
+        with self._lock:
+            self._eintraege.clear()
+
+    def zaehle(self, treffer):
+        with self._lock:
+            if treffer:
+                self.treffer += 1
+            else:
+                self.fehlschlaege += 1
+
+    def statistik(self):
+        with self._lock:
+            treffer, fehlschlaege, eintraege = self.treffer, self.fehlschlaege, len(self._eintraege)
+        anfragen = treffer + fehlschlaege
+        return {
+            "treffer": treffer,
+            "fehlschlaege": fehlschlaege,
+            "trefferquote": round(treffer / anfragen, 4) if anfragen else 0.0,
+            "eintraege": eintraege,
+            "groesse": self.groesse,
+        }
+
+
+ergebnis_cache = Ergebniscache()
+
+
+def mit_cache(algorithmus, parameter, berechne, erzwingen=False, cache=ergebnis_cache):
+    """
+    Liefert das Ergebnis eines früheren Laufs mit gleichem Fingerabdruck,
+    sofern dessen Zuweisungen noch gespeichert sind (der Lauf wird dann wieder
+    aktiviert); sonst wird berechne() aufgerufen und das Ergebnis abgelegt.
+
+    Args:
+        algorithmus: Name des Verfahrens (Teil des Schlüssels)
+        parameter: ergebnisrelevante Parameter (Teil des Schlüssels)
+        berechne: Funktion ohne Argumente, liefert dict mit "lauf_id" oder "error"
+        erzwingen: Cache ignorieren und neu berechnen
+    """
+    schluessel = fingerabdruck(algorithmus, parameter)
+
+    if not erzwingen:
+        eintrag = cache.hole(schluessel)
+        if eintrag is not None:
+            lauf_id, antwort = eintrag
+            lauf = db.session.get(Zuweisungslauf, lauf_id)
+            if lauf is not None and lauf.status in (STATUS_AKTIV, STATUS_ABGELOEST):
+                if aktiver_lauf_id() != lauf_id:
+                    aktiviere(lauf_id)
+                cache.zaehle(treffer=True)
+                return {**antwort, "cache": "treffer"}
+            cache.verwerfe(schluessel)
+
+    cache.zaehle(treffer=False)
+    antwort = berechne()
+    lauf_id = antwort.get("lauf_id")
+    if "error" not in antwort and lauf_id is not None:
+        # Ein inkrementeller Lauf verändert den aktiven Lauf: alte Schlüssel verwerfen
+        cache.verwerfe_lauf(lauf_id)
+        cache.lege_ab(schluessel, lauf_id, antwort)
+    return {**antwort, "cache": "fehlschlag"}
@@ -0,0 +1,244 @@
+import numpy as np
+from scipy import sparse
+from scipy.optimize import linprog
+
+from .kompetenzindex import Kompetenzindex, anforderungen_aus_raengen
+from .stundenplanung import RESTSTUNDEN_TOLERANZ
+
+# -----------------------------
+# Stundenbasierte Verteilung als kostenminimaler Fluss (LP mit HiGHS)
+# -----------------------------
+
+# Kosten je Stunde für jede Rangstufe, die eine Person über der minimalen
+# Kompetenzstufe der Aufgabe liegt (Überqualifikation)
+UEBERQUALIFIKATION_KOSTEN = 0.1
+
+# Kosten je ungedeckter Stunde; deutlich über jedem Weg durch das Netz, damit
+# zuerst möglichst viel Bedarf gedeckt und erst dann auf Kosten optimiert wird
+UNGEDECKT_KOSTEN = 1e4
+
+# Flüsse unterhalb dieser Menge (in Stunden) gelten als Rundungsrest des Lösers
+FLUSS_TOLERANZ = 1e-6
+
+
+class Flussfehler(RuntimeError):
+    """Der LP-Löser hat keine gültige Lösung gefunden."""
+
+
+def verteile_stunden_fluss(personen_raenge, ist_stunden, aufgaben_raenge, fenster_von, fenster_bis,
+                           aufwand_stunden, teilzeitfaktoren, kompetenzindex=None, anforderungen=None, plaetze=None,
+                           fortschritt=None):
+    """
+    Verteilt den Aufwand aller Aufgaben in einem Durchgang als kostenminimalen
+    Fluss statt Aufgabe für Aufgabe. Gleiche Eingaben, gleiche Eignungsregeln
+    (Kompetenzstufen und Fachkompetenzen über den Kompetenzindex) und gleiches
+    Ergebnisformat wie verteile_stunden.
+
+    Netz je Monat: Aufgabe -> Pool ihrer Anforderung -> Klasse -> Senke.
+    Eine Klasse fasst Personen mit gleichem Rang, gleichem Teilzeitfaktor und
+    gleicher Eignung für alle vorkommenden Anforderungen zusammen; Personen
+    einer Klasse sind austauschbar, das LP wächst deshalb mit Anforderungen ×
+    Klassen × Monaten statt mit der Zahl der Personen. Kosten je Stunde einer
+    Klasse: 1 / Teilzeitfaktor (wie in der Kostenmatrix), dazu
+    UEBERQUALIFIKATION_KOSTEN je Rangstufe über der Mindeststufe der
+    Anforderung. Anschließend wird jeder Klassenfluss absteigend nach freien
+    Stunden auf die Personen verteilt und über Pools und Klassen auf die
+    Aufgaben zurückgeführt.
+
+    Args:
+        teilzeitfaktoren (np.ndarray): Teilzeitfaktor je Person (Kosten)
+        fortschritt: optional Funktion(Anteil), vor und nach dem LP aufgerufen;
+                     linprog selbst lässt sich nicht unterbrechen, ein Abbruch
+                     greift erst danach
+        übrige wie verteile_stunden
+
+    Returns:
+        tuple: ([(Aufgabenindex, Personenindex, zugewiesene Stunden), ...],
+                {"bedarf_stunden", "gedeckt_stunden", "abdeckung",
+                 "aufgaben", "vollstaendig_gedeckt"})
+    """
+    personen_raenge = np.asarray(personen_raenge, dtype=np.int64)
+    ist_stunden = np.asarray(ist_stunden, dtype=np.float64)
+    teilzeit = np.asarray(teilzeitfaktoren, dtype=np.float64)
+    bedarf = np.asarray(aufwand_stunden, dtype=np.float64)
+    anzahl_personen, anzahl_monate = ist_stunden.shape
+    anzahl_aufgaben = len(bedarf)
+    if kompetenzindex is None:
+        kompetenzindex = Kompetenzindex.aus_merkmalen(personen_raenge)
+    if anforderungen is None:
+        anforderungen = anforderungen_aus_raengen(aufgaben_raenge, offen_ohne_anforderung=True)
+
+    # Verschiedene Anforderungen und die Eignung jeder Person dafür
+    nummern = {}
+    aufgabe_anf = np.array([nummern.setdefault(a, len(nummern)) for a in anforderungen], dtype=np.int64)
+    anf_liste = list(nummern)
+    anzahl_anf = len(anf_liste)
+    anf_rang = np.array([r if r else 0 for r, _ in anf_liste], dtype=np.int64)
+    eignung = kompetenzindex.eignung(anf_liste, plaetze)  # Personen × Anforderungen
+
+    # Klassen (Rang, Teilzeitfaktor, Eignungsmuster) und ihre Kapazität je Monat
+    kapazitaet = np.where(ist_stunden > RESTSTUNDEN_TOLERANZ, ist_stunden, 0.0)
+    kapazitaet[~eignung.any(axis=1)] = 0.0
+    merkmal = np.concatenate([
+        np.ascontiguousarray(personen_raenge)[:, None].view(np.uint8),
+        np.ascontiguousarray(teilzeit)[:, None].view(np.uint8),
+        np.packbits(eignung, axis=1)
+    ], axis=1)
+    _, vertreter, klasse = np.unique(merkmal, axis=0, return_index=True, return_inverse=True)
+    klasse = klasse.ravel()
+    anzahl_klassen = len(vertreter)
+    klassen_rang, klassen_teilzeit = personen_raenge[vertreter], teilzeit[vertreter]
+    klassen_eignung = eignung[vertreter]  # Klassen × Anforderungen
+    klassen_kap = np.zeros((anzahl_klassen, anzahl_monate))
+    np.add.at(klassen_kap, klasse, kapazitaet)
+
+    # Kapazität, die ein Pool (Anforderung, Monat) erreichen kann
+    erreichbar = klassen_eignung.T.astype(np.float64) @ klassen_kap
+
+    # Kanten Aufgabe -> Pool (Anforderung, Monat) im Aufgabenzeitraum
+    monate = np.arange(anzahl_monate)
+    kante = (monate[None, :] >= np.asarray(fenster_von)[:, None]) & \
+            (monate[None, :] <= np.asarray(fenster_bis)[:, None])
+    kante &= erreichbar[aufgabe_anf] > RESTSTUNDEN_TOLERANZ
+    x_aufgabe, x_monat = np.nonzero(kante)
+    x_anf = aufgabe_anf[x_aufgabe]
+    genutzt = np.zeros((anzahl_anf, anzahl_monate), dtype=bool)
+    genutzt[x_anf, x_monat] = True
+
+    # Kanten Pool -> Klasse (gleicher Monat) für geeignete Klassen mit Kapazität
+    paar_anf, paar_klasse = np.nonzero(klassen_eignung.T)
+    w_paar, w_monat = np.nonzero(genutzt[paar_anf] & (klassen_kap[paar_klasse] > RESTSTUNDEN_TOLERANZ))
+    w_anf, w_klasse = paar_anf[w_paar], paar_klasse[w_paar]
+    w_kosten = UEBERQUALIFIKATION_KOSTEN * np.where(anf_rang[w_anf] > 0, klassen_rang[w_klasse] - anf_rang[w_anf], 0)
+
+    # Kanten Klasse -> Senke mit Kapazität und Kosten 1 / Teilzeitfaktor
+    klasse_genutzt = np.zeros((anzahl_klassen, anzahl_monate), dtype=bool)
+    klasse_genutzt[w_klasse, w_monat] = True
+    y_klasse, y_monat = np.nonzero(klasse_genutzt)
+    y_kap = klassen_kap[y_klasse, y_monat]
+    y_kosten = 1.0 / klassen_teilzeit[y_klasse]
+
+    # Variablen [x | w | y | ungedeckt], Zeilen [Aufgaben | Pools | Klassen (je Monat)]
+    n_x, n_w, n_y = len(x_aufgabe), len(w_anf), len(y_klasse)
+    n = n_x + n_w + n_y + anzahl_aufgaben
+    pool = lambda anf, monat: anzahl_aufgaben + anf * anzahl_monate + monat
+    knoten = lambda kl, monat: anzahl_aufgaben + anzahl_anf * anzahl_monate + kl * anzahl_monate + monat
+    x_sp, w_sp, y_sp = np.arange(n_x), n_x + np.arange(n_w), n_x + n_w + np.arange(n_y)
+    u_sp = n_x + n_w + n_y + np.arange(anzahl_aufgaben)
+    zeilen = np.concatenate([x_aufgabe, pool(x_anf, x_monat), pool(w_anf, w_monat), knoten(w_klasse, w_monat),
+                             knoten(y_klasse, y_monat), np.arange(anzahl_aufgaben)])
+    spalten = np.concatenate([x_sp, x_sp, w_sp, w_sp, y_sp, u_sp])
+    werte = np.concatenate([np.ones(2 * n_x), -np.ones(n_w), np.ones(n_w), -np.ones(n_y), np.ones(anzahl_aufgaben)])
+    anzahl_zeilen = anzahl_aufgaben + (anzahl_anf + anzahl_klassen) * anzahl_monate
+    a_eq = sparse.csr_matrix((werte, (zeilen, spalten)), shape=(anzahl_zeilen, n))
+    b_eq = np.concatenate([bedarf, np.zeros(anzahl_zeilen - anzahl_aufgaben)])
+    kosten = np.concatenate([np.zeros(n_x), w_kosten, y_kosten, np.full(anzahl_aufgaben, UNGEDECKT_KOSTEN)])
+    grenzen = np.zeros((n, 2))
+    grenzen[:n_x + n_w, 1] = np.inf
+    grenzen[y_sp, 1] = y_kap
+    grenzen[u_sp, 1] = bedarf
+
+    if fortschritt is not None:
+        fortschritt(0.2)
+    ergebnis = linprog(kosten, A_eq=a_eq, b_eq=b_eq, bounds=grenzen, method="highs-ipm")
+    if ergebnis.status != 0:
+        raise Flussfehler(f"LP nicht gelöst: {ergebnis.message}")
+    if fortschritt is not None:
+        fortschritt(0.8)
+    x_fluss = np.clip(ergebnis.x[x_sp], 0.0, None)
+    w_fluss = np.clip(ergebnis.x[w_sp], 0.0, None)
+    y_fluss = np.clip(ergebnis.x[y_sp], 0.0, y_kap)
+    ungedeckt = np.clip(ergebnis.x[u_sp], 0.0, bedarf)
+
+    # Klassenfluss auf Personen: je (Klasse, Monat) absteigend nach freien Stunden füllen
+    klassen_fluss = np.zeros((anzahl_klassen, anzahl_monate))
+    klassen_fluss[y_klasse, y_monat] = y_fluss
+    p_person, p_monat = np.nonzero(kapazitaet > 0)
+    mit_fluss = klassen_fluss[klasse[p_person], p_monat] > FLUSS_TOLERANZ
+    p_person, p_monat = p_person[mit_fluss], p_monat[mit_fluss]
+    p_kap = kapazitaet[p_person, p_monat]
+    gruppe = klasse[p_person] * anzahl_monate + p_monat
+    reihenfolge = np.lexsort((p_person, -p_kap, gruppe))
+    p_person, p_kap, gruppe = p_person[reihenfolge], p_kap[reihenfolge], gruppe[reihenfolge]
+    davor = _kumuliert_in_gruppen(p_kap, gruppe) - p_kap
+    p_fluss = np.clip(klassen_fluss[gruppe // anzahl_monate, gruppe % anzahl_monate] - davor, 0.0, p_kap)
+
+    # Pools auf Klassen, dann Klassen auf Personen zurückführen
+    behalten = x_fluss > FLUSS_TOLERANZ
+    w_behalten = w_fluss > FLUSS_TOLERANZ
+    aufgabe, zu_klasse, pool_nr, stunden = _zerlege_pools(
+        x_aufgabe[behalten], x_anf[behalten] * anzahl_monate + x_monat[behalten], x_fluss[behalten],
+        w_klasse[w_behalten], w_anf[w_behalten] * anzahl_monate + w_monat[w_behalten], w_fluss[w_behalten],
+        anzahl_anf * anzahl_monate
+    )
+    p_behalten = p_fluss > FLUSS_TOLERANZ
+    aufgaben_idx, personen_idx, _, stunden = _zerlege_pools(
+        aufgabe, zu_klasse * anzahl_monate + pool_nr % anzahl_monate, stunden,
+        p_person[p_behalten], gruppe[p_behalten], p_fluss[p_behalten],
+        anzahl_klassen * anzahl_monate
+    )
+
+    # Über die Monate je (Aufgabe, Person) summieren
+    schluessel, zeile = np.unique(aufgaben_idx * anzahl_personen + personen_idx, return_inverse=True)
+    summe = np.bincount(zeile.ravel(), weights=stunden, minlength=len(schluessel))
+    behalten = summe > FLUSS_TOLERANZ
+    ergebnisse = [
+        (int(s // anzahl_personen), int(s % anzahl_personen), float(h))
+        for s, h in zip(schluessel[behalten], summe[behalten])
+    ]
+
+    gedeckt = bedarf - ungedeckt
+    bedarf_gesamt = float(bedarf.sum())
+    abdeckung = {
+        "bedarf_stunden": bedarf_gesamt,
+        "gedeckt_stunden": float(gedeckt.sum()),
+        "abdeckung": float(gedeckt.sum()) / bedarf_gesamt if bedarf_gesamt > 0 else 1.0,
+        "aufgaben": anzahl_aufgaben,
+        "vollstaendig_gedeckt": int((ungedeckt <= FLUSS_TOLERANZ).sum()),
+    }
+    return ergebnisse, abdeckung
+
+
+def _kumuliert_in_gruppen(werte, gruppe):
+    """Kumulierte Summe, die bei jedem Gruppenwechsel (sortierte Gruppen) neu beginnt."""
+    kumuliert = np.cumsum(werte)
+    if len(werte) == 0:
+        return kumuliert
+    neu = np.flatnonzero(np.r_[True, gruppe[1:] != gruppe[:-1]])
+    basis = np.r_[0.0, kumuliert][neu]
+    return kumuliert - np.repeat(basis, np.diff(np.r_[neu, len(werte)]))
+
+
+def _zerlege_pools(zu_aufgabe, zu_pool, zu_menge, ab_person, ab_pool, ab_menge, anzahl_pools):
+    """
+    Ordnet die Zuflüsse (Aufgaben) eines Pools seinen Abflüssen (Personen) zu.
+    Beide Seiten liegen je Pool ab derselben Basis auf einer gemeinsamen Achse;
+    jedes Teilstück zwischen zwei Bruchstellen gehört genau einer Aufgabe und
+    einer Person desselben Pools.
+
+    Returns:
+        tuple: (Aufgabenindizes, Personenindizes, Pools, Stunden) je Teilstück
+    """
+    ordnung = np.argsort(zu_pool, kind="stable")
+    zu_aufgabe, zu_pool, zu_menge = zu_aufgabe[ordnung], zu_pool[ordnung], zu_menge[ordnung]
+    ordnung = np.argsort(ab_pool, kind="stable")
+    ab_person, ab_pool, ab_menge = ab_person[ordnung], ab_pool[ordnung], ab_menge[ordnung]
+
+    # Basis je Pool: Platz für die größere der beiden Seiten
+    zu_summe = np.bincount(zu_pool, weights=zu_menge, minlength=anzahl_pools)
+    ab_summe = np.bincount(ab_pool, weights=ab_menge, minlength=anzahl_pools)
+    basis = np.r_[0.0, np.cumsum(np.maximum(zu_summe, ab_summe))]
+
+    zu_ende = basis[zu_pool] + _kumuliert_in_gruppen(zu_menge, zu_pool)
+    ab_ende = basis[ab_pool] + _kumuliert_in_gruppen(ab_menge, ab_pool)
+    schnitte = np.unique(np.concatenate([zu_ende - zu_menge, zu_ende, ab_ende - ab_menge, ab_ende]))
+    laenge = np.diff(schnitte)
+    mitte = schnitte[:-1] + laenge / 2
+
+    i = np.searchsorted(zu_ende, mitte, side="right")
+    j = np.searchsorted(ab_ende, mitte, side="right")
+    gueltig = (laenge > FLUSS_TOLERANZ) & (i < len(zu_ende)) & (j < len(ab_ende))
+    i, j, mitte, laenge = i[gueltig], j[gueltig], mitte[gueltig], laenge[gueltig]
+    gueltig = (zu_ende[i] - zu_menge[i] <= mitte) & (ab_ende[j] - ab_menge[j] <= mitte)
+    i, j = i[gueltig], j[gueltig]
+    return zu_aufgabe[i], ab_person[j], zu_pool[i], laenge[gueltig]
@@ -0,0 +1,125 @@
+import numpy as np
+
+# -----------------------------
+# Gantt-Blöcke aus monatlichen Stundenverteilungen (vektorisiert)
+# -----------------------------
+
+STUNDEN_PRO_TAG = 8
+
+# Spalten wie tests/gantt_daten.csv
+GANTT_SPALTEN = ("Aufgabe", "Person", "Start", "Ende", "Stunden")
+
+# Zuweisungen je Abschnitt beim Streamen der Gantt-Zeilen
+GANTT_ABSCHNITT = 5000
+
+# Monatsnummer (jahr * 12 + monat - 1) -> numpy datetime64[M] (Monate seit 1970-01)
+_EPOCHE = 1970 * 12
+
+
+def monatliche_verteilung(stunden, start, ende, erster_monat=None, anzahl_monate=None):
+    """
+    Verteilt die Stunden jeder Zuweisung gleichmäßig auf die Monate ihres
+    Aufgabenzeitraums.
+
+    Abweichung vom Notebook scoreMatching_stundenbasiert: Dort wird Tag für
+    Tag nur in Monaten geplant, in denen die Person laut Verfügbarkeit abzüglich
+    der schon verplanten Stunden (belegungen) noch Spielraum hat. Ein Lauf
+    speichert je Zuweisung nur die Stundensumme, nicht die Aufteilung auf
+    Monate; Verfügbarkeit und Belegungen durch andere Zuweisungen werden hier
+    daher nicht berücksichtigt, Blöcke können also auch in Monaten liegen, in
+    denen die Person nicht verfügbar ist.
+
+    Args:
+        stunden (np.ndarray): Stunden je Zuweisung
+        start, ende (np.ndarray): erster bzw. letzter Monat je Zuweisung (Monatsnummern)
+        erster_monat (int): erste Spalte der Achse (Standard: kleinster Start)
+        anzahl_monate (int): Spalten der Achse (Standard: bis zum größten Ende)
+
+    Returns:
+        tuple: (Stunden je Zuweisung und Monat (Zuweisungen × Monate), erster_monat)
+    """
+    stunden = np.asarray(stunden, dtype=np.float64)
+    start = np.asarray(start, dtype=np.int64)
+    ende = np.asarray(ende, dtype=np.int64)
+    if erster_monat is None:
+        erster_monat = int(start.min()) if len(start) else 0
+    if anzahl_monate is None:
+        anzahl_monate = int(ende.max()) - erster_monat + 1 if len(ende) else 0
+
+    monate = np.arange(anzahl_monate) + erster_monat
+    im_fenster = (monate[None, :] >= start[:, None]) & (monate[None, :] <= ende[:, None])
+    laenge = np.maximum(ende - start + 1, 1)
+    return np.where(im_fenster, (stunden / laenge)[:, None], 0.0), erster_monat
+
+
+def gantt_bloecke(stunden_monatlich, erster_monat, stunden_pro_tag=STUNDEN_PRO_TAG):
+    """
+    Zusammenhängende Arbeitsblöcke je Zuweisung.
+
+    In jedem Monat mit Stunden wird ab dem Monatsersten Tag für Tag gearbeitet
+    (stunden_pro_tag je Kalendertag, höchstens bis Monatsende). Füllt eine
+    Zuweisung einen Monat bis zum letzten Tag und hat auch im Folgemonat
+    Stunden, setzt sich der Block dort fort; sonst entsteht eine Lücke und
+    der nächste Monat beginnt einen neuen Block. Ende ist wie im Notebook der
+    Tag nach dem letzten Arbeitstag, die Stunden eines Blocks sind wie dort
+    ganze Arbeitstage (Tage × stunden_pro_tag).
+
+    Args:
+        stunden_monatlich (np.ndarray): Stunden (Zuweisungen × Monate ab erster_monat)
+        erster_monat (int): Monatsnummer der ersten Spalte
+
+    Returns:
+        tuple: (Zuweisungsindex, Start, Ende (datetime64[D]), geplante Stunden
+               (int)) je Block, sortiert nach Zuweisung und Start
+    """
+    stunden_monatlich = np.asarray(stunden_monatlich, dtype=np.float64)
+    zeilen, spalten = np.nonzero(stunden_monatlich > 0)
+    if len(zeilen) == 0:
+        leer = np.empty(0, dtype="datetime64[D]")
+        return np.empty(0, dtype=np.intp), leer, leer.copy(), np.empty(0, dtype=np.int64)
+
+    # Ein Segment je (Zuweisung, Monat) mit Stunden
+    monat = (np.datetime64(0, "M") + (erster_monat - _EPOCHE + spalten)).astype("datetime64[M]")
+    monatserster = monat.astype("datetime64[D]")
+    tage_im_monat = ((monat + 1).astype("datetime64[D]") - monatserster).astype(np.int64)
+    # Kleine Toleranz, damit 16.000000001 h nicht einen dritten Tag anfangen
+    tage = np.ceil(stunden_monatlich[zeilen, spalten] / stunden_pro_tag - 1e-9).astype(np.int64)
+    tage = np.minimum(np.maximum(tage, 1), tage_im_monat)
+    segment_ende = monatserster + tage
+
+    # Fortsetzung: gleiche Zuweisung, direkt folgender Monat, Vormonat voll belegt
+    fortsetzung = np.zeros(len(zeilen), dtype=bool)
+    fortsetzung[1:] = (
+        (zeilen[1:] == zeilen[:-1])
+        & (spalten[1:] == spalten[:-1] + 1)
+        & (tage[:-1] == tage_im_monat[:-1])
+    )
+    block_start = np.flatnonzero(~fortsetzung)
+    block_letztes = np.append(block_start[1:], len(zeilen)) - 1
+
+    return (
+        zeilen[block_start],
+        monatserster[block_start],
+        segment_ende[block_letztes],
+        np.add.reduceat(tage, block_start) * stunden_pro_tag,
+    )
+
+
+def gantt_zeilen(aufgaben, personen, stunden, start, ende):
+    """
+    Gantt-Zeilen (Aufgabe, Person, Start, Ende, Stunden) wie in tests/gantt_daten.csv,
+    Datumswerte als ISO-Text, Stunden als ganze Arbeitstage × 8. Liefert einen
+    Generator; die Blöcke einer Zuweisung hängen nur von ihrer eigenen Zeile ab,
+    Endpunkte können die Zuweisungen also abschnittsweise übergeben.
+
+    Args:
+        aufgaben, personen (Sequenz): Aufgaben- bzw. Personenname je Zuweisung
+        stunden (np.ndarray): Stunden je Zuweisung
+        start, ende (np.ndarray): Aufgabenzeitraum je Zuweisung (Monatsnummern)
+    """
+    stunden_monatlich, erster_monat = monatliche_verteilung(stunden, start, ende)
+    zeilen, block_start, block_ende, block_stunden = gantt_bloecke(stunden_monatlich, erster_monat)
+    block_start = np.datetime_as_string(block_start, unit="D")
+    block_ende = np.datetime_as_string(block_ende, unit="D")
+    for i, von, bis, h in zip(zeilen.tolist(), block_start, block_ende, block_stunden.tolist()):
+        yield aufgaben[i], personen[i], str(von), str(bis), h
@@ -0,0 +1,84 @@
+import numpy as np
+
+from .kompetenzindex import Kompetenzindex, anforderungen_aus_raengen, kompetenz_merkmale
+
+# -----------------------------
+# Änderungserkennung für die inkrementelle Neuberechnung pro Projekt
+# -----------------------------
+
+PERSON = "person"
+AUFGABE = "aufgabe"
+
+
+def _merkmale(wert):
+    """Kompetenzrang und Fachkompetenzen, die Kompetenzen sortiert (Reihenfolge ist ohne Bedeutung)."""
+    rang, kompetenzen = kompetenz_merkmale(wert)
+    return rang, tuple(sorted(kompetenzen))
+
+
+def eingaben_personen(personen):
+    """
+    Für die Zuweisung relevante Eingaben je Person:
+    {id: (Rang, Teilzeitfaktor, Fachkompetenzen)}.
+    """
+    eingaben = {}
+    for p in personen:
+        rang, kompetenzen = _merkmale(p.kompetenz)
+        eingaben[p.id] = (rang, float(p.teilzeitfaktor), kompetenzen)
+    return eingaben
+
+
+def eingaben_aufgaben(aufgaben):
+    """
+    Für die Zuweisung relevante Eingaben je Aufgabe:
+    {id: (Projekt-ID, Rang, Aufwand, Fachkompetenzen)}.
+    """
+    eingaben = {}
+    for a in aufgaben:
+        rang, kompetenzen = _merkmale(a.minimale_kompetenz)
+        eingaben[a.id] = (a.projekt_id, rang, float(a.arbeitsaufwand), kompetenzen)
+    return eingaben
+
+
+def geaendert(alt, neu):
+    """IDs, die hinzugekommen, entfernt oder verändert sind."""
+    return {i for i in alt.keys() | neu.keys() if alt.get(i) != neu.get(i)}
+
+
+def betroffene_projekte(alt_personen, neu_personen, alt_aufgaben, neu_aufgaben):
+    """
+    Bestimmt die Projekte, deren Zuweisung sich durch die Änderungen seit dem
+    letzten Lauf ändern kann.
+
+    Projekte werden unabhängig voneinander gelöst. Ein Projekt ist betroffen,
+    wenn eine seiner Aufgaben (alt oder neu) geändert wurde, oder wenn eine
+    geänderte Person vorher oder nachher für mindestens eine Aufgabe des
+    Projekts geeignet ist (Kompetenzstufe und Fachkompetenzen, geprüft über
+    den Kompetenzindex wie bei der Zuweisung). Personen, die für keine
+    Aufgabe eines Projekts geeignet sind, bilden in dessen Kostenmatrix eine
+    Zeile aus inf und beeinflussen die Lösung nicht (siehe loese_kostenmatrix).
+
+    Returns:
+        set: Projekt-IDs
+    """
+    projekte = set()
+    for a_id in geaendert(alt_aufgaben, neu_aufgaben):
+        for eingabe in (alt_aufgaben.get(a_id), neu_aufgaben.get(a_id)):
+            if eingabe is not None:
+                projekte.add(eingabe[0])
+
+    personen = geaendert(alt_personen, neu_personen)
+    if not personen:
+        return projekte
+
+    # Alter und neuer Stand jeder geänderten Person als eigener Platz im Index
+    staende = [e for p in personen for e in (alt_personen.get(p), neu_personen.get(p)) if e is not None]
+    index = Kompetenzindex.aus_merkmalen(
+        np.array([e[0] for e in staende], dtype=np.int64), [e[2] for e in staende]
+    )
+
+    # Aufgaben über alten und neuen Stand; geeignet ist, wer es vorher oder nachher ist
+    aufgaben = [e for stand in (alt_aufgaben, neu_aufgaben) for e in stand.values()]
+    eignung = index.eignung(anforderungen_aus_raengen([e[1] for e in aufgaben], [e[3] for e in aufgaben]))
+    projekte.update(e[0] for e, geeignet in zip(aufgaben, eignung.any(axis=0).tolist()) if geeignet)
+    return projekte
@@ -0,0 +1,188 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app
+
+# -----------------------------
+# Hintergrund-Jobs für lange Berechnungen (lokaler Thread-Pool, kein Broker)
+# -----------------------------
+
+STATUS_WARTEND = "wartend"
+STATUS_LAUFEND = "laufend"
+STATUS_FERTIG = "fertig"
+STATUS_FEHLGESCHLAGEN = "fehlgeschlagen"
+STATUS_ABGEBROCHEN = "abgebrochen"
+
+ABGESCHLOSSEN = (STATUS_FERTIG, STATUS_FEHLGESCHLAGEN, STATUS_ABGEBROCHEN)
+
+_aktueller_job = threading.local()
+_anlegen = threading.Lock()
+
+
+class JobAbgebrochen(Exception):
+    """Der laufende Job wurde abgebrochen."""
+
+
+class WarteschlangeVoll(Exception):
+    """Es warten bereits zu viele Jobs."""
+
+
+class Job:
+    """Zustand eines Hintergrund-Jobs; wird vom Worker-Thread fortgeschrieben."""
+
+    def __init__(self, art, parameter=None):
+        self.id = uuid.uuid4().hex
+        self.art = art
+        self.parameter = parameter or {}
+        self.status = STATUS_WARTEND
+        self.fortschritt = 0.0
+        self.meldung = None
+        self.ergebnis = None
+        self.fehler = None
+        self.erstellt = time.time()
+        self.gestartet = None
+        self.beendet = None
+        self.abbruch = threading.Event()
+        self.future = None
+
+    def als_dict(self):
+        return {
+            "id": self.id,
+            "art": self.art,
+            "parameter": self.parameter,
+            "status": self.status,
+            "fortschritt": round(self.fortschritt, 3),
+            "meldung": self.meldung,
+            "ergebnis": self.ergebnis,
+            "fehler": self.fehler,
+            "erstellt": self.erstellt,
+            "gestartet": self.gestartet,
+            "beendet": self.beendet,
+        }
+
+
+def fortschritt(anteil, meldung=None):
+    """
+    Meldet den Fortschritt des Jobs im aktuellen Thread und bricht ab, falls
+    der Job abgebrochen wurde. Außerhalb eines Jobs ohne Wirkung, sodass
+    Berechnungsfunktionen sowohl synchron als auch als Job laufen können.
+    """
+    job = getattr(_aktueller_job, "job", None)
+    if job is None:
+        return
+    if job.abbruch.is_set():
+        raise JobAbgebrochen(f"Job {job.id} abgebrochen")
+    job.fortschritt = float(anteil)
+    if meldung is not None:
+        job.meldung = meldung
+
+
+class Jobverwaltung:
+    """
+    Führt Jobs in einem Thread-Pool mit begrenzter Parallelität aus. Jeder Job
+    läuft in einem eigenen App-Kontext (eigene Datenbanksession). Abgeschlossene
+    Jobs werden nach ttl_s Sekunden vergessen.
+    """
+
+    def __init__(self, app, max_parallel=2, max_wartend=20, ttl_s=3600):
+        self.app = app
+        self.max_wartend = max_wartend
+        self.ttl_s = ttl_s
+        self._pool = ThreadPoolExecutor(max_workers=max_parallel, thread_name_prefix="job")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def einreichen(self, art, funktion, *args, parameter=None, **kwargs):
+        """
+        Reiht funktion(*args, **kwargs) als Job ein und kehrt sofort zurück.
+        Das Ergebnis der Funktion muss JSON-serialisierbar sein.
+
+        Raises:
+            WarteschlangeVoll: wenn bereits max_wartend Jobs warten
+        """
+        self._raeume_auf()
+        with self._lock:
+            wartend = sum(1 for j in self._jobs.values() if j.status == STATUS_WARTEND)
+            if wartend >= self.max_wartend:
+                raise WarteschlangeVoll(f"{wartend} Jobs warten bereits")
+            job = Job(art, parameter)
+            self._jobs[job.id] = job
+        job.future = self._pool.submit(self._fuehre_aus, job, funktion, args, kwargs)
+        return job
+
+    def _fuehre_aus(self, job, funktion, args, kwargs):
+        if job.abbruch.is_set():
+            job.status = STATUS_ABGEBROCHEN
+            job.beendet = time.time()
+            return
+        job.status = STATUS_LAUFEND
+        job.gestartet = time.time()
+        _aktueller_job.job = job
+        try:
+            with self.app.app_context():
+                job.ergebnis = funktion(*args, **kwargs)
+            if isinstance(job.ergebnis, dict) and "error" in job.ergebnis:
+                job.fehler = job.ergebnis["error"]
+                job.status = STATUS_FEHLGESCHLAGEN
+            else:
+                job.fortschritt = 1.0
+                job.status = STATUS_FERTIG
+        except JobAbgebrochen:
+            job.status = STATUS_ABGEBROCHEN
+        except Exception as e:
+            job.fehler = str(e)
+            job.status = STATUS_FEHLGESCHLAGEN
+        finally:
+            _aktueller_job.job = None
+            job.beendet = time.time()
+
+    def hole(self, job_id):
+        self._raeume_auf()
+        return self._jobs.get(job_id)
+
+    def alle(self):
+        self._raeume_auf()
+        return sorted(self._jobs.values(), key=lambda j: j.erstellt, reverse=True)
+
+    def abbrechen(self, job_id):
+        """
+        Bricht einen Job ab: wartende Jobs starten nicht mehr, laufende Jobs
+        beenden sich beim nächsten Aufruf von fortschritt(). Die Löser rufen
+        es zwischen den Phasen, je Projekt (pro Projekt), alle 100 Aufgaben
+        (stundenbasiert python/numpy) sowie vor und nach dem Fluss-LP auf.
+        Ein einzelner Löseraufruf (linear_sum_assignment, linprog) wird nicht
+        unterbrochen; der Abbruch greift erst danach.
+
+        Returns:
+            Job oder None, falls unbekannt
+        """
+        job = self.hole(job_id)
+        if job is None or job.status in ABGESCHLOSSEN:
+            return job
+        job.abbruch.set()
+        if job.future is not None and job.future.cancel():
+            job.status = STATUS_ABGEBROCHEN
+            job.beendet = time.time()
+        return job
+
+    def _raeume_auf(self):
+        grenze = time.time() - self.ttl_s
+        with self._lock:
+            for job_id in [j.id for j in self._jobs.values() if j.beendet and j.beendet < grenze]:
+                del self._jobs[job_id]
+
+
+def jobverwaltung():
+    """Jobverwaltung der aktuellen App (wird beim ersten Zugriff angelegt)."""
+    app = current_app._get_current_object()
+    with _anlegen:
+        if "jobs" not in app.extensions:
+            app.extensions["jobs"] = Jobverwaltung(
+                app,
+                max_parallel=app.config.get("JOB_MAX_PARALLEL", 2),
+                max_wartend=app.config.get("JOB_MAX_WARTEND", 20),
+                ttl_s=app.config.get("JOB_TTL_S", 3600),
+            )
+        return app.extensions["jobs"]
@@ -0,0 +1,318 @@
+import threading
+
+import numpy as np
+
+from .kostenmatrix import kompetenz_rang
+
+# -----------------------------
+# Invertierter Kompetenzindex: Kompetenz -> Bitmenge der qualifizierten Personen
+# -----------------------------
+
+
+def fachkompetenzen(wert):
+    """
+    Zerlegt eine Kompetenzangabe wie "Stochastik, Optik, KI" in ihre
+    Fachkompetenzen: ("Stochastik", "Optik", "KI"). Leere Einträge entfallen.
+    """
+    if not wert or not isinstance(wert, str):
+        return ()
+    return tuple(dict.fromkeys(k.strip() for k in wert.split(",") if k.strip()))
+
+
+def kompetenz_merkmale(wert):
+    """
+    Person.kompetenz bzw. Aufgabe.minimale_kompetenz enthält entweder eine
+    Kompetenzstufe ("C") oder, etwa nach dem Import von data/personen.csv,
+    eine Liste von Fachkompetenzen.
+
+    Returns:
+        tuple: (Kompetenzrang (0 = keine Stufe), Fachkompetenzen)
+    """
+    rang = kompetenz_rang(wert)
+    return (rang, ()) if rang else (0, fachkompetenzen(wert))
+
+
+def _bits(plaetze):
+    """Bitmenge (Python-int) mit den gesetzten Plätzen."""
+    plaetze = np.asarray(plaetze, dtype=np.int64)
+    if len(plaetze) == 0:
+        return 0
+    maske = np.zeros(int(plaetze.max()) + 1, dtype=bool)
+    maske[plaetze] = True
+    return int.from_bytes(np.packbits(maske, bitorder="little").tobytes(), "little")
+
+
+def _als_maske(bits, anzahl):
+    """Bitmenge -> boolesches Array der Länge anzahl."""
+    if anzahl == 0:
+        return np.zeros(0, dtype=bool)
+    roh = np.frombuffer(bits.to_bytes((anzahl + 7) // 8, "little"), dtype=np.uint8)
+    return np.unpackbits(roh, count=anzahl, bitorder="little").astype(bool)
+
+
+class Kompetenzindex:
+    """
+    Ordnet jeder Fachkompetenz und jeder Kompetenzstufe die Bitmenge der
+    Personen zu, die sie besitzen. Jede Person belegt einen festen Platz
+    (Bitposition); Kandidaten einer Anforderung ergeben sich als Schnitt der
+    Bitmengen statt aus einem Vergleich mit jeder Person.
+
+    Anforderung (min_rang, fachkompetenzen):
+      - min_rang None: keine Stufenbedingung; 0 (unbekannte Stufe): niemand
+        (wie unzulaessigkeitsmaske); sonst Rang >= min_rang
+      - fachkompetenzen: alle genannten Kompetenzen müssen vorhanden sein
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._platz = {}           # Person-ID -> Platz
+        self._ids = []             # Platz -> Person-ID (None = frei)
+        self._merkmale = []        # Platz -> (Rang, Fachkompetenzen)
+        self._je_rang = {}         # Rang -> Bitmenge
+        self._je_kompetenz = {}    # Fachkompetenz -> Bitmenge
+        self._ab_rang = {}         # Rang -> Bitmenge aller Personen mit Rang >= Rang (Cache)
+        self._veraltet = set()
+        self._gueltig = False
+
+    @classmethod
+    def aus_merkmalen(cls, raenge=None, kompetenz_listen=None, person_ids=None):
+        """
+        Baut den Index in einem Schritt; Platz i ist die i-te Person.
+
+        Args:
+            raenge (np.ndarray): Kompetenzrang je Person (optional)
+            kompetenz_listen (Sequenz): Fachkompetenzen je Person (optional)
+            person_ids (Sequenz): IDs je Person (Standard: 0..n-1)
+        """
+        anzahl = len(raenge) if raenge is not None else len(kompetenz_listen or ())
+        index = cls()
+        index._ids = list(range(anzahl)) if person_ids is None else list(person_ids)
+        index._platz = {pid: i for i, pid in enumerate(index._ids)}
+        raenge = np.zeros(anzahl, dtype=np.int64) if raenge is None else np.asarray(raenge, dtype=np.int64)
+        listen = [()] * anzahl if kompetenz_listen is None else [
+            tuple(k) if isinstance(k, (list, tuple)) else () for k in kompetenz_listen
+        ]
+        index._merkmale = list(zip(raenge.tolist(), listen))
+
+        for rang in np.unique(raenge[raenge > 0]).tolist():
+            index._je_rang[rang] = _bits(np.flatnonzero(raenge == rang))
+        plaetze_je_kompetenz = {}
+        for platz, kompetenzen in enumerate(listen):
+            for kompetenz in kompetenzen:
+                plaetze_je_kompetenz.setdefault(kompetenz, []).append(platz)
+        index._je_kompetenz = {k: _bits(p) for k, p in plaetze_je_kompetenz.items()}
+        index._gueltig = True
+        return index
+
+    @classmethod
+    def aus_csr(cls, zeiger, index, namen, raenge=None, person_ids=None):
+        """
+        Index aus Fachkompetenzen im CSR-Layout (siehe snapshot.py):
+        Person i besitzt namen[index[zeiger[i]:zeiger[i + 1]]].
+        """
+        zeiger = np.asarray(zeiger, dtype=np.int64)
+        index = np.asarray(index, dtype=np.int64)
+        namen = [str(n) for n in namen]
+        listen = [tuple(namen[k] for k in index[zeiger[i]:zeiger[i + 1]]) for i in range(len(zeiger) - 1)]
+        if raenge is None:
+            raenge = np.zeros(len(listen), dtype=np.int64)
+        return cls.aus_merkmalen(raenge, listen, person_ids)
+
+    @classmethod
+    def aus_personen(cls, personen):
+        """Index über Person-Zeilen (Kompetenzstufe oder Liste von Fachkompetenzen)."""
+        merkmale = [kompetenz_merkmale(p.kompetenz) for p in personen]
+        return cls.aus_merkmalen(
+            np.array([m[0] for m in merkmale], dtype=np.int64), [m[1] for m in merkmale], [p.id for p in personen]
+        )
+
+    # -------------------- Pflege --------------------
+
+    def setze(self, person_id, rang, kompetenzen=()):
+        """Fügt eine Person ein oder ersetzt ihre Kompetenzen."""
+        with self._lock:
+            self._setze(person_id, rang, tuple(kompetenzen))
+
+    def entferne(self, person_id):
+        with self._lock:
+            platz = self._platz.pop(person_id, None)
+            if platz is not None:
+                self._loesche_bits(platz)
+                self._ids[platz] = None
+                self._merkmale[platz] = (0, ())
+
+    def invalidiere(self, person_id=None):
+        """
+        Markiert eine Person (oder ohne Argument den gesamten Index) als
+        veraltet; lade() liest sie aus den übergebenen Zeilen neu ein.
+        """
+        with self._lock:
+            if person_id is None:
+                self._gueltig = False
+            else:
+                self._veraltet.add(person_id)
+
+    def lade(self, personen):
+        """
+        Stellt sicher, dass alle übergebenen Personen aktuell im Index stehen.
+        Beim ersten Aufruf (oder nach vollständiger Invalidierung) wird der
+        Index komplett aufgebaut, sonst werden nur fehlende oder veraltete
+        Personen nachgetragen.
+
+        Returns:
+            Kompetenzindex: self
+        """
+        with self._lock:
+            if not self._gueltig:
+                neu = Kompetenzindex.aus_personen(personen)
+                self._platz, self._ids, self._merkmale = neu._platz, neu._ids, neu._merkmale
+                self._je_rang, self._je_kompetenz, self._ab_rang = neu._je_rang, neu._je_kompetenz, {}
+                self._veraltet.clear()
+                self._gueltig = True
+            else:
+                for person in personen:
+                    if person.id not in self._platz or person.id in self._veraltet:
+                        self._setze(person.id, *kompetenz_merkmale(person.kompetenz))
+                        self._veraltet.discard(person.id)
+        return self
+
+    def _setze(self, person_id, rang, kompetenzen):
+        platz = self._platz.get(person_id)
+        if platz is None:
+            platz = self._platz[person_id] = len(self._ids)
+            self._ids.append(person_id)
+            self._merkmale.append((0, ()))
+        else:
+            self._loesche_bits(platz)
+        bit = 1 << platz
+        if rang > 0:
+            self._je_rang[rang] = self._je_rang.get(rang, 0) | bit
+        for kompetenz in kompetenzen:
+            self._je_kompetenz[kompetenz] = self._je_kompetenz.get(kompetenz, 0) | bit
+        self._merkmale[platz] = (rang, kompetenzen)
+        self._ab_rang.clear()
+
+    def _loesche_bits(self, platz):
+        rang, kompetenzen = self._merkmale[platz]
+        bit = 1 << platz
+        if rang > 0:
+            self._je_rang[rang] &= ~bit
+        for kompetenz in kompetenzen:
+            self._je_kompetenz[kompetenz] &= ~bit
+        self._ab_rang.clear()
+
+    # -------------------- Abfragen --------------------
+
+    def __len__(self):
+        return len(self._platz)
+
+    def plaetze(self, person_ids):
+        """Plätze der Personen in der übergebenen Reihenfolge (-1 = nicht im Index)."""
+        return np.fromiter((self._platz.get(pid, -1) for pid in person_ids), dtype=np.int64, count=len(person_ids))
+
+    def bits(self, min_rang=None, kompetenzen=()):
+        """Bitmenge der Personen, die die Anforderung erfüllen."""
+        with self._lock:
+            if min_rang is None:
+                bits = (1 << len(self._ids)) - 1
+            elif min_rang <= 0:
+                return 0
+            else:
+                bits = self._ab_rang.get(min_rang)
+                if bits is None:
+                    bits = 0
+                    for rang, b in self._je_rang.items():
+                        if rang >= min_rang:
+                            bits |= b
+                    self._ab_rang[min_rang] = bits
+            for kompetenz in kompetenzen:
+                bits &= self._je_kompetenz.get(kompetenz, 0)
+                if not bits:
+                    break
+            return bits
+
+    def maske(self, min_rang=None, kompetenzen=(), plaetze=None):
+        """
+        Boolesche Maske der qualifizierten Personen, je Platz oder (mit
+        plaetze) in der Reihenfolge einer eigenen Personenliste.
+        """
+        maske = _als_maske(self.bits(min_rang, kompetenzen), len(self._ids))
+        if min_rang is None and not kompetenzen:
+            # Freigewordene Plätze gehören niemandem
+            maske &= np.fromiter((pid is not None for pid in self._ids), dtype=bool, count=len(self._ids))
+        if plaetze is None:
+            return maske
+        auswahl = np.zeros(len(plaetze), dtype=bool)
+        bekannt = plaetze >= 0
+        auswahl[bekannt] = maske[plaetze[bekannt]]
+        return auswahl
+
+    def kandidaten(self, min_rang=None, kompetenzen=(), plaetze=None):
+        """Aufsteigende Positionen der qualifizierten Personen (Plätze bzw. Positionen in plaetze)."""
+        return np.flatnonzero(self.maske(min_rang, kompetenzen, plaetze))
+
+    def eignung(self, anforderungen, plaetze=None):
+        """
+        Eignungsmatrix (Personen × Aufgaben); je verschiedener Anforderung
+        wird der Index nur einmal abgefragt.
+
+        Args:
+            anforderungen (Sequenz): (min_rang, Fachkompetenzen) je Aufgabe
+            plaetze (np.ndarray): Plätze einer eigenen Personenliste (optional)
+        """
+        anzahl = len(self._ids) if plaetze is None else len(plaetze)
+        eignung = np.zeros((anzahl, len(anforderungen)), dtype=bool)
+        spalten = {}
+        for spalte, anforderung in enumerate(anforderungen):
+            spalten.setdefault(anforderung, []).append(spalte)
+        for (min_rang, kompetenzen), auswahl in spalten.items():
+            eignung[:, auswahl] = self.maske(min_rang, kompetenzen, plaetze)[:, None]
+        return eignung
+
+
+def anforderungen_aus_raengen(raenge, kompetenz_listen=None, offen_ohne_anforderung=False):
+    """
+    Anforderungen (min_rang, Fachkompetenzen) je Aufgabe. Aufgaben ohne
+    Stufe, aber mit Fachkompetenzen verzichten auf die Stufenbedingung.
+    Aufgaben ganz ohne Anforderung stehen niemandem offen (wie
+    unzulaessigkeitsmaske bei Kuhn-Munkres) oder, mit
+    offen_ohne_anforderung, allen (wie in der stundenbasierten Verteilung).
+    """
+    raenge = np.asarray(raenge).tolist()
+    if kompetenz_listen is None:
+        kompetenz_listen = [()] * len(raenge)
+    anforderungen = []
+    for rang, kompetenzen in zip(raenge, kompetenz_listen):
+        if rang or (not kompetenzen and not offen_ohne_anforderung):
+            anforderungen.append((rang, tuple(kompetenzen)))
+        else:
+            anforderungen.append((None, tuple(kompetenzen)))
+    return anforderungen
+
+
+def anforderungen_aus_aufgaben(aufgaben, offen_ohne_anforderung=False):
+    """Anforderungen je Aufgabe-Zeile aus minimale_kompetenz."""
+    merkmale = [kompetenz_merkmale(a.minimale_kompetenz) for a in aufgaben]
+    return anforderungen_aus_raengen([m[0] for m in merkmale], [m[1] for m in merkmale], offen_ohne_anforderung)
+
+
+kompetenz_index = Kompetenzindex()
+
+
+def beobachte_personen(modell, index=kompetenz_index):
+    """
+    Hängt Listener an das Person-Modell: eingefügte und geänderte Personen
+    werden als veraltet markiert und beim nächsten lade() nachgetragen,
+    gelöschte verlassen den Index sofort.
+    """
+    from sqlalchemy import event
+
+    def _invalidiere(mapper, connection, target):
+        index.invalidiere(target.id)
+
+    def _entferne(mapper, connection, target):
+        index.entferne(target.id)
+
+    event.listen(modell, "after_insert", _invalidiere)
+    event.listen(modell, "after_update", _invalidiere)
+    event.listen(modell, "after_delete", _entferne)
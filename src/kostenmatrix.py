@@ -0,0 +1,140 @@
+import multiprocessing
+import time
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+# -----------------------------
+# Kostenmatrix für die Kuhn-Munkres-Pfade (Personen × Aufgaben)
+# -----------------------------
+
+def kompetenz_rang(kompetenz):
+    """
+    Einheitliche Rangfolge der Kompetenzstufen: "A" -> 1, "B" -> 2, "C" -> 3, ...
+    Ein späterer Buchstabe steht für eine höhere Kompetenz. Leere oder
+    unbekannte Werte erhalten Rang 0 und sind damit für keine Aufgabe geeignet.
+    """
+    if not kompetenz:
+        return 0
+    k = kompetenz.strip().upper()
+    if len(k) != 1 or not "A" <= k <= "Z":
+        return 0
+    return ord(k) - ord("A") + 1
+
+
+def personen_arrays(personen):
+    """
+    Wandelt Person-Zeilen einmalig in NumPy-Arrays um.
+
+    Returns:
+        tuple: (Kompetenzränge, Teilzeitfaktoren)
+    """
+    raenge = np.fromiter((kompetenz_rang(p.kompetenz) for p in personen), dtype=np.int16, count=len(personen))
+    teilzeit = np.fromiter((p.teilzeitfaktor for p in personen), dtype=np.float64, count=len(personen))
+    return raenge, teilzeit
+
+
+def aufgaben_arrays(aufgaben):
+    """
+    Wandelt Aufgabe-Zeilen einmalig in NumPy-Arrays um.
+
+    Returns:
+        tuple: (minimale Kompetenzränge, Arbeitsaufwände)
+    """
+    raenge = np.fromiter((kompetenz_rang(a.minimale_kompetenz) for a in aufgaben), dtype=np.int16, count=len(aufgaben))
+    aufwand = np.fromiter((a.arbeitsaufwand for a in aufgaben), dtype=np.float64, count=len(aufgaben))
+    return raenge, aufwand
+
+
+def unzulaessigkeitsmaske(personen_raenge, aufgaben_raenge):
+    """
+    Maske (Personen × Aufgaben), die alle Paare markiert, bei denen die Person
+    die minimale Kompetenz der Aufgabe nicht erfüllt.
+    """
+    p = personen_raenge[:, None]
+    a = aufgaben_raenge[None, :]
+    return (p < a) | (p == 0) | (a == 0)
+
+
+def baue_kostenmatrix(personen, aufgaben, unzulaessig=None):
+    """
+    Baut die Kostenmatrix per Broadcasting auf.
+    Kosten = Arbeitsaufwand / Teilzeitfaktor, ungeeignete Paare erhalten inf.
+
+    Args:
+        unzulaessig (np.ndarray): vorab bestimmte Maske ungeeigneter Paare
+                                  (z. B. aus dem Kompetenzindex); sonst aus
+                                  den Kompetenzrängen
+
+    Returns:
+        tuple: (Kostenmatrix, Unzulässigkeitsmaske)
+    """
+    p_rang, teilzeit = personen_arrays(personen)
+    a_rang, aufwand = aufgaben_arrays(aufgaben)
+    return kostenmatrix_aus_arrays(p_rang, teilzeit, a_rang, aufwand, unzulaessig)
+
+
+def kostenmatrix_aus_arrays(p_rang, teilzeit, a_rang, aufwand, unzulaessig=None):
+    """
+    Wie baue_kostenmatrix, aber direkt aus Spaltenarrays (z. B. eines Snapshots).
+
+    Returns:
+        tuple: (Kostenmatrix, Unzulässigkeitsmaske)
+    """
+    if unzulaessig is None:
+        unzulaessig = unzulaessigkeitsmaske(p_rang, a_rang)
+    with np.errstate(divide="ignore"):
+        kostenmatrix = aufwand[None, :] / teilzeit[:, None]
+    kostenmatrix[unzulaessig] = np.inf
+    return kostenmatrix, unzulaessig
+
+
+def loese_kostenmatrix(kostenmatrix):
+    """
+    Wendet den Kuhn-Munkres-Algorithmus an und verwirft Paare mit unendlichen Kosten.
+
+    Unendliche Kosten werden durch eine Strafgröße ersetzt, die größer als
+    jede gültige Gesamtlösung ist: Gelöst wird so zuerst auf möglichst viele
+    gültige Paare, dann auf minimale Kosten. linear_sum_assignment selbst
+    bricht ab, sobald nicht jede Zeile (bzw. Spalte) gültig zugewiesen werden
+    kann, etwa wegen einer Person, die für keine Aufgabe geeignet ist.
+
+    Returns:
+        tuple: (Personenindizes, Aufgabenindizes) der gültigen Zuweisungen
+    """
+    endlich = np.isfinite(kostenmatrix)
+    if not endlich.any():
+        leer = np.empty(0, dtype=np.intp)
+        return leer, leer
+    if not endlich.all():
+        strafe = (np.abs(kostenmatrix[endlich]).max() + 1.0) * (min(kostenmatrix.shape) + 1)
+        kostenmatrix = np.where(endlich, kostenmatrix, strafe)
+    personen_index, aufgaben_index = linear_sum_assignment(kostenmatrix)
+    gueltig = endlich[personen_index, aufgaben_index]
+    return personen_index[gueltig], aufgaben_index[gueltig]
+
+
+def loese_teilproblem(teilzeit, aufwand, unzulaessig):
+    """
+    Baut die Kostenmatrix eines Teilproblems (z. B. eines Projekts) aus
+    Spaltenarrays und löst sie; als Funktion auf Modulebene in
+    Worker-Prozessen aufrufbar.
+
+    Returns:
+        tuple: (Personenindizes, Aufgabenindizes, Kosten, Dauer in Sekunden)
+    """
+    start = time.perf_counter()
+    kostenmatrix, _ = kostenmatrix_aus_arrays(None, teilzeit, None, aufwand, unzulaessig)
+    personen_index, aufgaben_index = loese_kostenmatrix(kostenmatrix)
+    return personen_index, aufgaben_index, kostenmatrix[personen_index, aufgaben_index], time.perf_counter() - start
+
+
+def prozesskontext():
+    """
+    Startmethode für Prozesspools: forkserver (sonst spawn) statt fork. Ein
+    geforkter Kindprozess erbt die Threads, Locks und Datenbankverbindungen
+    des Webservers, und ein Lock, den gerade ein anderer Thread hält,
+    bleibt im Kind für immer gesperrt.
+    """
+    methoden = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methoden else "spawn")
@@ -0,0 +1,368 @@
+import json
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+from .models import Person, Aufgabe, Zuweisung, db
+
+# -----------------------------
+# Versionierte Zuweisungsläufe mit atomarem Umschalten
+# -----------------------------
+
+STATUS_LAUFEND = "laufend"
+STATUS_AKTIV = "aktiv"
+STATUS_ABGELOEST = "abgeloest"
+STATUS_FEHLGESCHLAGEN = "fehlgeschlagen"
+STATUS_ENTFERNT = "entfernt"  # abgelöst, Ergebnisse bereits gelöscht
+
+BATCHGROESSE = 5000
+
+# Anzahl abgelöster Läufe, deren Ergebnisse aufbewahrt werden
+LAEUFE_BEHALTEN = 5
+
+
+def _jetzt():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class Zuweisungslauf(db.Model):
+    """Eine Berechnung der Zuweisungen: Algorithmus, Parameter, Laufzeit und Status."""
+    __tablename__ = "zuweisungslauf"
+
+    id = db.Column(db.Integer, primary_key=True)
+    algorithmus = db.Column(db.String(50), nullable=False)
+    parameter = db.Column(db.Text)  # JSON
+    status = db.Column(db.String(20), nullable=False, default=STATUS_LAUFEND, index=True)
+    gestartet = db.Column(db.DateTime, nullable=False, default=_jetzt)
+    beendet = db.Column(db.DateTime)
+    dauer_s = db.Column(db.Float)
+    anzahl = db.Column(db.Integer)
+    fehler = db.Column(db.Text)
+
+    def als_dict(self):
+        return {
+            "id": self.id,
+            "algorithmus": self.algorithmus,
+            "parameter": json.loads(self.parameter) if self.parameter else {},
+            "status": self.status,
+            "gestartet": self.gestartet.isoformat() if self.gestartet else None,
+            "beendet": self.beendet.isoformat() if self.beendet else None,
+            "dauer_s": self.dauer_s,
+            "anzahl": self.anzahl,
+            "fehler": self.fehler,
+        }
+
+
+class LaufZuweisung(db.Model):
+    """Eine Zuweisung Person -> Aufgabe als Ergebnis eines Laufs."""
+    __tablename__ = "lauf_zuweisung"
+
+    id = db.Column(db.Integer, primary_key=True)
+    lauf_id = db.Column(db.Integer, db.ForeignKey("zuweisungslauf.id"), nullable=False, index=True)
+    person_id = db.Column(db.Integer, db.ForeignKey(f"{Person.__tablename__}.id"), nullable=False)
+    aufgabe_id = db.Column(db.Integer, db.ForeignKey(f"{Aufgabe.__tablename__}.id"), nullable=False)
+    kosten = db.Column(db.Float)
+
+
+class AktiverLauf(db.Model):
+    """
+    Zeiger auf den Lauf, dessen Ergebnisse gelesen werden (genau eine Zeile).
+    Das Umschalten ist ein einzelnes UPDATE und damit atomar.
+    """
+    __tablename__ = "aktiver_lauf"
+
+    id = db.Column(db.Integer, primary_key=True)
+    lauf_id = db.Column(db.Integer, db.ForeignKey("zuweisungslauf.id"), nullable=False)
+
+
+class LaufEingabe(db.Model):
+    """
+    Stand einer Person oder Aufgabe, mit dem ein Lauf berechnet wurde
+    (Grundlage für die inkrementelle Neuberechnung).
+    """
+    __tablename__ = "lauf_eingabe"
+
+    id = db.Column(db.Integer, primary_key=True)
+    lauf_id = db.Column(db.Integer, db.ForeignKey("zuweisungslauf.id"), nullable=False, index=True)
+    art = db.Column(db.String(10), nullable=False)  # "person" oder "aufgabe"
+    objekt_id = db.Column(db.Integer, nullable=False)
+    projekt_id = db.Column(db.Integer)
+    rang = db.Column(db.Integer, nullable=False)
+    wert = db.Column(db.Float, nullable=False)  # Teilzeitfaktor bzw. Arbeitsaufwand
+    kompetenzen = db.Column(db.Text)  # Fachkompetenzen, sortiert und kommagetrennt
+
+
+def _eingabe_zeilen(lauf_id, personen, aufgaben):
+    zeilen = [
+        {"lauf_id": lauf_id, "art": "person", "objekt_id": p_id, "projekt_id": None, "rang": rang, "wert": wert,
+         "kompetenzen": ",".join(kompetenzen)}
+        for p_id, (rang, wert, kompetenzen) in personen.items()
+    ]
+    zeilen.extend(
+        {"lauf_id": lauf_id, "art": "aufgabe", "objekt_id": a_id, "projekt_id": projekt_id, "rang": rang,
+         "wert": wert, "kompetenzen": ",".join(kompetenzen)}
+        for a_id, (projekt_id, rang, wert, kompetenzen) in aufgaben.items()
+    )
+    return zeilen
+
+
+def schreibe_eingaben(lauf_id, personen, aufgaben, commit=True):
+    """
+    Speichert die Eingaben eines Laufs.
+
+    Args:
+        personen: {id: (Rang, Teilzeitfaktor, Fachkompetenzen)}
+        aufgaben: {id: (Projekt-ID, Rang, Aufwand, Fachkompetenzen)}
+        commit: False, um in der laufenden Transaktion zu bleiben
+    """
+    zeilen = _eingabe_zeilen(lauf_id, personen, aufgaben)
+    for start in range(0, len(zeilen), BATCHGROESSE):
+        db.session.execute(LaufEingabe.__table__.insert(), zeilen[start:start + BATCHGROESSE])
+    if commit:
+        db.session.commit()
+
+
+def lade_eingaben(lauf_id):
+    """
+    Returns:
+        tuple: ({Personen-ID: (Rang, Teilzeitfaktor, Fachkompetenzen)},
+                {Aufgaben-ID: (Projekt-ID, Rang, Aufwand, Fachkompetenzen)})
+               oder None, wenn für den Lauf keine Eingaben gespeichert sind
+    """
+    personen, aufgaben = {}, {}
+    zeilen = db.session.query(
+        LaufEingabe.art, LaufEingabe.objekt_id, LaufEingabe.projekt_id, LaufEingabe.rang, LaufEingabe.wert,
+        LaufEingabe.kompetenzen
+    ).filter(LaufEingabe.lauf_id == lauf_id)
+    for art, objekt_id, projekt_id, rang, wert, kompetenzen in zeilen:
+        kompetenzen = tuple(kompetenzen.split(",")) if kompetenzen else ()
+        if art == "person":
+            personen[objekt_id] = (rang, wert, kompetenzen)
+        else:
+            aufgaben[objekt_id] = (projekt_id, rang, wert, kompetenzen)
+    if not personen and not aufgaben:
+        return None
+    return personen, aufgaben
+
+
+def ersetze_teilergebnis(lauf_id, aufgaben_ids, zuweisungen, personen, aufgaben, entfernte_personen=(),
+                         entfernte_aufgaben=()):
+    """
+    Ersetzt in einem Lauf die Zuweisungen der angegebenen Aufgaben und die
+    geänderten Eingaben in einer einzigen Transaktion; Leser sehen den Lauf
+    vorher oder nachher, nie dazwischen.
+
+    Args:
+        aufgaben_ids: Aufgaben, deren Zuweisungen neu berechnet wurden
+        zuweisungen: neue Zuweisungen [(person_id, aufgabe_id, kosten), ...]
+        personen / aufgaben: geänderte Eingaben wie bei schreibe_eingaben
+        entfernte_personen / entfernte_aufgaben: gelöschte Objekt-IDs
+
+    Returns:
+        int: Anzahl Zuweisungen des Laufs danach
+    """
+    ergebnis = LaufZuweisung.__table__
+    eingabe = LaufEingabe.__table__
+    laeufe = Zuweisungslauf.__table__
+
+    aufgaben_ids = list(aufgaben_ids)
+    for start in range(0, len(aufgaben_ids), BATCHGROESSE):
+        db.session.execute(ergebnis.delete().where(
+            ergebnis.c.lauf_id == lauf_id, ergebnis.c.aufgabe_id.in_(aufgaben_ids[start:start + BATCHGROESSE])
+        ))
+    werte = [
+        {"lauf_id": lauf_id, "person_id": int(p), "aufgabe_id": int(a), "kosten": float(k)}
+        for p, a, k in zuweisungen
+    ]
+    if werte:
+        db.session.execute(ergebnis.insert(), werte)
+
+    for art, ids in (("person", list(personen) + list(entfernte_personen)),
+                     ("aufgabe", list(aufgaben) + list(entfernte_aufgaben))):
+        for start in range(0, len(ids), BATCHGROESSE):
+            db.session.execute(eingabe.delete().where(
+                eingabe.c.lauf_id == lauf_id, eingabe.c.art == art,
+                eingabe.c.objekt_id.in_(ids[start:start + BATCHGROESSE])
+            ))
+    zeilen = _eingabe_zeilen(lauf_id, personen, aufgaben)
+    if zeilen:
+        db.session.execute(eingabe.insert(), zeilen)
+
+    anzahl = db.session.query(db.func.count(LaufZuweisung.id)).filter(LaufZuweisung.lauf_id == lauf_id).scalar()
+    db.session.execute(laeufe.update().where(laeufe.c.id == lauf_id).values(anzahl=anzahl, beendet=_jetzt()))
+    db.session.commit()
+    return anzahl
+
+
+def aktive_zuweisungen():
+    """
+    Abfrage über die Zuweisungen des aktiven Laufs. Zeiger und Ergebnisse
+    werden in derselben Abfrage gelesen, Leser sehen also immer einen
+    vollständigen Lauf.
+    """
+    return LaufZuweisung.query.join(AktiverLauf, AktiverLauf.lauf_id == LaufZuweisung.lauf_id)
+
+
+def aktiver_lauf_id():
+    zeiger = db.session.get(AktiverLauf, 1)
+    return zeiger.lauf_id if zeiger else None
+
+
+def aktiviere(lauf_id):
+    """
+    Macht einen abgeschlossenen Lauf in einer Transaktion zum aktiven Lauf;
+    der bisher aktive Lauf gilt danach als abgelöst.
+
+    Die Zeigerzeile wird mit SELECT ... FOR UPDATE gesperrt: gleichzeitige
+    Aktivierungen laufen nacheinander, und jede löst den zuletzt aktivierten
+    Lauf ab statt eines veralteten Stands (sonst blieben zwei Läufe "aktiv"
+    bzw. raeume_auf entfernte den Lauf, auf den der Zeiger zeigt).
+    """
+    zeiger = AktiverLauf.__table__
+    laeufe = Zuweisungslauf.__table__
+    sperre = select(zeiger.c.lauf_id).where(zeiger.c.id == 1).with_for_update()
+
+    bisher = db.session.execute(sperre).scalar()
+    if bisher is None:
+        try:
+            with db.session.begin_nested():
+                db.session.execute(zeiger.insert().values(id=1, lauf_id=lauf_id))
+        except IntegrityError:
+            # Ein gleichzeitiger erster Lauf hat die Zeile inzwischen angelegt
+            bisher = db.session.execute(sperre).scalar()
+    if bisher is not None:
+        db.session.execute(zeiger.update().where(zeiger.c.id == 1).values(lauf_id=lauf_id))
+        if bisher != lauf_id:
+            db.session.execute(laeufe.update().where(laeufe.c.id == bisher).values(status=STATUS_ABGELOEST))
+    db.session.execute(laeufe.update().where(laeufe.c.id == lauf_id).values(status=STATUS_AKTIV))
+    db.session.commit()
+
+
+def raeume_auf(behalten=LAEUFE_BEHALTEN):
+    """Löscht die Ergebnisse aller abgelösten Läufe außer den `behalten` neuesten."""
+    alte = [
+        lauf_id for (lauf_id,) in db.session.query(Zuweisungslauf.id)
+        .filter(Zuweisungslauf.status == STATUS_ABGELOEST)
+        .order_by(Zuweisungslauf.id.desc())
+        .offset(behalten)
+    ]
+    if alte:
+        for tabelle in (LaufZuweisung.__table__, LaufEingabe.__table__):
+            db.session.execute(tabelle.delete().where(tabelle.c.lauf_id.in_(alte)))
+        laeufe = Zuweisungslauf.__table__
+        db.session.execute(laeufe.update().where(laeufe.c.id.in_(alte)).values(status=STATUS_ENTFERNT))
+        db.session.commit()
+
+
+class Laufschreiber:
+    """
+    Sammelt die Ergebnisse eines Laufs und schreibt sie per executemany-Insert
+    in Chargen. Da der Lauf erst nach dem letzten Insert aktiviert wird, sind
+    bereits geschriebene Chargen für Leser unsichtbar. Mit eine_transaktion
+    werden die Chargen erst beim letzten leere() gemeinsam festgeschrieben.
+    """
+
+    def __init__(self, lauf_id, batchgroesse=BATCHGROESSE, eine_transaktion=False):
+        self.lauf_id = lauf_id
+        self.batchgroesse = batchgroesse
+        self.eine_transaktion = eine_transaktion
+        self.anzahl = 0
+        self._puffer = []
+
+    def schreibe(self, zuweisungen):
+        """
+        Args:
+            zuweisungen: iterierbar über (person_id, aufgabe_id, kosten)
+        """
+        zuweisungen = iter(zuweisungen)
+        while True:
+            charge = list(islice(zuweisungen, self.batchgroesse))
+            if not charge:
+                break
+            self._puffer.extend(
+                {"lauf_id": self.lauf_id, "person_id": int(p), "aufgabe_id": int(a), "kosten": float(k)}
+                for p, a, k in charge
+            )
+            if len(self._puffer) >= self.batchgroesse:
+                self.leere(commit=not self.eine_transaktion)
+
+    def leere(self, commit=True):
+        if self._puffer:
+            db.session.execute(LaufZuweisung.__table__.insert(), self._puffer)
+            self.anzahl += len(self._puffer)
+            self._puffer = []
+        if commit:
+            db.session.commit()
+
+
+@contextmanager
+def neuer_lauf(algorithmus, parameter=None, batchgroesse=BATCHGROESSE, eine_transaktion=False, start=None):
+    """
+    Legt einen Lauf an und liefert einen Laufschreiber. Endet der Block ohne
+    Fehler, werden die restlichen Ergebnisse geschrieben und der Lauf atomar
+    aktiviert; bei einem Fehler wird er als fehlgeschlagen markiert und der
+    bisher aktive Lauf bleibt sichtbar. Mit eine_transaktion werden alle
+    Ergebnisse (und was im Block sonst ohne Commit geschrieben wird) am Ende
+    in einer einzigen Transaktion festgeschrieben.
+
+    Args:
+        start: time.perf_counter() zu Beginn der Berechnung; gestartet und
+               dauer_s umfassen dann Laden, Lösen und Schreiben. Ohne Angabe
+               zählt nur das Schreiben.
+
+    Beispiel:
+        start = time.perf_counter()
+        ...
+        with neuer_lauf("kuhn-munkres", start=start) as lauf:
+            lauf.schreibe(zip(personen_ids, aufgaben_ids, kosten))
+        lauf.lauf_id, lauf.anzahl
+    """
+    if start is None:
+        start = time.perf_counter()
+    gestartet = _jetzt() - timedelta(seconds=time.perf_counter() - start)
+    lauf = Zuweisungslauf(algorithmus=algorithmus, parameter=json.dumps(parameter or {}), status=STATUS_LAUFEND,
+                          gestartet=gestartet)
+    db.session.add(lauf)
+    db.session.commit()
+    lauf_id = lauf.id
+
+    schreiber = Laufschreiber(lauf_id, batchgroesse, eine_transaktion)
+    laeufe = Zuweisungslauf.__table__
+    try:
+        yield schreiber
+        schreiber.leere()
+    except Exception as e:
+        db.session.rollback()
+        for tabelle in (LaufZuweisung.__table__, LaufEingabe.__table__):
+            db.session.execute(tabelle.delete().where(tabelle.c.lauf_id == lauf_id))
+        db.session.execute(laeufe.update().where(laeufe.c.id == lauf_id).values(
+            status=STATUS_FEHLGESCHLAGEN, beendet=_jetzt(), dauer_s=time.perf_counter() - start, fehler=str(e)
+        ))
+        db.session.commit()
+        raise
+
+    db.session.execute(laeufe.update().where(laeufe.c.id == lauf_id).values(
+        beendet=_jetzt(), dauer_s=time.perf_counter() - start, anzahl=schreiber.anzahl
+    ))
+    aktiviere(lauf_id)
+    raeume_auf()
+
+
+def uebernimm_altbestand():
+    """
+    Übernimmt die Zeilen der bisherigen Tabelle Zuweisung einmalig als Lauf
+    "altbestand", falls noch kein Lauf aktiv ist.
+
+    Returns:
+        int: ID des neuen Laufs oder None
+    """
+    if aktiver_lauf_id() is not None:
+        return None
+    zeilen = db.session.query(Zuweisung.person_id, Zuweisung.aufgabe_id, Zuweisung.kosten).all()
+    with neuer_lauf("altbestand") as lauf:
+        lauf.schreibe((p, a, k if k is not None else 0.0) for p, a, k in zeilen)
+    return lauf.lauf_id
@@ -0,0 +1,245 @@
+import hashlib
+import itertools
+import re
+from urllib.parse import urlencode
+
+from flask import current_app, jsonify, request
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import TextClause
+
+from .models import db
+from .monate import monat_ordinal
+
+# -----------------------------
+# Listen-Endpunkte: Keyset-Paginierung, Feldauswahl und bedingtes GET
+# -----------------------------
+
+
+class Tabellenversion(db.Model):
+    """
+    Änderungszähler je Tabelle. Jede Einfügung, Änderung oder Löschung über
+    eine Session erhöht den Zähler in derselben Transaktion; da der Zähler in
+    der Datenbank steht, sehen alle Worker und die CLI denselben Stand.
+    """
+    __tablename__ = "tabellenversion"
+
+    tabelle = db.Column(db.String(100), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+
+# Schreibende Textstatements (text()) und die Tabellen, die sie nennen
+_DML = re.compile(r"^\s*(insert|update|delete|replace)\b", re.IGNORECASE)
+_DML_TABELLE = re.compile(r"\b(?:into|update|from)\s+[\"`\[]?(\w+)", re.IGNORECASE)
+
+
+@event.listens_for(Tabellenversion.__table__, "after_create")
+def _lege_zaehler_an(tabelle, connection, **kwargs):
+    """Legt beim Anlegen der Tabelle je bekannter Tabelle einen Zähler mit 0 an."""
+    namen = sorted(t.name for t in tabelle.metadata.sorted_tables if t is not tabelle)
+    if namen:
+        connection.execute(tabelle.insert(), [{"tabelle": name, "version": 0} for name in namen])
+
+
+def erhoehe_versionen(connection, tabellen):
+    """
+    Erhöht die Zähler der Tabellen über die Verbindung (also in deren
+    Transaktion). Die Zähler der Modelltabellen existieren seit dem Anlegen
+    der Tabelle tabellenversion; fehlt einer (ältere Datenbank, text() auf
+    eine fremde Tabelle), wird er in einem Savepoint eingefügt. Verliert der
+    Insert gegen einen gleichzeitigen Schreiber, wird dessen Zeile erhöht.
+    """
+    versionen = Tabellenversion.__table__
+    for tabelle in sorted(set(tabellen) - {versionen.name}):
+        erhoehe = versionen.update().where(versionen.c.tabelle == tabelle).values(version=versionen.c.version + 1)
+        if connection.execute(erhoehe).rowcount:
+            continue
+        try:
+            with connection.begin_nested():
+                connection.execute(versionen.insert().values(tabelle=tabelle, version=1))
+        except IntegrityError:
+            connection.execute(erhoehe)
+
+
+def tabellen_versionen(tabellen):
+    """Aktuelle Zähler der Tabellen aus der Datenbank (eine Abfrage; fehlend = 0)."""
+    versionen = dict(
+        db.session.query(Tabellenversion.tabelle, Tabellenversion.version)
+        .filter(Tabellenversion.tabelle.in_(list(tabellen)))
+    )
+    return {t: versionen.get(t, 0) for t in tabellen}
+
+
+def _geaenderte_tabellen(zustand):
+    if zustand.is_insert or zustand.is_update or zustand.is_delete:
+        tabelle = getattr(zustand.statement, "table", None)
+        return [tabelle.name] if tabelle is not None else []
+    if isinstance(zustand.statement, TextClause) and _DML.match(zustand.statement.text):
+        return _DML_TABELLE.findall(zustand.statement.text)
+    return []
+
+
+_beobachtet = set()
+
+
+def beobachte_aenderungen():
+    """
+    Hängt Session-Listener an, die geänderte Tabellen hochzählen: ORM-Objekte
+    beim Flush sowie Bulk-Statements (insert/update/delete über session.execute
+    bzw. Query.delete/update) und schreibende text()-Statements.
+    """
+    def _nach_flush(session, flush_context):
+        tabellen = set()
+        for objekt in itertools.chain(session.new, session.dirty, session.deleted):
+            tabelle = getattr(type(objekt), "__table__", None)
+            if tabelle is not None:
+                tabellen.add(tabelle.name)
+        if tabellen:
+            erhoehe_versionen(session.connection(), tabellen)
+
+    def _bei_ausfuehrung(zustand):
+        tabellen = _geaenderte_tabellen(zustand)
+        if tabellen:
+            erhoehe_versionen(zustand.session.connection(bind_arguments=zustand.bind_arguments), tabellen)
+
+    if Session in _beobachtet:
+        return
+    event.listen(Session, "after_flush", _nach_flush)
+    event.listen(Session, "do_orm_execute", _bei_ausfuehrung)
+    _beobachtet.add(Session)
+
+
+class Listenfehler(ValueError):
+    """Ungültiger Paginierungs-, Feld- oder Filterparameter."""
+
+
+def _ganzzahl(name):
+    wert = request.args.get(name)
+    if wert in (None, ""):
+        return None
+    try:
+        zahl = int(wert)
+    except ValueError:
+        raise Listenfehler(f"Parameter '{name}' muss eine ganze Zahl sein")
+    if zahl < 0:
+        raise Listenfehler(f"Parameter '{name}' darf nicht negativ sein")
+    return zahl
+
+
+def parameterliste(name):
+    """Kommagetrennter Filterparameter als Liste (leer, wenn nicht gesetzt)."""
+    return [w.strip() for w in request.args.get(name, "").split(",") if w.strip()]
+
+
+def monatsbereich():
+    """
+    Liest den Filter ?von=...&bis=... (beliebiges von monat_ordinal
+    unterstütztes Format) als Monatsnummern; fehlende Grenzen sind None.
+    """
+    grenzen = []
+    for name in ("von", "bis"):
+        wert = request.args.get(name)
+        try:
+            grenzen.append(monat_ordinal(wert) if wert else None)
+        except ValueError as e:
+            raise Listenfehler(str(e))
+    return tuple(grenzen)
+
+
+def ueberschneidet(start, ende, von, bis):
+    """True, wenn der Zeitraum [start, ende] den Filterbereich [von, bis] berührt."""
+    try:
+        start, ende = monat_ordinal(start), monat_ordinal(ende)
+    except (TypeError, ValueError):
+        return False
+    return (von is None or ende >= von) and (bis is None or start <= bis)
+
+
+def listen_antwort(abfrage, id_spalte, als_dict, tabellen, nachfilter=None):
+    """
+    Baut die Antwort eines Listen-Endpunkts.
+
+    - Bedingtes GET: Das ETag ergibt sich aus den Änderungszählern der
+      beteiligten Tabellen (Tabelle tabellenversion) und dem Query-String;
+      bei passendem If-None-Match wird 304 geliefert, ohne die Liste selbst
+      abzufragen.
+    - Keyset-Paginierung: ?limit=n&cursor=<id> liefert höchstens n Zeilen mit
+      id > cursor, aufsteigend nach id. Der Cursor der nächsten Seite steht
+      im Header X-Naechster-Cursor (und als Link rel="next").
+    - Feldauswahl: ?fields=a,b beschränkt die Felder jeder Zeile. Das
+      geschieht erst in Python: die Abfrage liest weiterhin alle Spalten, die
+      als_dict braucht; ?fields verkleinert nur die Antwort.
+
+    Nachfilter (z. B. Monatsbereiche über Datumstexte in verschiedenen
+    Formaten) laufen ebenfalls in Python: die Abfrage wird ab dem Cursor in
+    Stücken von 500 Zeilen (yield_per) gelesen und gefiltert, bis die Seite
+    voll ist. Bei seltenen Treffern liest eine Seite also weit mehr Zeilen, als
+    sie liefert; ohne limit die ganze Tabelle.
+
+    Args:
+        abfrage: Query über Zeilentupel (gefiltert, noch ohne Sortierung)
+        id_spalte: Spalte für den Cursor
+        als_dict: Funktion Zeile -> dict
+        tabellen: Namen der Tabellen, aus denen die Abfrage liest
+        nachfilter: optionale Funktion dict -> bool für Filter, die nicht in
+                    SQL ausgedrückt werden können (z. B. Monatsbereiche)
+
+    Returns:
+        Flask-Antwort
+    """
+    versionen = tabellen_versionen(tabellen)
+    schluessel = "|".join(
+        [request.query_string.decode("utf-8", "replace")] + [f"{t}:{versionen[t]}" for t in sorted(versionen)]
+    )
+    etag = hashlib.sha1(schluessel.encode("utf-8")).hexdigest()
+    if request.if_none_match.contains_weak(etag):
+        antwort = current_app.response_class(status=304)
+        antwort.set_etag(etag, weak=True)
+        return antwort
+
+    limit = _ganzzahl("limit")
+    cursor = _ganzzahl("cursor")
+    limit_max = current_app.config.get("LISTEN_LIMIT_MAX", 1000)
+    if limit is not None:
+        limit = min(max(limit, 1), limit_max)
+
+    abfrage = abfrage.order_by(id_spalte)
+    if cursor is not None:
+        abfrage = abfrage.filter(id_spalte > cursor)
+
+    # Ohne Nachfilter begrenzt die Datenbank die Seite; mit Nachfilter wird
+    # die (einzige) Abfrage in Stücken gelesen, bis die Seite voll ist
+    if nachfilter is None:
+        if limit is not None:
+            abfrage = abfrage.limit(limit + 1)
+        zeilen = (als_dict(z) for z in abfrage)
+    else:
+        zeilen = (d for d in (als_dict(z) for z in abfrage.yield_per(500)) if nachfilter(d))
+
+    if limit is None:
+        result = list(zeilen)
+        naechster = None
+    else:
+        result = list(itertools.islice(zeilen, limit + 1))
+        naechster = result[limit - 1]["id"] if len(result) > limit else None
+        result = result[:limit]
+
+    felder = request.args.get("fields")
+    if felder:
+        auswahl = [f.strip() for f in felder.split(",") if f.strip()]
+        if result:
+            unbekannt = [f for f in auswahl if f not in result[0]]
+            if unbekannt:
+                raise Listenfehler(f"Unbekannte Felder: {', '.join(unbekannt)}")
+        result = [{f: d[f] for f in auswahl} for d in result]
+
+    antwort = jsonify(result)
+    antwort.set_etag(etag, weak=True)
+    antwort.headers["Cache-Control"] = "no-cache"
+    if naechster is not None:
+        antwort.headers["X-Naechster-Cursor"] = str(naechster)
+        argumente = request.args.to_dict()
+        argumente["cursor"] = str(naechster)
+        antwort.headers["Link"] = f'<{request.path}?{urlencode(argumente)}>; rel="next"'
+    return antwort
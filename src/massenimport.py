@@ -0,0 +1,257 @@
+import csv
+import json
+from itertools import islice
+
+from .monate import monat_ordinal
+from .verfuegbarkeit import MONAT_MUSTER
+
+# -----------------------------
+# Massenimport von Personen, Projekten und Aufgaben (CSV / NDJSON)
+# -----------------------------
+
+BATCHGROESSE = 5000
+MAX_FEHLER = 1000
+
+
+class Importfehler(ValueError):
+    """Eine Importzeile ist ungültig."""
+
+
+def _textzeilen(strom):
+    """
+    Dekodiert den Strom Zeile für Zeile statt blockweise, damit ein
+    Kodierungsfehler erst an der betroffenen Zeile auffällt (Zeilennummer im
+    Attribut "zeile" der Ausnahme).
+    """
+    for nr, zeile in enumerate(strom, start=1):
+        try:
+            text = zeile.decode("utf-8")
+        except UnicodeDecodeError as e:
+            e.zeile = nr
+            raise
+        yield text.lstrip("\ufeff") if nr == 1 else text
+
+
+def lies_zeilen(strom, format):
+    """
+    Liest einen (Byte-)Strom zeilenweise als Dictionaries, ohne ihn vollständig
+    in den Speicher zu laden. Nicht dekodierbare Zeilen lösen
+    UnicodeDecodeError aus, defektes CSV csv.Error.
+
+    Args:
+        strom: binärer Datenstrom (z. B. request.stream)
+        format: "csv" oder "ndjson"
+
+    Yields:
+        tuple: (Zeilennummer, dict oder Importfehler)
+    """
+    text = _textzeilen(strom)
+    if format == "csv":
+        nr = 1
+        try:
+            for nr, zeile in enumerate(csv.DictReader(text), start=2):
+                yield nr, zeile
+        except csv.Error as e:
+            e.zeile = nr + 1
+            raise
+    elif format == "ndjson":
+        for nr, zeile in enumerate(text, start=1):
+            if not zeile.strip():
+                continue
+            try:
+                wert = json.loads(zeile)
+            except json.JSONDecodeError as e:
+                yield nr, Importfehler(f"Ungültiges JSON: {e.msg}")
+                continue
+            yield nr, wert if isinstance(wert, dict) else Importfehler("Zeile ist kein JSON-Objekt")
+    else:
+        raise Importfehler(f"Unbekanntes Importformat: {format}")
+
+
+def _feld(zeile, *namen, pflicht=True, text=True):
+    """
+    Erster gesetzter Wert unter den Namen. Mit text=True (Standard) muss er
+    ein String sein; NDJSON kann sonst Zahlen, Listen oder Objekte liefern.
+    """
+    for name in namen:
+        wert = zeile.get(name)
+        if wert not in (None, ""):
+            if isinstance(wert, str):
+                return wert.strip()
+            if text:
+                raise Importfehler(f"Feld '{name}' muss Text sein, nicht {type(wert).__name__}")
+            return wert
+    if pflicht:
+        raise Importfehler(f"Feld '{namen[0]}' fehlt")
+    return None
+
+
+def _zahl(wert, name, positiv=True):
+    try:
+        zahl = float(str(wert).replace(",", "."))
+    except ValueError:
+        raise Importfehler(f"Feld '{name}' ist keine Zahl: {wert!r}")
+    if positiv and zahl <= 0:
+        raise Importfehler(f"Feld '{name}' muss größer als 0 sein")
+    return zahl
+
+
+def _zeitraum(start, ende):
+    try:
+        if monat_ordinal(start) > monat_ordinal(ende):
+            raise Importfehler(f"Start {start} liegt nach Ende {ende}")
+    except ValueError as e:
+        raise Importfehler(str(e))
+
+
+def _verfuegbarkeit(zeile):
+    """
+    Verfügbarkeit als Datenbankstring "MM/YYYY:wert,...". Akzeptiert den
+    fertigen String, ein Dictionary (NDJSON) oder die Spalten
+    verfuegbarkeit_MM/YYYY aus data/personen.csv.
+    """
+    wert = zeile.get("verfuegbare_monate")
+    if isinstance(wert, dict):
+        eintraege = [f"{monat}:{_zahl(v, f'verfuegbare_monate.{monat}', positiv=False)}" for monat, v in wert.items()]
+    elif wert:
+        eintraege = [e.strip() for e in str(wert).split(",") if e.strip()]
+    else:
+        eintraege = [
+            f"{name.split('_', 1)[1]}:{_zahl(v, name, positiv=False)}"
+            for name, v in zeile.items()
+            if name.startswith("verfuegbarkeit_") and v not in (None, "")
+        ]
+    for eintrag in eintraege:
+        if not MONAT_MUSTER.fullmatch(eintrag):
+            raise Importfehler(f"Ungültiger Verfügbarkeitseintrag: {eintrag!r}")
+    return ",".join(eintraege)
+
+
+def person_aus_zeile(zeile):
+    """
+    Spalten der Tabelle person aus einer Importzeile. Neben den Feldnamen des
+    Modells wird das Layout von data/personen.csv verstanden (name,
+    kompetenzen, zeitbudget, verfuegbarkeit_MM/YYYY).
+    """
+    vorname = _feld(zeile, "vorname", pflicht=False)
+    nachname = _feld(zeile, "nachname", pflicht=False)
+    if vorname is None and nachname is None:
+        name = _feld(zeile, "name")
+        vorname, _, nachname = name.rpartition(" ")
+        vorname, nachname = (vorname, nachname) if vorname else (nachname, "")
+    return {
+        "vorname": vorname or "",
+        "nachname": nachname or "",
+        "kompetenz": _feld(zeile, "kompetenz", "kompetenzen"),
+        "teilzeitfaktor": _zahl(_feld(zeile, "teilzeitfaktor", "zeitbudget", text=False), "teilzeitfaktor"),
+        "verfuegbare_monate": _verfuegbarkeit(zeile),
+    }
+
+
+def projekt_aus_zeile(zeile):
+    """Spalten der Tabelle projekt aus einer Importzeile."""
+    start = _feld(zeile, "projektstart", "start")
+    ende = _feld(zeile, "projektende", "ende")
+    _zeitraum(start, ende)
+    anzahl = _feld(zeile, "anzahl_aufgaben", pflicht=False, text=False)
+    return {
+        "projektname": _feld(zeile, "projektname", "name"),
+        "projektstart": start,
+        "projektende": ende,
+        "anzahl_aufgaben": int(_zahl(anzahl, "anzahl_aufgaben", positiv=False)) if anzahl is not None else 0,
+        "kompetenz": _feld(zeile, "kompetenz"),
+    }
+
+
+def aufgabe_aus_zeile(zeile, projekt_ids):
+    """
+    Spalten der Tabelle aufgabe aus einer Importzeile. Das Projekt wird über
+    die Zuordnung projekt_ids (Projektname bzw. ID als Text -> ID) aufgelöst.
+    Versteht auch das Layout von data/teilaufgaben.csv (bezeichnung, kompetenz,
+    aufwand, projekt_id, start, ende).
+    """
+    projekt = str(_feld(zeile, "projekt", "projekt_id", text=False))
+    if projekt not in projekt_ids:
+        raise Importfehler(f"Projekt '{projekt}' nicht gefunden")
+    start = _feld(zeile, "startmonat", "start")
+    ende = _feld(zeile, "endmonat", "ende")
+    _zeitraum(start, ende)
+    return {
+        "projekt_id": projekt_ids[projekt],
+        "aufgabe": _feld(zeile, "aufgabe", "bezeichnung"),
+        "startmonat": start,
+        "endmonat": ende,
+        "minimale_kompetenz": _feld(zeile, "minimale_kompetenz", "kompetenz"),
+        "arbeitsaufwand": _zahl(_feld(zeile, "arbeitsaufwand", "aufwand", text=False), "arbeitsaufwand"),
+    }
+
+
+def importiere(session, tabelle, zeilen, umwandeln, batchgroesse=BATCHGROESSE, max_fehler=MAX_FEHLER):
+    """
+    Prüft und schreibt Importzeilen stapelweise: jede Charge wird validiert,
+    mit einem einzigen executemany-Insert geschrieben und in einer eigenen
+    Transaktion festgeschrieben. Schlägt der Insert einer Charge fehl, wird nur
+    diese Charge zurückgerollt und ihre Zeilen als fehlerhaft gemeldet.
+    Bricht der Datenstrom ab (csv.Error, UnicodeDecodeError), werden die bis
+    dahin gelesenen Zeilen noch geschrieben, der Import endet und der Bericht
+    nennt die nicht lesbare Zeile, mit "abgebrochen": True.
+
+    Args:
+        session: SQLAlchemy-Session
+        tabelle: Zieltabelle (Model.__table__)
+        zeilen: Iterator über (Zeilennummer, dict oder Importfehler)
+        umwandeln: Funktion Importzeile -> Spaltenwerte, wirft Importfehler
+
+    Returns:
+        dict: {"importiert", "fehlerhaft", "fehler": [{"zeile", "fehler"}, ...]},
+              bei Abbruch zusätzlich "abgebrochen"
+    """
+    bericht = {"importiert": 0, "fehlerhaft": 0, "fehler": []}
+
+    def melde(nr, fehler):
+        bericht["fehlerhaft"] += 1
+        if len(bericht["fehler"]) < max_fehler:
+            bericht["fehler"].append({"zeile": nr, "fehler": str(fehler)})
+
+    zeilen = iter(zeilen)
+    letzte = 0
+    abbruch = None
+    while abbruch is None:
+        charge = []
+        try:
+            for nr, zeile in islice(zeilen, batchgroesse):
+                charge.append((nr, zeile))
+                letzte = nr
+        except (csv.Error, UnicodeDecodeError) as e:
+            abbruch = e
+        if not charge:
+            break
+
+        werte, nummern = [], []
+        for nr, zeile in charge:
+            try:
+                if isinstance(zeile, Exception):
+                    raise zeile
+                werte.append(umwandeln(zeile))
+                nummern.append(nr)
+            except (ValueError, KeyError, TypeError, AttributeError) as e:
+                # Importfehler und jeder andere Umwandlungsfehler betrifft nur diese Zeile
+                melde(nr, e)
+
+        if not werte:
+            continue
+        try:
+            session.execute(tabelle.insert(), werte)
+            session.commit()
+            bericht["importiert"] += len(werte)
+        except Exception as e:
+            session.rollback()
+            for nr in nummern:
+                melde(nr, f"Charge verworfen: {e}")
+
+    if abbruch is not None:
+        melde(getattr(abbruch, "zeile", letzte + 1), f"Datenstrom nicht lesbar: {abbruch}")
+        bericht["abgebrochen"] = True
+    if bericht["fehlerhaft"] > len(bericht["fehler"]):
+        bericht["fehler_gekuerzt"] = True
+    return bericht
@@ -0,0 +1,183 @@
+import bisect
+import logging
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+# -----------------------------
+# Laufzeitmessung je Phase, Zähler und Prometheus-Export
+# -----------------------------
+
+PRAEFIX = "personalverteilung_"
+
+# Obergrenzen der Latenz-Buckets in Sekunden (+Inf kommt automatisch hinzu)
+LATENZ_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+log = logging.getLogger("personalverteilung")
+
+_NICHTS = nullcontext()
+
+
+def protokolliere(ereignis, stufe=logging.INFO, **felder):
+    """
+    Strukturierte Logzeile im logfmt-Format (ereignis=... schluessel=wert ...).
+    Die Felder stehen zusätzlich als record.felder für JSON-Formatter bereit.
+    """
+    if not log.isEnabledFor(stufe):
+        return
+    teile = [f"ereignis={ereignis}"]
+    for name, wert in felder.items():
+        if isinstance(wert, float):
+            wert = f"{wert:.6g}"
+        wert = str(wert)
+        if not wert or any(z in wert for z in ' "='):
+            wert = '"' + wert.replace('"', '\\"') + '"'
+        teile.append(f"{name}={wert}")
+    log.log(stufe, " ".join(teile), extra={"felder": {"ereignis": ereignis, **felder}})
+
+
+class _Histogramm:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.anzahl_je_bucket = [0] * (len(buckets) + 1)
+        self.summe = 0.0
+        self.anzahl = 0
+
+    def beobachte(self, wert):
+        self.anzahl_je_bucket[bisect.bisect_left(self.buckets, wert)] += 1
+        self.summe += wert
+        self.anzahl += 1
+
+
+class Metriken:
+    """
+    Prozesslokale Zähler und Histogramme mit Labels. Ist die Sammlung
+    abgeschaltet (aktiv = False), kehren alle Aufrufe sofort zurück und
+    phase() liefert einen leeren Kontextmanager.
+    """
+
+    def __init__(self, buckets=LATENZ_BUCKETS):
+        self.aktiv = True
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._zaehler = {}
+        self._histogramme = {}
+        self._hilfe = {}
+
+    def beschreibe(self, name, hilfe):
+        """Hilfetext (# HELP) einer Metrik."""
+        self._hilfe[name] = hilfe
+
+    def zaehle(self, name, wert=1, **labels):
+        """Erhöht den Zähler name{labels} um wert."""
+        if not self.aktiv:
+            return
+        schluessel = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._zaehler[schluessel] = self._zaehler.get(schluessel, 0) + wert
+
+    def beobachte(self, name, wert, **labels):
+        """Trägt einen Messwert (z. B. eine Dauer in Sekunden) ins Histogramm name{labels} ein."""
+        if not self.aktiv:
+            return
+        schluessel = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogramm = self._histogramme.get(schluessel)
+            if histogramm is None:
+                histogramm = self._histogramme[schluessel] = _Histogramm(self.buckets)
+            histogramm.beobachte(wert)
+
+    def phase(self, name, **labels):
+        """
+        Misst die Dauer eines Blocks als phase_dauer_sekunden{phase=name, ...}
+        und protokolliert sie.
+
+        Beispiel:
+            with metriken.phase("kostenmatrix", algorithmus="kuhn-munkres"):
+                ...
+        """
+        if not self.aktiv:
+            return _NICHTS
+        return self._messe(name, labels)
+
+    @contextmanager
+    def _messe(self, name, labels):
+        start = time.perf_counter()
+        fehler = None
+        try:
+            yield
+        except BaseException as e:
+            fehler = type(e).__name__
+            raise
+        finally:
+            dauer = time.perf_counter() - start
+            self.beobachte("phase_dauer_sekunden", dauer, phase=name, **labels)
+            if fehler is None:
+                protokolliere("phase", phase=name, dauer_s=dauer, **labels)
+            else:
+                protokolliere("phase", logging.WARNING, phase=name, dauer_s=dauer, fehler=fehler, **labels)
+
+    def leere(self):
+        with self._lock:
+            self._zaehler.clear()
+            self._histogramme.clear()
+
+    def als_prometheus(self):
+        """Alle Metriken im Prometheus-Textformat (Version 0.0.4)."""
+        with self._lock:
+            zaehler = sorted(self._zaehler.items())
+            histogramme = sorted(
+                (k, (list(h.anzahl_je_bucket), h.summe, h.anzahl)) for k, h in self._histogramme.items()
+            )
+
+        zeilen = []
+        letzter = None
+        for (name, labels), wert in zaehler:
+            voll = f"{PRAEFIX}{name}_total"
+            if name != letzter:
+                zeilen.extend(self._kopf(voll, name, "counter"))
+                letzter = name
+            zeilen.append(f"{voll}{_labels(labels)} {_zahl(wert)}")
+
+        for (name, labels), (je_bucket, summe, anzahl) in histogramme:
+            voll = f"{PRAEFIX}{name}"
+            if name != letzter:
+                zeilen.extend(self._kopf(voll, name, "histogram"))
+                letzter = name
+            kumuliert = 0
+            for grenze, n in zip(self.buckets + (float("inf"),), je_bucket):
+                kumuliert += n
+                le = "+Inf" if grenze == float("inf") else _zahl(grenze)
+                zeilen.append(f"{voll}_bucket{_labels(labels + (('le', le),))} {kumuliert}")
+            zeilen.append(f"{voll}_sum{_labels(labels)} {_zahl(summe)}")
+            zeilen.append(f"{voll}_count{_labels(labels)} {anzahl}")
+        return "\n".join(zeilen) + "\n"
+
+    def _kopf(self, voll, name, typ):
+        kopf = []
+        if name in self._hilfe:
+            kopf.append(f"# HELP {voll} {self._hilfe[name]}")
+        kopf.append(f"# TYPE {voll} {typ}")
+        return kopf
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    teile = []
+    for name, wert in labels:
+        wert = str(wert).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        teile.append(f'{name}="{wert}"')
+    return "{" + ",".join(teile) + "}"
+
+
+def _zahl(wert):
+    return repr(float(wert)) if isinstance(wert, float) else str(wert)
+
+
+metriken = Metriken()
+metriken.beschreibe("phase_dauer_sekunden", "Dauer der Berechnungsphasen (Laden, Matrix, Lösen, Speichern)")
+metriken.beschreibe("http_anfrage_dauer_sekunden", "Bearbeitungsdauer der API-Anfragen")
+metriken.beschreibe("zuweisungen", "Erzeugte Zuweisungen")
+metriken.beschreibe("unzulaessige_paare", "Personen-Aufgaben-Paare ohne ausreichende Kompetenz")
+metriken.beschreibe("berechnungen", "Abgeschlossene Berechnungen")
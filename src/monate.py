@@ -0,0 +1,124 @@
+import re
+
+import numpy as np
+
+# -----------------------------
+# Globaler Monatsindex und Präfixsummen für Kapazitätsabfragen
+# -----------------------------
+
+_MONAT_JAHR = re.compile(r"^\s*(\d{1,2})/(\d{4})\s*$")            # "03/2025"
+_TAG_MONAT_JAHR = re.compile(r"^\s*\d{1,2}\.(\d{1,2})\.(\d{2,4})\s*$")  # "01.09.25", "01.09.2025"
+_ISO = re.compile(r"^\s*(\d{4})-(\d{1,2})(?:-\d{1,2})?\s*$")        # "2025-09", "2025-09-01"
+
+
+def monat_ordinal(wert):
+    """
+    Wandelt eine Monatsangabe in eine fortlaufende Monatsnummer um
+    (Jahr * 12 + Monat - 1), sodass Zeiträume über Jahresgrenzen hinweg
+    direkt verglichen und subtrahiert werden können.
+
+    Unterstützt "MM/YYYY", "DD.MM.YY", "DD.MM.YYYY" und "YYYY-MM[-DD]".
+    """
+    match = _MONAT_JAHR.match(wert)
+    if match:
+        monat, jahr = int(match.group(1)), int(match.group(2))
+    else:
+        match = _TAG_MONAT_JAHR.match(wert)
+        if match:
+            monat, jahr = int(match.group(1)), int(match.group(2))
+            if jahr < 100:
+                jahr += 2000
+        else:
+            match = _ISO.match(wert)
+            if not match:
+                raise ValueError(f"Unbekanntes Monatsformat: {wert!r}")
+            jahr, monat = int(match.group(1)), int(match.group(2))
+
+    if not 1 <= monat <= 12:
+        raise ValueError(f"Ungültiger Monat in {wert!r}")
+    return jahr * 12 + monat - 1
+
+
+def monat_label(ordinal):
+    """Umkehrung von monat_ordinal: 24302 -> "03/2025"."""
+    jahr, monat = divmod(int(ordinal), 12)
+    return f"{monat + 1:02d}/{jahr}"
+
+
+class Monatsachse:
+    """
+    Zusammenhängender Monatsbereich [start, ende] als Spaltenachse für
+    Kapazitätsmatrizen. Spalte 0 entspricht dem Monat mit Ordinalzahl start.
+    """
+
+    def __init__(self, start, ende):
+        self.start = int(start)
+        self.ende = int(ende)
+
+    @classmethod
+    def umfassend(cls, ordinale):
+        """Kleinste Achse, die alle übergebenen Monatsnummern enthält."""
+        ordinale = np.asarray(list(ordinale), dtype=np.int64)
+        if len(ordinale) == 0:
+            return cls(0, -1)
+        return cls(ordinale.min(), ordinale.max())
+
+    def __len__(self):
+        return max(0, self.ende - self.start + 1)
+
+    def spalte(self, ordinal):
+        """Spaltenindex zu einer Monatsnummer (auch vektorisiert)."""
+        return np.asarray(ordinal) - self.start
+
+    @property
+    def labels(self):
+        return [monat_label(o) for o in range(self.start, self.ende + 1)]
+
+
+class Kapazitaetspraefix:
+    """
+    Präfixsummen der freien Kapazität je Person über die Monatsachse.
+    Speicherlayout (Monate + 1) × Personen, damit eine Abfrage über alle
+    Personen nur zwei zusammenhängende Zeilen liest.
+
+    frei(von, bis) beantwortet "freie Stunden in den Monaten [von, bis]" in O(1)
+    je Person; belege() zieht eine Belegung ab und aktualisiert die Präfixe
+    per Slice.
+    """
+
+    def __init__(self, kapazitaet):
+        """
+        Args:
+            kapazitaet (np.ndarray): freie Kapazität (Personen × Monate)
+        """
+        kapazitaet = np.asarray(kapazitaet, dtype=np.float64)
+        self.rest = np.ascontiguousarray(kapazitaet.T)  # Monate × Personen
+        self.praefix = np.zeros((self.rest.shape[0] + 1, self.rest.shape[1]), dtype=np.float64)
+        np.cumsum(self.rest, axis=0, out=self.praefix[1:])
+
+    def frei(self, von, bis, personen=None):
+        """Freie Kapazität in den Spalten [von, bis] (inklusive) je Person."""
+        if personen is None:
+            return self.praefix[bis + 1] - self.praefix[von]
+        return self.praefix[bis + 1, personen] - self.praefix[von, personen]
+
+    def monatlich(self, von, bis, personen):
+        """Freie Kapazität je Monat (Monate × ausgewählte Personen)."""
+        return self.rest[von:bis + 1, personen]
+
+    def belege(self, von, personen, anteile):
+        """
+        Zieht Belegungen ab.
+
+        Args:
+            von (int): erste betroffene Spalte
+            personen (np.ndarray): Personenindizes (eindeutig)
+            anteile (np.ndarray): Belegung (Monate ab von × Personen)
+        """
+        bis = von + anteile.shape[0]
+        rest = self.rest[von:bis, personen] - anteile
+        np.maximum(rest, 0, out=rest)
+        self.rest[von:bis, personen] = rest
+        self.praefix[von + 1:, personen] = (
+            self.praefix[von, personen] + np.cumsum(self.rest[von:, personen], axis=0)
+        )
@@ -0,0 +1,83 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, as_completed, wait
+
+from .kompetenzindex import anforderungen_aus_aufgaben
+from .kostenmatrix import personen_arrays, aufgaben_arrays, loese_teilproblem, prozesskontext
+from .metriken import metriken
+
+# -----------------------------
+# Kuhn-Munkres je Projekt (ohne Datenbankzugriff, auch für Tests)
+# -----------------------------
+
+ALGORITHMUS_PRO_PROJEKT = "kuhn-munkres-pro-projekt"
+
+
+def unzulaessige_paare(index, plaetze, aufgaben):
+    """Ungeeignete Paare (Personen × Aufgaben) aus dem Kompetenzindex."""
+    return ~index.eignung(anforderungen_aus_aufgaben(aufgaben), plaetze)
+
+
+def loese_projekte(personen, je_projekt, index, plaetze, worker=None):
+    """
+    Kuhn-Munkres je Projekt, parallel in einem Prozesspool. Die
+    Unzulässigkeitsmasken entstehen im Hauptprozess aus dem Kompetenzindex;
+    höchstens 2 × worker Projekte sind gleichzeitig eingereicht, damit nicht
+    alle Masken auf einmal im Speicher liegen.
+
+    Args:
+        je_projekt (dict): Projekt-ID -> Aufgaben (nicht leer)
+        worker (int): Anzahl Prozesse; None = Anzahl CPUs, 1 = ohne Pool
+
+    Yields:
+        tuple: (Projekt-ID, [(person_id, aufgabe_id, kosten), ...] oder Exception,
+                Dauer in Sekunden) in Reihenfolge der Fertigstellung
+    """
+    _, teilzeit = personen_arrays(personen)
+
+    def teilproblem(aufgaben):
+        with metriken.phase("kostenmatrix", algorithmus=ALGORITHMUS_PRO_PROJEKT):
+            unzulaessig = unzulaessige_paare(index, plaetze, aufgaben)
+            _, aufwand = aufgaben_arrays(aufgaben)
+        metriken.zaehle("unzulaessige_paare", int(unzulaessig.sum()), algorithmus=ALGORITHMUS_PRO_PROJEKT)
+        return teilzeit, aufwand, unzulaessig
+
+    def ergebnis(projekt_id, loesung):
+        aufgaben = je_projekt[projekt_id]
+        personen_index, aufgaben_index, kosten, dauer = loesung
+        zuweisungen = [
+            (personen[p_idx].id, aufgaben[a_idx].id, k)
+            for p_idx, a_idx, k in zip(personen_index.tolist(), aufgaben_index.tolist(), kosten.tolist())
+        ]
+        return projekt_id, zuweisungen, dauer
+
+    if worker == 1 or len(je_projekt) <= 1:
+        for projekt_id, aufgaben in je_projekt.items():
+            try:
+                yield ergebnis(projekt_id, loese_teilproblem(*teilproblem(aufgaben)))
+            except Exception as e:
+                yield projekt_id, e, 0.0
+        return
+
+    grenze = 2 * (worker or os.cpu_count() or 1)
+    offen = {}
+
+    def abgeschlossen(future):
+        projekt_id = offen.pop(future)
+        try:
+            return ergebnis(projekt_id, future.result())
+        except Exception as e:
+            return projekt_id, e, 0.0
+
+    with ProcessPoolExecutor(max_workers=worker, mp_context=prozesskontext()) as pool:
+        for projekt_id, aufgaben in je_projekt.items():
+            try:
+                offen[pool.submit(loese_teilproblem, *teilproblem(aufgaben))] = projekt_id
+            except Exception as e:
+                yield projekt_id, e, 0.0
+                continue
+            if len(offen) >= grenze:
+                fertig, _ = wait(offen, return_when=FIRST_COMPLETED)
+                for future in fertig:
+                    yield abgeschlossen(future)
+        for future in as_completed(list(offen)):
+            yield abgeschlossen(future)
@@ -1,14 +1,73 @@
-from flask import Blueprint, jsonify, request
-from app.models import Person, Aufgabe, Projekt, Zuweisung, db
-from sqlalchemy import text
-from scipy.optimize import linear_sum_assignment
+import os
+import re
+import time
 import numpy as np
-from app.algorithm import berechne_zuweisungen_stundenbasiert
+import click
+from flask import Blueprint, jsonify, request, current_app, g, send_file, stream_with_context
+from app.models import Person, Aufgabe, Projekt, db
+from sqlalchemy import text, or_
+from app.algorithm import (berechne_zuweisungen_stundenbasiert, berechne_zuweisungen_kuhn_munkres,
+                           berechne_zuweisung_pro_projekt, berechne_zuweisung_pro_projekt_inkrementell)
+from app.jobs import jobverwaltung, WarteschlangeVoll, ABGESCHLOSSEN
+from app.ergebniscache import mit_cache, ergebnis_cache
+from app.verfuegbarkeit import verfuegbarkeits_speicher
+from app.kompetenzindex import kompetenz_index
+from app.verfuegbarkeitstabelle import (Verfuegbarkeit, migriere_verfuegbarkeit, verfuegbare_personen_ids,
+                                        stelle_nachgefuehrt_sicher)
+from app.abfragen import abfrage_limit
+from app.metriken import metriken
+from app.snapshot import Snapshot, Snapshotfehler, snapshot_aus_datenbank
+from app.gantt import gantt_zeilen, gantt_bloecke, monatliche_verteilung, GANTT_SPALTEN, GANTT_ABSCHNITT
+from app.effizienz import effizienz_score
+from app.monate import monat_ordinal
+from app.stundenplanung import STUNDEN_PRO_PM
+from app.stundenengines import ENGINES
+from app.laeufe import (aktiviere, aktiver_lauf_id, uebernimm_altbestand,
+                        Zuweisungslauf, LaufZuweisung, AktiverLauf, STATUS_ABGELOEST, STATUS_AKTIV)
+from app.listen import (beobachte_aenderungen, listen_antwort, Listenfehler, parameterliste,
+                       monatsbereich, ueberschneidet)
+from app.massenimport import (importiere, lies_zeilen, person_aus_zeile, projekt_aus_zeile,
+                              aufgabe_aus_zeile, Importfehler, BATCHGROESSE)
 import csv
+import io
+import json
+from itertools import chain, islice
 from flask import Response
 
 bp = Blueprint('routes', __name__)
 
+# Änderungszähler je Tabelle für ETags der Listen-Endpunkte
+beobachte_aenderungen()
+
+# -------------------- Metriken --------------------
+@bp.record_once
+def _konfiguriere_metriken(state):
+    metriken.aktiv = state.app.config.get('METRIKEN_AKTIV', True)
+
+@bp.before_request
+def _starte_messung():
+    if metriken.aktiv:
+        g.anfrage_start = time.perf_counter()
+
+# Tabelle verfuegbarkeit einmal je Prozess nachführen (z. B. nach einem
+# Update ohne Migration), bevor Filter oder Solver sie lesen
+@bp.before_request
+def _verfuegbarkeit_nachfuehren():
+    stelle_nachgefuehrt_sicher()
+
+@bp.after_request
+def _beende_messung(antwort):
+    start = g.pop('anfrage_start', None)
+    if start is not None:
+        metriken.beobachte('http_anfrage_dauer_sekunden', time.perf_counter() - start,
+                           endpunkt=request.endpoint or 'unbekannt', methode=request.method,
+                           status=antwort.status_code)
+    return antwort
+
+@bp.route('/metrics', methods=['GET'])
+def get_metriken():
+    return Response(metriken.als_prometheus(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
 # -------------------- Test der Datenbankverbindung --------------------
 @bp.route('/test_db', methods=['GET'])
 def test_db():
@@ -32,27 +91,43 @@ def add_person():
         )
         db.session.add(new_person)
         db.session.commit()
+        verfuegbarkeits_speicher.aktualisiere(new_person)
         return jsonify({"message": "Person hinzugefügt"}), 201
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
 
 # -------------------- Alle Personen abrufen --------------------
+# Filter: kompetenz=A,B  von/bis (verfügbar in mindestens einem Monat)
+#         min_stunden=N (mindestens N verfügbare Stunden in von/bis)
 @bp.route('/personen', methods=['GET'])
+@abfrage_limit(2)
 def get_personen():
     try:
-        personen = Person.query.all()
-        result = [
-            {
-                "id": p.id,
-                "vorname": p.vorname,
-                "nachname": p.nachname,
-                "kompetenz": p.kompetenz,
-                "teilzeitfaktor": p.teilzeitfaktor,
-                "verfuegbare_monate": p.verfuegbare_monate
-            } for p in personen
-        ]
-        return jsonify(result), 200
+        abfrage = db.session.query(
+            Person.id, Person.vorname, Person.nachname, Person.kompetenz,
+            Person.teilzeitfaktor, Person.verfuegbare_monate
+        )
+        kompetenzen = parameterliste('kompetenz')
+        if kompetenzen:
+            abfrage = abfrage.filter(Person.kompetenz.in_(kompetenzen))
+
+        von, bis = monatsbereich()
+        min_stunden = request.args.get('min_stunden')
+        if min_stunden:
+            try:
+                min_stunden = float(min_stunden)
+            except ValueError:
+                raise Listenfehler("Parameter 'min_stunden' muss eine Zahl sein")
+        else:
+            min_stunden = None
+        if von is not None or bis is not None or min_stunden is not None:
+            abfrage = abfrage.filter(Person.id.in_(verfuegbare_personen_ids(von, bis, min_stunden)))
+
+        return listen_antwort(abfrage, Person.id, lambda z: z._asdict(),
+                              [Person.__table__.name, Verfuegbarkeit.__table__.name])
+    except Listenfehler as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -76,21 +151,27 @@ def add_projekt():
         return jsonify({"error": str(e)}), 500
 
 # -------------------- Alle Projekte abrufen --------------------
+# Filter: kompetenz=A,B  von/bis (Projektlaufzeit überschneidet den Bereich)
 @bp.route('/projekte', methods=['GET'])
+@abfrage_limit(2)
 def get_projekte():
     try:
-        projekte = Projekt.query.all()
-        result = [
-            {
-                "id": p.id,
-                "projektname": p.projektname,
-                "projektstart": p.projektstart,
-                "projektende": p.projektende,
-                "anzahl_aufgaben": p.anzahl_aufgaben,
-                "kompetenz": p.kompetenz
-            } for p in projekte
-        ]
-        return jsonify(result), 200
+        abfrage = db.session.query(
+            Projekt.id, Projekt.projektname, Projekt.projektstart, Projekt.projektende,
+            Projekt.anzahl_aufgaben, Projekt.kompetenz
+        )
+        kompetenzen = parameterliste('kompetenz')
+        if kompetenzen:
+            abfrage = abfrage.filter(Projekt.kompetenz.in_(kompetenzen))
+
+        von, bis = monatsbereich()
+        nachfilter = None
+        if von is not None or bis is not None:
+            nachfilter = lambda p: ueberschneidet(p["projektstart"], p["projektende"], von, bis)
+
+        return listen_antwort(abfrage, Projekt.id, lambda z: z._asdict(), [Projekt.__table__.name], nachfilter)
+    except Listenfehler as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -118,90 +199,230 @@ def add_aufgabe():
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
 
+def _projektfilter(abfrage):
+    """Filter ?projekt=<ID oder Projektname>[,...] auf eine Abfrage mit Projekt-Join."""
+    projekte = parameterliste('projekt')
+    if not projekte:
+        return abfrage
+    ids = [int(p) for p in projekte if p.isdigit()]
+    namen = [p for p in projekte if not p.isdigit()]
+    return abfrage.filter(or_(Projekt.id.in_(ids), Projekt.projektname.in_(namen)))
+
 # -------------------- Alle Aufgaben abrufen --------------------
+# Filter: projekt=ID/Name  kompetenz=A,B (minimale Kompetenz)  von/bis (Zeitraum)
 @bp.route('/aufgaben', methods=['GET'])
+@abfrage_limit(2)
 def get_aufgaben():
     try:
-        aufgaben = Aufgabe.query.all()
-        result = [
-            {
-                "id": a.id,
-                "projekt_id": a.projekt_id,
-                "projekt_name": a.projekt.projektname,
-                "aufgabe": a.aufgabe,
-                "startmonat": a.startmonat,
-                "endmonat": a.endmonat,
-                "minimale_kompetenz": a.minimale_kompetenz,
-                "arbeitsaufwand": a.arbeitsaufwand
-            } for a in aufgaben
-        ]
-        return jsonify(result), 200
+        # Projektname per Join in derselben Abfrage (kein Nachladen je Aufgabe)
+        abfrage = db.session.query(
+            Aufgabe.id, Aufgabe.projekt_id, Projekt.projektname.label("projekt_name"), Aufgabe.aufgabe,
+            Aufgabe.startmonat, Aufgabe.endmonat, Aufgabe.minimale_kompetenz, Aufgabe.arbeitsaufwand
+        ).outerjoin(Projekt, Aufgabe.projekt_id == Projekt.id)
+        abfrage = _projektfilter(abfrage)
+        kompetenzen = parameterliste('kompetenz')
+        if kompetenzen:
+            abfrage = abfrage.filter(Aufgabe.minimale_kompetenz.in_(kompetenzen))
+
+        von, bis = monatsbereich()
+        nachfilter = None
+        if von is not None or bis is not None:
+            nachfilter = lambda a: ueberschneidet(a["startmonat"], a["endmonat"], von, bis)
+
+        tabellen = [Aufgabe.__table__.name, Projekt.__table__.name]
+        return listen_antwort(abfrage, Aufgabe.id, lambda z: z._asdict(), tabellen, nachfilter)
+    except Listenfehler as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 # -------------------- Automatische Zuweisung --------------------
+def _asynchron(optionen):
+    """Als Hintergrund-Job ausführen? (Body, Query-String oder ZUWEISUNG_ASYNCHRON)"""
+    wert = optionen.get('asynchron', request.args.get('asynchron', current_app.config.get('ZUWEISUNG_ASYNCHRON', False)))
+    return str(wert).lower() in ('1', 'true', 'ja')
+
+def _neu_berechnen(optionen):
+    """Ergebniscache umgehen? (neu_berechnen im Body oder Query-String)"""
+    wert = optionen.get('neu_berechnen', request.args.get('neu_berechnen', False))
+    return str(wert).lower() in ('1', 'true', 'ja')
+
+def _berechnung(algorithmus, funktion, optionen, schluessel=None, **parameter):
+    """
+    Berechnung über den Ergebniscache; schluessel enthält die Parameter, die
+    das Ergebnis bestimmen (Standard: alle).
+    """
+    erzwingen = _neu_berechnen(optionen)
+    return lambda: mit_cache(
+        algorithmus, parameter if schluessel is None else schluessel,
+        lambda: funktion(**parameter), erzwingen
+    )
+
+SNAPSHOT_NAME = re.compile(r"[A-Za-z0-9_.-]{1,100}")
+
+def _snapshot_pfad(name):
+    """Pfad eines Snapshots im Verzeichnis SNAPSHOT_VERZEICHNIS (Standard: instance/snapshots)."""
+    if not SNAPSHOT_NAME.fullmatch(name) or name.startswith('.'):
+        raise Snapshotfehler(f"Ungültiger Snapshot-Name: {name!r}")
+    verzeichnis = current_app.config.get('SNAPSHOT_VERZEICHNIS', os.path.join(current_app.instance_path, 'snapshots'))
+    return os.path.join(verzeichnis, f"{name}.pvs")
+
+def _snapshot(optionen):
+    """Optionaler Snapshot als Eingabe der Berechnung (snapshot=<name> im Body oder Query-String)."""
+    name = optionen.get('snapshot', request.args.get('snapshot'))
+    if not name:
+        return None
+    pfad = _snapshot_pfad(str(name))
+    if not os.path.exists(pfad):
+        raise Snapshotfehler(f"Snapshot {name!r} nicht gefunden")
+    return Snapshot.lade(pfad)
+
+def _worker(optionen):
+    """Zahl der Prozesse (worker=<n> im Body oder Query-String); None = Standard."""
+    worker = optionen.get('worker', request.args.get('worker', current_app.config.get('ZUWEISUNG_WORKER')))
+    if worker in (None, ''):
+        return None
+    if isinstance(worker, bool) or not isinstance(worker, (int, str)) or not str(worker).strip().isdigit():
+        raise Listenfehler("Parameter 'worker' muss eine positive ganze Zahl sein")
+    worker = int(worker)
+    if worker < 1:
+        raise Listenfehler("Parameter 'worker' muss eine positive ganze Zahl sein")
+    return worker
+
+def _engine(optionen):
+    """Engine der stundenbasierten Verteilung (engine=<name> im Body oder Query-String)."""
+    engine = optionen.get('engine', request.args.get('engine', current_app.config.get('STUNDENBASIERT_ENGINE', 'numpy')))
+    if engine not in ENGINES:
+        raise Listenfehler(f"Parameter 'engine' muss einer der Werte {', '.join(ENGINES)} sein")
+    return engine
+
+def _modus(optionen):
+    """
+    Der frühere Parameter modus (Blockzerlegung) ist entfallen; es gibt nur
+    noch die Gesamtlösung. Andere Werte werden abgelehnt statt stillschweigend
+    ignoriert.
+    """
+    modus = optionen.get('modus', request.args.get('modus'))
+    if modus not in (None, '', 'gesamt'):
+        raise Listenfehler("Parameter 'modus' wird nicht mehr unterstützt (nur 'gesamt')")
+
+def _als_job(art, aufruf, parameter=None):
+    """Reicht eine Berechnung als Job ein und antwortet sofort mit 202."""
+    try:
+        job = jobverwaltung().einreichen(art, aufruf, parameter=parameter)
+    except WarteschlangeVoll as e:
+        return jsonify({"error": str(e)}), 429
+    antwort = jsonify({"job_id": job.id, "status": job.status})
+    antwort.headers["Location"] = f"/jobs/{job.id}"
+    return antwort, 202
+
 @bp.route('/zuweisungen/automatisch', methods=['POST'])
 def berechne_zuweisungen():
     try:
-        personen = Person.query.all()
-        aufgaben = Aufgabe.query.all()
-
-        if not personen or not aufgaben:
-            return jsonify({"error": "Keine Personen oder Aufgaben in der Datenbank gefunden."}), 400
+        optionen = request.get_json(silent=True) or {}
+        _modus(optionen)
+        snapshot = _snapshot(optionen)
 
-        kostenmatrix = []
-        for person in personen:
-            kostenreihe = []
-            for aufgabe in aufgaben:
-                kompetenz_map = {'A': 1, 'B': 2, 'C': 3}
-                person_kompetenz = kompetenz_map.get(person.kompetenz.upper(), float('inf'))
-                aufgabe_kompetenz = kompetenz_map.get(aufgabe.minimale_kompetenz.upper(), float('inf'))
+        schluessel = {}
+        if snapshot is not None:
+            schluessel["snapshot"] = snapshot.gespeicherter_fingerabdruck
+        aufruf = _berechnung("kuhn-munkres", berechne_zuweisungen_kuhn_munkres, optionen,
+                             schluessel=schluessel, snapshot=snapshot)
+        if _asynchron(optionen):
+            return _als_job("automatisch", aufruf, schluessel)
 
-                if person_kompetenz <= aufgabe_kompetenz:
-                    kosten = aufgabe.arbeitsaufwand / person.teilzeitfaktor
-                else:
-                    kosten = float('inf')
-                kostenreihe.append(kosten)
-            kostenmatrix.append(kostenreihe)
+        antwort = aufruf()
+        if "error" in antwort:
+            return jsonify(antwort), 400
+        return jsonify(antwort), 200
 
-        kostenmatrix = np.array(kostenmatrix)
+    except (Snapshotfehler, Listenfehler) as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
 
-        personen_index, aufgaben_index = linear_sum_assignment(kostenmatrix)
+# -------------------- Zuweisung pro Projekt (inkrementell) --------------------
+@bp.route('/zuweisungen/pro-projekt', methods=['POST'])
+def berechne_zuweisungen_pro_projekt():
+    """
+    Zuweisung je Projekt. Standardmäßig inkrementell: nur Projekte, die von
+    Änderungen seit dem aktiven Lauf betroffen sind, werden neu berechnet.
+    """
+    try:
+        optionen = request.get_json(silent=True) or {}
+        inkrementell = str(optionen.get('inkrementell', request.args.get('inkrementell', 'true'))).lower() in ('1', 'true', 'ja')
+        funktion = berechne_zuweisung_pro_projekt_inkrementell if inkrementell else berechne_zuweisung_pro_projekt
+        worker = _worker(optionen)
 
-        Zuweisung.query.delete()
+        # Inkrementell und vollständig liefern dasselbe Ergebnis, die Zahl der
+        # Prozesse ändert es nicht: gemeinsamer Schlüssel
+        aufruf = _berechnung("pro-projekt", funktion, optionen, schluessel={}, worker=worker)
+        if _asynchron(optionen):
+            return _als_job("pro-projekt", aufruf, {"inkrementell": inkrementell, "worker": worker})
 
-        for p_idx, a_idx in zip(personen_index, aufgaben_index):
-            if kostenmatrix[p_idx][a_idx] < float('inf'):
-                neue_zuweisung = Zuweisung(
-                    person_id=personen[p_idx].id,
-                    aufgabe_id=aufgaben[a_idx].id,
-                    kosten=kostenmatrix[p_idx][a_idx]
-                )
-                db.session.add(neue_zuweisung)
-
-        db.session.commit()
-        return jsonify({"message": "Optimale Zuweisungen erfolgreich berechnet und gespeichert."}), 200
+        antwort = aufruf()
+        if "error" in antwort:
+            return jsonify(antwort), 400
+        return jsonify(antwort), 200
 
+    except Listenfehler as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
 
 # -------------------- Alle Zuweisungen abrufen --------------------
+def zuweisungen_zeilen():
+    """
+    Alle Zuweisungen des aktiven Laufs mit Person, Aufgabe und Projekt in
+    einer einzigen Abfrage als Tupel (ID, Vorname, Nachname, Aufgabe,
+    Projektname, Startmonat, Endmonat, Kosten). Der Zeiger auf den aktiven
+    Lauf wird per Join mitgelesen, ein laufender Lauf ist nie sichtbar.
+    """
+    return db.session.query(
+        LaufZuweisung.id, Person.vorname, Person.nachname, Aufgabe.aufgabe, Projekt.projektname,
+        Aufgabe.startmonat, Aufgabe.endmonat, LaufZuweisung.kosten
+    ).select_from(LaufZuweisung) \
+        .join(AktiverLauf, AktiverLauf.lauf_id == LaufZuweisung.lauf_id) \
+        .join(Person, LaufZuweisung.person_id == Person.id) \
+        .join(Aufgabe, LaufZuweisung.aufgabe_id == Aufgabe.id) \
+        .join(Projekt, Aufgabe.projekt_id == Projekt.id)
+
+# Filter: projekt=ID/Name  person=ID[,...]  von/bis (Aufgabenzeitraum)
 @bp.route('/zuweisungen', methods=['GET'])
+@abfrage_limit(2)
 def get_zuweisungen():
     try:
-        zuweisungen = Zuweisung.query.all()
-        result = [
-            {
-                "person": f"{z.person.vorname} {z.person.nachname}",
-                "aufgabe": z.aufgabe.aufgabe,
-                "projekt": z.aufgabe.projekt.projektname,
-                "startmonat": z.aufgabe.startmonat,
-                "endmonat": z.aufgabe.endmonat,
-                "kosten": z.kosten
-            } for z in zuweisungen
-        ]
-        return jsonify(result), 200
+        abfrage = _projektfilter(zuweisungen_zeilen())
+        personen_ids = parameterliste('person')
+        if personen_ids:
+            if not all(p.isdigit() for p in personen_ids):
+                raise Listenfehler("Parameter 'person' erwartet Personen-IDs")
+            abfrage = abfrage.filter(Person.id.in_([int(p) for p in personen_ids]))
+
+        von, bis = monatsbereich()
+        nachfilter = None
+        if von is not None or bis is not None:
+            nachfilter = lambda z: ueberschneidet(z["startmonat"], z["endmonat"], von, bis)
+
+        def als_dict(zeile):
+            z_id, vorname, nachname, aufgabe, projektname, startmonat, endmonat, kosten = zeile
+            return {
+                "id": z_id,
+                "person": f"{vorname} {nachname}",
+                "aufgabe": aufgabe,
+                "projekt": projektname,
+                "startmonat": startmonat,
+                "endmonat": endmonat,
+                "kosten": kosten
+            }
+
+        tabellen = [LaufZuweisung.__table__.name, AktiverLauf.__table__.name, Person.__table__.name,
+                    Aufgabe.__table__.name, Projekt.__table__.name]
+        return listen_antwort(abfrage, LaufZuweisung.id, als_dict, tabellen, nachfilter)
+    except Listenfehler as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -210,7 +431,8 @@ def get_zuweisungen():
 def update_zuweisung():
     try:
         data = request.get_json()
-        zuweisung = Zuweisung.query.get(data['id'])
+        # Bearbeitet wird immer eine Zuweisung des aktiven Laufs
+        zuweisung = LaufZuweisung.query.filter_by(id=data['id'], lauf_id=aktiver_lauf_id()).first()
         if not zuweisung:
             return jsonify({"error": "Zuweisung nicht gefunden"}), 404
 
@@ -218,36 +440,324 @@ def update_zuweisung():
         zuweisung.aufgabe_id = data.get('aufgabe_id', zuweisung.aufgabe_id)
         zuweisung.kosten = data.get('kosten', zuweisung.kosten)
         db.session.commit()
+        # Der Lauf entspricht nicht mehr dem berechneten Ergebnis
+        ergebnis_cache.verwerfe_lauf(zuweisung.lauf_id)
         return jsonify({"message": "Zuweisung aktualisiert"}), 200
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
 
 
+# -------------------- Zuweisungsläufe --------------------
+@bp.route('/zuweisungen/laeufe', methods=['GET'])
+def get_laeufe():
+    try:
+        laeufe = Zuweisungslauf.query.order_by(Zuweisungslauf.id.desc()).limit(100).all()
+        return jsonify([lauf.als_dict() for lauf in laeufe]), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@bp.route('/zuweisungen/laeufe/<int:lauf_id>/aktivieren', methods=['POST'])
+def aktiviere_lauf(lauf_id):
+    """Schaltet auf einen früheren, noch aufbewahrten Lauf zurück."""
+    try:
+        lauf = db.session.get(Zuweisungslauf, lauf_id)
+        if not lauf or lauf.status not in (STATUS_AKTIV, STATUS_ABGELOEST):
+            return jsonify({"error": "Lauf nicht gefunden oder nicht abgeschlossen"}), 404
+        aktiviere(lauf_id)
+        return jsonify({"message": "Lauf aktiviert", "lauf_id": lauf_id}), 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+@bp.cli.command('zuweisungen-uebernehmen')
+def zuweisungen_uebernehmen():
+    """Übernimmt bestehende Zeilen der Tabelle Zuweisung als ersten Lauf."""
+    lauf_id = uebernimm_altbestand()
+    print(f"Lauf {lauf_id} angelegt." if lauf_id else "Es ist bereits ein Lauf aktiv.")
+
+@bp.cli.command('verfuegbarkeit-migrieren')
+@click.option('--nur-fehlende', is_flag=True, help='Nur Personen ohne Zeilen in der Tabelle verfuegbarkeit übernehmen.')
+def verfuegbarkeit_migrieren(nur_fehlende):
+    """Überträgt Person.verfuegbare_monate in die Tabelle verfuegbarkeit."""
+    ergebnis = migriere_verfuegbarkeit(nur_fehlende=nur_fehlende)
+    print(f"{ergebnis['zeilen']} Verfügbarkeitszeilen für {ergebnis['personen']} Personen geschrieben.")
+
 # -------------------- Zuweisungen stundenbasiert --------------------
 @bp.route('/zuweisungen/stundenbasiert', methods=['POST'])
 def route_zuweisungen_stundenbasiert():
-    result = berechne_zuweisungen_stundenbasiert()
+    optionen = request.get_json(silent=True) or {}
+    try:
+        engine = _engine(optionen)
+        snapshot = _snapshot(optionen)
+    except (Snapshotfehler, Listenfehler) as e:
+        return jsonify({"error": str(e)}), 400
+    schluessel = {"engine": engine}
+    if snapshot is not None:
+        schluessel = {"engine": "fluss" if engine == "fluss" else "numpy",
+                      "snapshot": snapshot.gespeicherter_fingerabdruck}
+    aufruf = _berechnung("stundenbasiert", berechne_zuweisungen_stundenbasiert, optionen,
+                         schluessel=schluessel, engine=engine, snapshot=snapshot)
+    if _asynchron(optionen):
+        return _als_job("stundenbasiert", aufruf, schluessel)
+    result = aufruf()
     return jsonify(result)
 
+# -------------------- Snapshots --------------------
+@bp.route('/snapshots', methods=['POST'])
+def erstelle_snapshot():
+    """Exportiert den aktuellen Datenbankstand als Snapshot-Datei."""
+    try:
+        name = (request.get_json(silent=True) or {}).get('name') or time.strftime('%Y%m%d-%H%M%S')
+        pfad = _snapshot_pfad(str(name))
+        os.makedirs(os.path.dirname(pfad), exist_ok=True)
+        snapshot = snapshot_aus_datenbank()
+        fingerabdruck = snapshot.speichere(pfad)
+        return jsonify({
+            "name": name,
+            "fingerabdruck": fingerabdruck,
+            "personen": snapshot.anzahl_personen,
+            "aufgaben": snapshot.anzahl_aufgaben,
+        }), 201
+    except Snapshotfehler as e:
+        return jsonify({"error": str(e)}), 400
+
+@bp.route('/snapshots/<name>', methods=['GET'])
+def get_snapshot(name):
+    try:
+        pfad = _snapshot_pfad(name)
+    except Snapshotfehler as e:
+        return jsonify({"error": str(e)}), 400
+    if not os.path.exists(pfad):
+        return jsonify({"error": "Snapshot nicht gefunden"}), 404
+    return send_file(pfad, mimetype='application/octet-stream', as_attachment=True, download_name=f"{name}.pvs")
+
+@bp.cli.command('snapshot-exportieren')
+@click.argument('pfad')
+def snapshot_exportieren(pfad):
+    """Schreibt den aktuellen Datenbankstand als Snapshot nach PFAD."""
+    snapshot = snapshot_aus_datenbank()
+    fingerabdruck = snapshot.speichere(pfad)
+    print(f"{snapshot.anzahl_personen} Personen, {snapshot.anzahl_aufgaben} Aufgaben -> {pfad} ({fingerabdruck})")
+
+# -------------------- Ergebniscache --------------------
+@bp.route('/zuweisungen/cache', methods=['GET'])
+def get_ergebnis_cache():
+    return jsonify(ergebnis_cache.statistik()), 200
+
+@bp.route('/zuweisungen/cache', methods=['DELETE'])
+def leere_ergebnis_cache():
+    ergebnis_cache.leere()
+    return jsonify(ergebnis_cache.statistik()), 200
+
+# -------------------- Hintergrund-Jobs --------------------
+@bp.route('/jobs', methods=['GET'])
+def get_jobs():
+    return jsonify([job.als_dict() for job in jobverwaltung().alle()]), 200
+
+@bp.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    job = jobverwaltung().hole(job_id)
+    if job is None:
+        return jsonify({"error": "Job nicht gefunden oder abgelaufen"}), 404
+    return jsonify(job.als_dict()), 200
+
+@bp.route('/jobs/<job_id>', methods=['DELETE'])
+def abbrechen_job(job_id):
+    job = jobverwaltung().abbrechen(job_id)
+    if job is None:
+        return jsonify({"error": "Job nicht gefunden oder abgelaufen"}), 404
+    return jsonify(job.als_dict()), 202 if job.status not in ABGESCHLOSSEN else 200
+
+# -------------------- Massenimport (CSV / NDJSON) --------------------
+def _importformat():
+    """Format aus ?format=csv|ndjson oder dem Content-Type des Requests."""
+    format = request.args.get('format')
+    if format:
+        return format.lower()
+    mimetype = request.mimetype or ''
+    if 'ndjson' in mimetype or 'jsonl' in mimetype:
+        return 'ndjson'
+    return 'csv'
+
+def _massenimport(tabelle, umwandeln, nach_import=None):
+    try:
+        zeilen = lies_zeilen(request.stream, _importformat())
+        bericht = importiere(
+            db.session, tabelle, zeilen, umwandeln,
+            batchgroesse=current_app.config.get('IMPORT_BATCHGROESSE', BATCHGROESSE)
+        )
+        if bericht["importiert"] and nach_import is not None:
+            nach_import()
+        if bericht["fehlerhaft"] == 0:
+            status = 200
+        elif bericht.get("abgebrochen") and not bericht["importiert"]:
+            status = 400
+        else:
+            status = 207
+        return jsonify(bericht), status
+    except Importfehler as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+@bp.route('/personen/import', methods=['POST'])
+def import_personen():
+    def nach_import():
+        # Verfügbarkeitsmatrix und Kompetenzindex einmal komplett neu aufbauen,
+        # neue Personen in die Tabelle verfuegbarkeit übernehmen (Core-Inserts
+        # lösen keine ORM-Events aus)
+        verfuegbarkeits_speicher.invalidiere()
+        kompetenz_index.invalidiere()
+        migriere_verfuegbarkeit(nur_fehlende=True)
+
+    return _massenimport(Person.__table__, person_aus_zeile, nach_import)
+
+@bp.route('/projekte/import', methods=['POST'])
+def import_projekte():
+    return _massenimport(Projekt.__table__, projekt_aus_zeile)
+
+@bp.route('/aufgaben/import', methods=['POST'])
+def import_aufgaben():
+    # Projekte einmal vorab laden: Name oder ID -> ID
+    projekt_ids = {}
+    for projekt_id, projektname in db.session.query(Projekt.id, Projekt.projektname):
+        projekt_ids[str(projekt_id)] = projekt_id
+        projekt_ids[projektname] = projekt_id
+    return _massenimport(Aufgabe.__table__, lambda zeile: aufgabe_aus_zeile(zeile, projekt_ids))
+
 # -------------------- Zuweisungen als CSV ausgeben --------------------
 @bp.route('/zuweisungen/export', methods=['GET'])
 def export_zuweisungen_csv():
-    zuweisungen = Zuweisung.query.all()
+    zuweisungen = zuweisungen_zeilen().order_by(LaufZuweisung.id).all()
 
     def generate():
         header = ['Projekt', 'Aufgabe', 'Startmonat', 'Endmonat', 'Person', 'Kosten (Stunden)']
         yield ','.join(header) + '\n'
-        for z in zuweisungen:
+        for _, vorname, nachname, aufgabe, projektname, startmonat, endmonat, kosten in zuweisungen:
             row = [
-                z.aufgabe.projekt.projektname,
-                z.aufgabe.aufgabe,
-                z.aufgabe.startmonat,
-                z.aufgabe.endmonat,
-                f"{z.person.vorname} {z.person.nachname}",
-                f"{z.kosten:.2f}"
+                projektname,
+                aufgabe,
+                startmonat,
+                endmonat,
+                f"{vorname} {nachname}",
+                f"{kosten:.2f}"
             ]
             yield ','.join(row) + '\n'
 
     return Response(generate(), mimetype='text/csv',
                     headers={"Content-Disposition": "attachment;filename=zuweisungen.csv"})
+
+# -------------------- Gantt-Daten --------------------
+def _csv_zeile(werte):
+    puffer = io.StringIO()
+    csv.writer(puffer, lineterminator='\n').writerow(werte)
+    return puffer.getvalue()
+
+def _gantt_abfrage(lauf):
+    """Zuweisungen eines Laufs mit Person.id, Vorname, Nachname und Aufgabe, in Reihenfolge des Laufs."""
+    return db.session.query(
+        Person.id, Person.vorname, Person.nachname, Aufgabe.aufgabe, Aufgabe.startmonat, Aufgabe.endmonat,
+        Aufgabe.arbeitsaufwand, LaufZuweisung.kosten
+    ).join(Person, LaufZuweisung.person_id == Person.id) \
+        .join(Aufgabe, LaufZuweisung.aufgabe_id == Aufgabe.id) \
+        .filter(LaufZuweisung.lauf_id == lauf.id) \
+        .order_by(LaufZuweisung.id)
+
+def _gantt_arrays(lauf, zeilen):
+    """
+    Stunden, Start- und Endmonat je Zeile als Eingabe der Gantt-Planung.
+    Stundenbasierte Läufe liefern die zugewiesenen Stunden, bei allen anderen
+    Läufen übernimmt die Person den ganzen Arbeitsaufwand der Aufgabe.
+    """
+    start = np.array([monat_ordinal(z.startmonat) for z in zeilen], dtype=np.int64)
+    ende = np.array([monat_ordinal(z.endmonat) for z in zeilen], dtype=np.int64)
+    if lauf.algorithmus == "stundenbasiert":
+        stunden = np.array([z.kosten or 0.0 for z in zeilen], dtype=np.float64)
+    else:
+        stunden = np.array([(z.arbeitsaufwand or 0.0) * STUNDEN_PRO_PM for z in zeilen], dtype=np.float64)
+    return stunden, start, ende
+
+def _gantt_eingaben(lauf):
+    """Alle Zuweisungen eines Laufs samt Stunden, Start- und Endmonat (siehe _gantt_arrays)."""
+    zeilen = _gantt_abfrage(lauf).all()
+    return (zeilen, *_gantt_arrays(lauf, zeilen))
+
+def _gantt_abschnitte(lauf, groesse=GANTT_ABSCHNITT):
+    """
+    Gantt-Zeilen eines Laufs, abschnittsweise berechnet: je groesse
+    Zuweisungen werden gelesen (yield_per), verteilt und ausgegeben, bevor
+    der nächste Abschnitt geladen wird.
+    """
+    zuweisungen = iter(_gantt_abfrage(lauf).yield_per(groesse))
+    while True:
+        zeilen = list(islice(zuweisungen, groesse))
+        if not zeilen:
+            return
+        yield from gantt_zeilen([z.aufgabe for z in zeilen], [f"{z.vorname} {z.nachname}" for z in zeilen],
+                                *_gantt_arrays(lauf, zeilen))
+
+def _lauf_oder_aktiv(lauf_id):
+    lauf_id = lauf_id or aktiver_lauf_id()
+    return db.session.get(Zuweisungslauf, lauf_id) if lauf_id else None
+
+# Parameter: lauf=ID (Standard: aktiver Lauf)  format=csv|json
+@bp.route('/zuweisungen/gantt', methods=['GET'])
+def get_gantt():
+    """Zusammenhängende Arbeitsblöcke je Person und Aufgabe im Format von tests/gantt_daten.csv."""
+    format_ = request.args.get('format', 'json').lower()
+    if format_ not in ('csv', 'json'):
+        return jsonify({"error": "Parameter 'format' erwartet csv oder json"}), 400
+    lauf = _lauf_oder_aktiv(request.args.get('lauf', type=int))
+    if lauf is None:
+        return jsonify({"error": "Lauf nicht gefunden"}), 404
+    # Den ersten Abschnitt vor der Antwort berechnen: ungültige Monatsangaben
+    # darin ergeben noch 422, spätere Abschnitte werden erst beim Streamen gelesen
+    bloecke = _gantt_abschnitte(lauf)
+    try:
+        erster = list(islice(bloecke, 1))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 422
+    bloecke = chain(erster, bloecke)
+
+    if format_ == 'csv':
+        def generate():
+            yield _csv_zeile(GANTT_SPALTEN)
+            for block in bloecke:
+                yield _csv_zeile(block)
+        return Response(stream_with_context(generate()), mimetype='text/csv',
+                        headers={"Content-Disposition": "attachment;filename=gantt_daten.csv"})
+
+    def generate():
+        yield '['
+        for i, block in enumerate(bloecke):
+            yield (',' if i else '') + json.dumps(dict(zip(GANTT_SPALTEN, block)), ensure_ascii=False)
+        yield ']'
+    return Response(stream_with_context(generate()), mimetype='application/json')
+
+# -------------------- Effizienz-Score eines Laufs --------------------
+@bp.route('/zuweisungen/effizienz', methods=['GET'])
+@bp.route('/zuweisungen/laeufe/<int:lauf_id>/effizienz', methods=['GET'])
+def get_effizienz(lauf_id=None):
+    """
+    Effizienz-Score (eingesetzte Personen + Pausenstunden, kleiner ist besser)
+    über die Gantt-Blöcke eines Laufs, mit Aufschlüsselung je Person.
+    Ohne lauf_id wird der aktive Lauf bewertet.
+    """
+    lauf = _lauf_oder_aktiv(lauf_id)
+    if lauf is None:
+        return jsonify({"error": "Lauf nicht gefunden"}), 404
+    try:
+        zeilen, stunden, start, ende = _gantt_eingaben(lauf)
+        stunden_monatlich, erster_monat = monatliche_verteilung(stunden, start, ende)
+        zuweisung, block_start, block_ende, _ = gantt_bloecke(stunden_monatlich, erster_monat)
+        personen_ids = np.array([z.id for z in zeilen], dtype=np.int64)
+        ergebnis = effizienz_score(personen_ids[zuweisung], block_start, block_ende)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 422
+
+    namen = {z.id: f"{z.vorname} {z.nachname}" for z in zeilen}
+    for eintrag in ergebnis["personen"]:
+        eintrag["name"] = namen[eintrag["person"]]
+    return jsonify({"lauf_id": lauf.id, "algorithmus": lauf.algorithmus, **ergebnis}), 200
@@ -0,0 +1,380 @@
+import hashlib
+import json
+import mmap
+import os
+
+import numpy as np
+
+from .kostenmatrix import kompetenz_rang
+from .kompetenzindex import Kompetenzindex, anforderungen_aus_raengen, kompetenz_merkmale
+from .monate import monat_ordinal, Monatsachse
+from .verfuegbarkeit import parse_verfuegbarkeit
+
+# -----------------------------
+# Spaltenorientierter Datenstand (Snapshot) für Löser, Notebooks und API
+# -----------------------------
+
+# Dateiformat: Kennung, Länge des JSON-Kopfs (8 Byte, little endian), Kopf,
+# danach die Arrays als Rohdaten, jeweils auf AUSRICHTUNG Bytes ausgerichtet.
+# Beim Laden werden die Arrays direkt aus der eingeblendeten Datei gelesen
+# (np.frombuffer über mmap), ohne Kopie und von mehreren Prozessen teilbar.
+KENNUNG = b"PVSNAP01"
+AUSRICHTUNG = 64
+
+FREI = "Frei"  # Projektschlüssel 0: keine Projektbelegung
+
+# Spalten des Snapshots: Personen (n), Aufgaben (m), Vokabulare
+SPALTEN = {
+    # Personen
+    "person_id": "IDs (Datenbank: int, CSV: UUID-Text)",
+    "person_name": "Anzeigename",
+    "person_rang": "Kompetenzrang (A=1, ..., 0 = keine Stufe)",
+    "teilzeitfaktor": "Teilzeitfaktor bzw. Zeitbudget",
+    "kompetenz_zeiger": "CSR-Zeiger (n + 1) in kompetenz_index",
+    "kompetenz_index": "Fachkompetenzen je Person als Indizes in kompetenzen",
+    "verfuegbarkeit": "Verfügbarkeit in PM (n × Monate ab erster_monat)",
+    "belegung": "Projektbelegung als Index in projekte (n × Monate, 0 = frei)",
+    # Aufgaben
+    "aufgabe_id": "IDs",
+    "aufgabe_name": "Bezeichnung",
+    "aufgabe_projekt": "Projekt als Index in projekte",
+    "aufgabe_rang": "minimaler Kompetenzrang",
+    "aufgabe_kompetenz": "erste geforderte Fachkompetenz als Index in kompetenzen (-1 = keine)",
+    "aufgabe_kompetenz_zeiger": "CSR-Zeiger (m + 1) in aufgabe_kompetenz_index",
+    "aufgabe_kompetenz_index": "alle geforderten Fachkompetenzen je Aufgabe als Indizes in kompetenzen",
+    "aufwand": "Arbeitsaufwand in PM",
+    "start": "erster Monat (Ordinalzahl)",
+    "ende": "letzter Monat (Ordinalzahl, inklusive)",
+    # Vokabulare
+    "kompetenzen": "Namen der Fachkompetenzen",
+    "projekte": "Projektschlüssel (Index 0 = frei)",
+    "projekt_namen": "Anzeigenamen der Projekte",
+}
+
+
+class Snapshotfehler(ValueError):
+    """Die Datei ist kein gültiger Snapshot."""
+
+
+class Snapshot:
+    """
+    Spaltenorientierter Stand von Personen, Aufgaben, Kompetenzen und
+    Verfügbarkeit als NumPy-Arrays (siehe SPALTEN). Die Arrays sind über
+    Attribute erreichbar, z. B. snapshot.person_rang.
+
+    Erzeugung aus der Datenbank (aus_zeilen) oder aus den CSV-Layouts
+    (aus_dataframes), Austausch über speichere() / lade().
+    """
+
+    def __init__(self, arrays, erster_monat):
+        if "aufgabe_kompetenz_zeiger" not in arrays and "aufgabe_kompetenz" in arrays:
+            # Ältere Dateien kennen nur eine Fachkompetenz je Aufgabe
+            einzeln = np.asarray(arrays["aufgabe_kompetenz"])
+            zeiger, index = _csr([[k] if k >= 0 else [] for k in einzeln.tolist()])
+            arrays = {**arrays, "aufgabe_kompetenz_zeiger": zeiger, "aufgabe_kompetenz_index": index}
+        fehlend = set(SPALTEN) - set(arrays)
+        if fehlend:
+            raise Snapshotfehler(f"Fehlende Spalten: {', '.join(sorted(fehlend))}")
+        self.arrays = arrays
+        self.erster_monat = int(erster_monat)
+        self.gespeicherter_fingerabdruck = None
+
+    def __getattr__(self, name):
+        arrays = self.__dict__.get("arrays")
+        if arrays is not None and name in arrays:
+            return arrays[name]
+        raise AttributeError(name)
+
+    @property
+    def anzahl_personen(self):
+        return len(self.arrays["person_id"])
+
+    @property
+    def anzahl_aufgaben(self):
+        return len(self.arrays["aufgabe_id"])
+
+    @property
+    def achse(self):
+        """Monatsachse der Spalten von verfuegbarkeit und belegung."""
+        return Monatsachse(self.erster_monat, self.erster_monat + self.arrays["verfuegbarkeit"].shape[1] - 1)
+
+    def kompetenzen_der_person(self, i):
+        zeiger = self.arrays["kompetenz_zeiger"]
+        return self.arrays["kompetenz_index"][zeiger[i]:zeiger[i + 1]]
+
+    def kompetenz_matrix(self):
+        """Fachkompetenzen als boolesche Matrix (Personen × kompetenzen)."""
+        matrix = np.zeros((self.anzahl_personen, len(self.arrays["kompetenzen"])), dtype=bool)
+        zeilen = np.repeat(np.arange(self.anzahl_personen), np.diff(self.arrays["kompetenz_zeiger"]))
+        matrix[zeilen, self.arrays["kompetenz_index"]] = True
+        return matrix
+
+    def kompetenzindex(self):
+        """Kompetenzindex über Kompetenzstufen und Fachkompetenzen (Plätze = Zeilen)."""
+        return Kompetenzindex.aus_csr(self.arrays["kompetenz_zeiger"], self.arrays["kompetenz_index"],
+                                      self.arrays["kompetenzen"], self.arrays["person_rang"])
+
+    def anforderungen(self, offen_ohne_anforderung=False):
+        """
+        Anforderungen (min_rang, Fachkompetenzen) je Aufgabe aus Stufe und
+        geforderten Fachkompetenzen, wie anforderungen_aus_aufgaben für
+        Datenbankzeilen.
+        """
+        namen = [str(n) for n in self.arrays["kompetenzen"]]
+        zeiger = self.arrays["aufgabe_kompetenz_zeiger"]
+        index = self.arrays["aufgabe_kompetenz_index"].tolist()
+        listen = [tuple(namen[k] for k in index[zeiger[j]:zeiger[j + 1]]) for j in range(self.anzahl_aufgaben)]
+        return anforderungen_aus_raengen(self.arrays["aufgabe_rang"], listen, offen_ohne_anforderung)
+
+    def fingerabdruck(self):
+        """Inhaltlicher Hash über alle Arrays (unabhängig vom Speicherort)."""
+        h = hashlib.blake2b(digest_size=16)
+        h.update(str(self.erster_monat).encode())
+        for name in sorted(self.arrays):
+            a = np.ascontiguousarray(self.arrays[name])
+            h.update(f"{name}:{a.dtype.str}:{a.shape}".encode())
+            h.update(a.view(np.uint8) if a.size else b"")
+        return h.hexdigest()
+
+    # ---------- Datei ----------
+
+    def speichere(self, pfad):
+        """
+        Schreibt den Snapshot als eine Datei (atomar über eine temporäre Datei).
+
+        Returns:
+            str: Fingerabdruck des Inhalts
+        """
+        arrays = {name: np.ascontiguousarray(a) for name, a in self.arrays.items()}
+        for name, a in arrays.items():
+            if a.dtype.hasobject:
+                raise Snapshotfehler(f"Spalte {name} hat den Typ object")
+
+        fingerabdruck = self.fingerabdruck()
+        eintraege, offset = {}, 0
+        for name, a in arrays.items():
+            eintraege[name] = {"dtype": a.dtype.str, "shape": list(a.shape), "offset": offset}
+            offset = _ausgerichtet(offset + a.nbytes)
+        kopf = json.dumps({
+            "erster_monat": self.erster_monat,
+            "fingerabdruck": fingerabdruck,
+            "arrays": eintraege,
+        }).encode("utf-8")
+        daten_start = _ausgerichtet(len(KENNUNG) + 8 + len(kopf))
+
+        temp = f"{pfad}.tmp"
+        with open(temp, "wb") as f:
+            f.write(KENNUNG)
+            f.write(len(kopf).to_bytes(8, "little"))
+            f.write(kopf)
+            for name, a in arrays.items():
+                f.seek(daten_start + eintraege[name]["offset"])
+                f.write(a.tobytes())
+            f.truncate(daten_start + offset)
+        os.replace(temp, pfad)
+        return fingerabdruck
+
+    @classmethod
+    def lade(cls, pfad):
+        """
+        Blendet einen Snapshot schreibgeschützt ein. Die Arrays verweisen
+        direkt auf die Datei; das Betriebssystem teilt die Seiten zwischen
+        allen Prozessen, die dieselbe Datei laden.
+        """
+        with open(pfad, "rb") as f:
+            if f.read(len(KENNUNG)) != KENNUNG:
+                raise Snapshotfehler(f"{pfad} ist kein Snapshot")
+            laenge = int.from_bytes(f.read(8), "little")
+            kopf = json.loads(f.read(laenge))
+            daten_start = _ausgerichtet(len(KENNUNG) + 8 + laenge)
+            puffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        arrays = {}
+        for name, eintrag in kopf["arrays"].items():
+            dtype = np.dtype(eintrag["dtype"])
+            form = tuple(eintrag["shape"])
+            anzahl = int(np.prod(form, dtype=np.int64))
+            if anzahl == 0:
+                arrays[name] = np.zeros(form, dtype=dtype)
+                continue
+            arrays[name] = np.frombuffer(puffer, dtype=dtype, count=anzahl,
+                                         offset=daten_start + eintrag["offset"]).reshape(form)
+        snapshot = cls(arrays, kopf["erster_monat"])
+        snapshot.gespeicherter_fingerabdruck = kopf.get("fingerabdruck")
+        return snapshot
+
+    # ---------- Erzeugung ----------
+
+    @classmethod
+    def aus_zeilen(cls, personen, aufgaben, projekte=()):
+        """
+        Snapshot aus Datenbankzeilen (Person, Aufgabe, Projekt). Kompetenz
+        bzw. minimale_kompetenz ist eine Stufe oder eine Liste von
+        Fachkompetenzen (siehe kompetenz_merkmale).
+        """
+        verfuegbarkeiten = [parse_verfuegbarkeit(p.verfuegbare_monate) for p in personen]
+        verf_ordinale = {monat_ordinal(m) for v in verfuegbarkeiten for m in v}
+        start = np.array([monat_ordinal(a.startmonat) for a in aufgaben], dtype=np.int64)
+        ende = np.array([monat_ordinal(a.endmonat) for a in aufgaben], dtype=np.int64)
+        achse = Monatsachse.umfassend(np.concatenate([np.fromiter(verf_ordinale, dtype=np.int64), start, ende]))
+
+        matrix = np.zeros((len(personen), len(achse)), dtype=np.float64)
+        for i, verf in enumerate(verfuegbarkeiten):
+            for monat, wert in verf.items():
+                matrix[i, monat_ordinal(monat) - achse.start] = wert
+
+        person_merkmale = [kompetenz_merkmale(p.kompetenz) for p in personen]
+        aufgabe_merkmale = [kompetenz_merkmale(a.minimale_kompetenz) for a in aufgaben]
+        kompetenzen = {}
+        person_zeiger, person_index = _csr(
+            [[kompetenzen.setdefault(k, len(kompetenzen)) for k in liste] for _, liste in person_merkmale]
+        )
+        aufgabe_listen = [[kompetenzen.setdefault(k, len(kompetenzen)) for k in liste] for _, liste in aufgabe_merkmale]
+        aufgabe_zeiger, aufgabe_index = _csr(aufgabe_listen)
+
+        projekt_namen = {p.id: p.projektname for p in projekte}
+        projekt_ids = sorted({a.projekt_id for a in aufgaben} | set(projekt_namen))
+        projekt_index = {pid: i + 1 for i, pid in enumerate(projekt_ids)}
+
+        return cls({
+            "person_id": np.array([p.id for p in personen], dtype=np.int64),
+            "person_name": _text([f"{p.vorname} {p.nachname}" for p in personen]),
+            "person_rang": np.array([rang for rang, _ in person_merkmale], dtype=np.int16),
+            "teilzeitfaktor": np.array([p.teilzeitfaktor for p in personen], dtype=np.float64),
+            "kompetenz_zeiger": person_zeiger,
+            "kompetenz_index": person_index,
+            "verfuegbarkeit": matrix,
+            "belegung": np.zeros(matrix.shape, dtype=np.int32),
+            "aufgabe_id": np.array([a.id for a in aufgaben], dtype=np.int64),
+            "aufgabe_name": _text([a.aufgabe for a in aufgaben]),
+            "aufgabe_projekt": np.array([projekt_index[a.projekt_id] for a in aufgaben], dtype=np.int32),
+            "aufgabe_rang": np.array([rang for rang, _ in aufgabe_merkmale], dtype=np.int16),
+            "aufgabe_kompetenz": np.array([liste[0] if liste else -1 for liste in aufgabe_listen], dtype=np.int32),
+            "aufgabe_kompetenz_zeiger": aufgabe_zeiger,
+            "aufgabe_kompetenz_index": aufgabe_index,
+            "aufwand": np.array([a.arbeitsaufwand for a in aufgaben], dtype=np.float64),
+            "start": start,
+            "ende": ende,
+            "kompetenzen": _text(list(kompetenzen)),
+            "projekte": _text([FREI] + [str(pid) for pid in projekt_ids]),
+            "projekt_namen": _text([FREI] + [projekt_namen.get(pid, str(pid)) for pid in projekt_ids]),
+        }, achse.start)
+
+    @classmethod
+    def aus_dataframes(cls, personen_df, teilaufgaben_df):
+        """
+        Snapshot aus den CSV-Layouts von data/personen.csv und
+        data/teilaufgaben.csv (optional mit den Stufenspalten "kompetenz"
+        bzw. "minimale_kompetenz", wie sie data/generator.py erzeugt).
+        """
+        verf_spalten = {monat_ordinal(c.split("_", 1)[1]): c
+                        for c in personen_df.columns if c.startswith("verfuegbarkeit_")}
+        bel_spalten = {monat_ordinal(c.split("_", 1)[1]): c
+                       for c in personen_df.columns if c.startswith("projektbelegung_")}
+        start = np.array([monat_ordinal(m) for m in teilaufgaben_df["start"]], dtype=np.int64)
+        ende = np.array([monat_ordinal(m) for m in teilaufgaben_df["ende"]], dtype=np.int64)
+        achse = Monatsachse.umfassend(np.concatenate([
+            np.fromiter(verf_spalten, dtype=np.int64), np.fromiter(bel_spalten, dtype=np.int64), start, ende
+        ]))
+        n = len(personen_df)
+
+        matrix = np.zeros((n, len(achse)), dtype=np.float64)
+        for ordinal, spalte in verf_spalten.items():
+            matrix[:, ordinal - achse.start] = personen_df[spalte].fillna(0).to_numpy(dtype=np.float64)
+
+        # Projekte: Belegungscodes und Projekte der Aufgaben in einem Vokabular
+        projekte = {FREI: 0}
+        belegung = np.zeros((n, len(achse)), dtype=np.int32)
+        for ordinal, spalte in bel_spalten.items():
+            codes, werte = np.unique(personen_df[spalte].fillna(FREI).astype(str).to_numpy(), return_inverse=True)
+            nummern = np.array([projekte.setdefault(c, len(projekte)) for c in codes], dtype=np.int32)
+            belegung[:, ordinal - achse.start] = nummern[werte]
+        aufgabe_projekt = np.array(
+            [projekte.setdefault(str(p), len(projekte)) for p in teilaufgaben_df["projekt_id"]], dtype=np.int32
+        )
+
+        # Fachkompetenzen als CSR (einmal aufteilen statt je Zugriff str.split)
+        listen = personen_df["kompetenzen"].fillna("").astype(str).str.split(r",\s*")
+        kompetenzen = {}
+        laengen = np.zeros(n, dtype=np.int64)
+        index = []
+        for i, liste in enumerate(listen):
+            eigene = [kompetenzen.setdefault(k, len(kompetenzen)) for k in dict.fromkeys(liste) if k]
+            laengen[i] = len(eigene)
+            index.extend(eigene)
+        # Geforderte Kompetenzen, die niemand besitzt, kommen ebenfalls ins
+        # Vokabular: die Aufgabe bleibt so für alle ungeeignet statt offen
+        aufgabe_kompetenz = np.array(
+            [kompetenzen.setdefault(k, len(kompetenzen)) if k else -1
+             for k in teilaufgaben_df["kompetenz"].fillna("").astype(str).str.strip()], dtype=np.int32
+        )
+        aufgabe_zeiger, aufgabe_index = _csr([[k] if k >= 0 else [] for k in aufgabe_kompetenz.tolist()])
+
+        def raenge(df, spalte):
+            if spalte not in df:
+                return np.zeros(len(df), dtype=np.int16)
+            return np.array([kompetenz_rang(k if isinstance(k, str) else None) for k in df[spalte]], dtype=np.int16)
+
+        return cls({
+            "person_id": _spalte(personen_df["id"]),
+            "person_name": _text(personen_df["name"].astype(str)),
+            "person_rang": raenge(personen_df, "kompetenz"),
+            "teilzeitfaktor": personen_df["zeitbudget"].to_numpy(dtype=np.float64),
+            "kompetenz_zeiger": np.concatenate([[0], np.cumsum(laengen)]),
+            "kompetenz_index": np.array(index, dtype=np.int32),
+            "verfuegbarkeit": matrix,
+            "belegung": belegung,
+            "aufgabe_id": _spalte(teilaufgaben_df["teilaufgabe_id"]),
+            "aufgabe_name": _text(teilaufgaben_df["bezeichnung"].astype(str)),
+            "aufgabe_projekt": aufgabe_projekt,
+            "aufgabe_rang": raenge(teilaufgaben_df, "minimale_kompetenz"),
+            "aufgabe_kompetenz": aufgabe_kompetenz,
+            "aufgabe_kompetenz_zeiger": aufgabe_zeiger,
+            "aufgabe_kompetenz_index": aufgabe_index,
+            "aufwand": teilaufgaben_df["aufwand"].to_numpy(dtype=np.float64),
+            "start": start,
+            "ende": ende,
+            "kompetenzen": _text(list(kompetenzen)),
+            "projekte": _text(list(projekte)),
+            "projekt_namen": _text(list(projekte)),
+        }, achse.start)
+
+
+def snapshot_aus_datenbank():
+    """Aktueller Datenbankstand als Snapshot (Personen und Aufgaben nach ID sortiert)."""
+    from .models import Person, Aufgabe, Projekt
+
+    return Snapshot.aus_zeilen(
+        Person.query.order_by(Person.id).all(),
+        Aufgabe.query.order_by(Aufgabe.id).all(),
+        Projekt.query.all(),
+    )
+
+
+def lade_snapshot(quelle):
+    """Snapshot-Objekt oder Dateipfad -> Snapshot."""
+    return quelle if isinstance(quelle, Snapshot) else Snapshot.lade(quelle)
+
+
+def _ausgerichtet(n):
+    return -(-n // AUSRICHTUNG) * AUSRICHTUNG
+
+
+def _csr(listen):
+    """Listen von Indizes -> (Zeiger, Index) im CSR-Layout."""
+    laengen = np.fromiter((len(l) for l in listen), dtype=np.int64, count=len(listen))
+    index = np.fromiter((k for l in listen for k in l), dtype=np.int32, count=int(laengen.sum()))
+    return np.concatenate([[0], np.cumsum(laengen)]).astype(np.int64), index
+
+
+def _text(werte):
+    """Texte als Unicode-Array fester Breite (einblendbar, anders als object)."""
+    werte = list(werte)
+    return np.array(werte, dtype=str) if werte else np.zeros(0, dtype="<U1")
+
+
+def _spalte(serie):
+    """ID-Spalte: ganze Zahlen bleiben int64, alles andere wird Text."""
+    if serie.dtype.kind in "iu":
+        return serie.to_numpy(dtype=np.int64)
+    return _text(serie.astype(str))
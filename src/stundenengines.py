@@ -0,0 +1,164 @@
+import numpy as np
+
+from .kompetenzindex import anforderungen_aus_aufgaben
+from .kostenmatrix import personen_arrays, aufgaben_arrays
+from .monate import monat_ordinal, monat_label, Monatsachse
+from .stundenplanung import (stunden_kapazitaet, verteile_stunden, sortierschluessel, RESTSTUNDEN_TOLERANZ,
+                             STUNDEN_PRO_PM)
+from .flussplanung import verteile_stunden_fluss
+
+# -----------------------------
+# Engines der stundenbasierten Verteilung über Person- und Aufgabe-Zeilen
+# (ohne Datenbankzugriff, auch für Tests)
+# -----------------------------
+
+ENGINES = ("python", "numpy", "fluss")
+
+
+def verteile_python(personen, aufgaben, verfuegbarkeit, zeilen, index, plaetze, fortschritt=None):
+    """
+    Ursprüngliche Heuristik: Schleife über alle Personen je Aufgabe.
+
+    Args:
+        verfuegbarkeit: VerfuegbarkeitsMatrix mit den Zeilen der Personen
+        zeilen (list): Zeile in verfuegbarkeit.matrix je Person
+        index, plaetze: Kompetenzindex und Plätze der Personen darin
+        fortschritt: optional Funktion(Anteil), alle 100 Aufgaben aufgerufen
+
+    Returns:
+        list: [(Person, Aufgabe, zugewiesene Stunden), ...]
+    """
+    belegungen = {}  # Speichert pro Person und Monat die bereits belegten Stunden
+    zuweisungen = []
+    anforderungen = anforderungen_aus_aufgaben(aufgaben, offen_ohne_anforderung=True)
+    geeignet_je_anforderung = {}
+
+    for nr, ta in enumerate(aufgaben):
+        if fortschritt is not None and nr % 100 == 0:
+            fortschritt(nr / len(aufgaben))
+
+        # Zeitraum und Aufwand der Aufgabe vorbereiten
+        ta_start = monat_ordinal(ta.startmonat)
+        ta_ende = monat_ordinal(ta.endmonat)
+        aufwand_stunden = int(ta.arbeitsaufwand * STUNDEN_PRO_PM)  # Aufwand in Stunden
+        reststunden = aufwand_stunden
+        kandidaten = []
+
+        # Nur über Personen iterieren, die laut Kompetenzindex geeignet sind
+        anforderung = anforderungen[nr]
+        if anforderung not in geeignet_je_anforderung:
+            geeignet_je_anforderung[anforderung] = index.kandidaten(*anforderung, plaetze=plaetze).tolist()
+        for i in geeignet_je_anforderung[anforderung]:
+            p, zeile = personen[i], zeilen[i]
+            verf_zeile = verfuegbarkeit.matrix[zeile]
+            pid = p.id
+
+            verf_stunden = 0
+            monatlich = {}
+
+            # Verfügbarkeit je Monat berechnen
+            for m in range(ta_start, ta_ende + 1):
+                monat = monat_label(m)
+                spalte = verfuegbarkeit.spalten.get(monat)
+                pm = float(verf_zeile[spalte]) if spalte is not None else 0  # PM aus Verfügbarkeit
+                ist_stunden = pm * STUNDEN_PRO_PM / p.teilzeitfaktor  # Umrechnen auf reale Stunden
+                belegt = belegungen.get(pid, {}).get(monat, 0)
+                frei = max(0, ist_stunden - belegt)
+                monatlich[monat] = frei
+                verf_stunden += frei
+
+            # Nur Personen mit verfügbarer Zeit in die Kandidatenliste aufnehmen
+            if verf_stunden > RESTSTUNDEN_TOLERANZ:
+                kandidaten.append((p, verf_stunden, monatlich))
+
+        # Kandidaten sortieren: wer hat am meisten Zeit, kommt zuerst
+        kandidaten.sort(key=lambda x: sortierschluessel(x[1]), reverse=True)
+
+        # Versuche, Aufgabe auf einen Kandidaten zu verteilen
+        for person, verf_stunden, rest_by_month in kandidaten:
+            if reststunden <= RESTSTUNDEN_TOLERANZ:
+                break  # Aufgabe ist vollständig zugewiesen
+
+            pid = person.id
+            belegungen.setdefault(pid, {})
+            zugewiesen = 0
+
+            # Über Monate iterieren und Stunden zuteilen
+            for monat, rest in rest_by_month.items():
+                if rest <= 0 or reststunden <= RESTSTUNDEN_TOLERANZ:
+                    continue
+                anteil = min(reststunden, rest)
+                belegungen[pid][monat] = belegungen[pid].get(monat, 0) + anteil
+                zugewiesen += anteil
+                reststunden -= anteil
+                if reststunden <= RESTSTUNDEN_TOLERANZ:
+                    break  # Aufgabe ist fertig verplant
+
+            # Merke die Zuweisung, wenn überhaupt Stunden zugewiesen wurden
+            if zugewiesen > 0:
+                zuweisungen.append((person, ta, zugewiesen))
+
+    return zuweisungen
+
+
+def stunden_eingaben(personen, aufgaben, verfuegbarkeit, zeilen):
+    """
+    Argumente für verteile_stunden bzw. verteile_stunden_fluss: Restkapazität
+    in Stunden auf einer gemeinsamen Monatsachse über alle Verfügbarkeiten
+    und Aufgabenzeiträume.
+
+    Returns:
+        tuple: (Personenränge, Ist-Stunden, Aufgabenränge, Fenster von, Fenster bis, Aufwand in Stunden)
+    """
+    p_rang, teilzeit = personen_arrays(personen)
+    a_rang, _ = aufgaben_arrays(aufgaben)
+
+    # Gemeinsame Monatsachse über alle Verfügbarkeiten und Aufgabenzeiträume
+    verf_ordinale = np.array([monat_ordinal(m) for m in verfuegbarkeit.monate], dtype=np.int64)
+    start_ordinale = np.array([monat_ordinal(ta.startmonat) for ta in aufgaben], dtype=np.int64)
+    ende_ordinale = np.array([monat_ordinal(ta.endmonat) for ta in aufgaben], dtype=np.int64)
+    achse = Monatsachse.umfassend(np.concatenate([verf_ordinale, start_ordinale, ende_ordinale]))
+
+    # Verfügbarkeit in PM auf der Achse
+    pm_matrix = np.zeros((len(personen), len(achse)), dtype=np.float32)
+    pm_matrix[:, achse.spalte(verf_ordinale)] = verfuegbarkeit.matrix[zeilen]
+
+    fenster_von = achse.spalte(start_ordinale)
+    fenster_bis = achse.spalte(ende_ordinale)
+    aufwand_stunden = np.array([int(ta.arbeitsaufwand * STUNDEN_PRO_PM) for ta in aufgaben])
+    return p_rang, stunden_kapazitaet(pm_matrix, teilzeit), a_rang, fenster_von, fenster_bis, aufwand_stunden
+
+
+def verteile_numpy(personen, aufgaben, verfuegbarkeit, zeilen, index, plaetze, fortschritt=None):
+    """
+    NumPy-Engine: Restkapazität als Präfixsummen über eine gemeinsame
+    Monatsachse, Kandidatenfilter, Summen und Sortierung vektorisiert.
+    Liefert dieselbe Verteilung wie verteile_python (siehe
+    tests/test_stundenengines.py).
+
+    Returns:
+        list: [(Person, Aufgabe, zugewiesene Stunden), ...]
+    """
+    ergebnisse = verteile_stunden(*stunden_eingaben(personen, aufgaben, verfuegbarkeit, zeilen),
+                                  kompetenzindex=index,
+                                  anforderungen=anforderungen_aus_aufgaben(aufgaben, offen_ohne_anforderung=True),
+                                  plaetze=plaetze, fortschritt=fortschritt)
+    return [(personen[p_idx], aufgaben[a_idx], stunden) for a_idx, p_idx, stunden in ergebnisse]
+
+
+def verteile_fluss(personen, aufgaben, verfuegbarkeit, zeilen, index, plaetze, fortschritt=None):
+    """
+    Fluss-Engine: ein LP über alle Aufgaben und Personen × Monate.
+
+    Returns:
+        tuple: ([(Person, Aufgabe, zugewiesene Stunden), ...], Bedarfsdeckung)
+    """
+    _, teilzeit = personen_arrays(personen)
+    ergebnisse, abdeckung = verteile_stunden_fluss(
+        *stunden_eingaben(personen, aufgaben, verfuegbarkeit, zeilen), teilzeit,
+        kompetenzindex=index,
+        anforderungen=anforderungen_aus_aufgaben(aufgaben, offen_ohne_anforderung=True),
+        plaetze=plaetze,
+        fortschritt=fortschritt,
+    )
+    return [(personen[p_idx], aufgaben[a_idx], stunden) for a_idx, p_idx, stunden in ergebnisse], abdeckung
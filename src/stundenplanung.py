@@ -0,0 +1,178 @@
+import numpy as np
+
+from .monate import Kapazitaetspraefix
+from .kompetenzindex import Kompetenzindex, anforderungen_aus_raengen
+
+# -----------------------------
+# Stundenbasierte Verteilung als NumPy-Engine
+# -----------------------------
+
+STUNDEN_PRO_PM = 160
+
+# Toleranz, ab der eine Aufgabe als vollständig verplant bzw. ein Monat als
+# ausgebucht gilt (in Stunden)
+RESTSTUNDEN_TOLERANZ = 1e-9
+
+# Auflösung der Sortierung nach freien Stunden (1e-6 h)
+SORTIER_AUFLOESUNG = 1e6
+
+
+def stunden_kapazitaet(pm_matrix, teilzeitfaktoren):
+    """
+    Rechnet Verfügbarkeiten in Personenmonaten (Personen × Monate) in reale
+    Stunden um: PM * 160 / Teilzeitfaktor.
+    """
+    pm = np.asarray(pm_matrix, dtype=np.float64)
+    return pm * STUNDEN_PRO_PM / np.asarray(teilzeitfaktoren, dtype=np.float64)[:, None]
+
+
+def sortierschluessel(verf_stunden):
+    """
+    Sortierschlüssel für Kandidaten: freie Stunden auf 1e-6 h abgerundet, damit
+    Rundungsunterschiede zwischen den Engines die Reihenfolge nicht ändern.
+    """
+    return np.floor(np.asarray(verf_stunden) * SORTIER_AUFLOESUNG)
+
+
+def verteile_stunden(personen_raenge, ist_stunden, aufgaben_raenge, fenster_von, fenster_bis, aufwand_stunden,
+                     kompetenzindex=None, anforderungen=None, plaetze=None, fortschritt=None):
+    """
+    Verteilt den Aufwand aller Aufgaben der Reihe nach auf geeignete Personen.
+
+    Entspricht der heuristischen Verteilung in berechne_zuweisungen_stundenbasiert:
+    Kandidaten mit ausreichender Kompetenz und freier Zeit im Aufgabenzeitraum
+    werden absteigend nach freien Stunden sortiert und Monat für Monat belegt.
+    Die freien Stunden je Zeitraum kommen aus Präfixsummen (Kapazitaetspraefix),
+    sodass keine Schleife über die Monate nötig ist. Geeignete Personen liefert
+    der Kompetenzindex, freie Stunden werden nur für sie berechnet.
+
+    Args:
+        personen_raenge (np.ndarray): Kompetenzränge der Personen
+        ist_stunden (np.ndarray): verfügbare Stunden (Personen × Monate der Achse)
+        aufgaben_raenge (np.ndarray): minimale Kompetenzränge der Aufgaben
+        fenster_von (np.ndarray): erste Monatsspalte je Aufgabe
+        fenster_bis (np.ndarray): letzte Monatsspalte je Aufgabe (inklusive)
+        aufwand_stunden (np.ndarray): Aufwand je Aufgabe in Stunden
+        kompetenzindex (Kompetenzindex): optional; sonst aus personen_raenge gebaut
+        anforderungen (list): (min_rang, Fachkompetenzen) je Aufgabe; sonst aus aufgaben_raenge
+        plaetze (np.ndarray): Plätze der Personen im Kompetenzindex, falls dessen
+                              Reihenfolge abweicht
+        fortschritt: optional Funktion(Anteil), alle 100 Aufgaben aufgerufen
+                     (Abbruchpunkt für Jobs)
+
+    Returns:
+        list: [(Aufgabenindex, Personenindex, zugewiesene Stunden), ...]
+    """
+    kapazitaet = Kapazitaetspraefix(ist_stunden)
+    anzahl_monate, anzahl_personen = kapazitaet.rest.shape
+    if kompetenzindex is None:
+        kompetenzindex = Kompetenzindex.aus_merkmalen(personen_raenge)
+    if anforderungen is None:
+        anforderungen = anforderungen_aus_raengen(aufgaben_raenge, offen_ohne_anforderung=True)
+    geeignet_je_anforderung = {}
+    ergebnisse = []
+
+    for a_idx in range(len(aufgaben_raenge)):
+        if fortschritt is not None and a_idx % 100 == 0:
+            fortschritt(a_idx / len(aufgaben_raenge))
+        von = max(0, int(fenster_von[a_idx]))
+        bis = min(anzahl_monate - 1, int(fenster_bis[a_idx]))
+        if bis < von:
+            continue
+
+        # Geeignete Personen je Anforderung nur einmal aus dem Index holen
+        anforderung = anforderungen[a_idx]
+        geeignet = geeignet_je_anforderung.get(anforderung)
+        if geeignet is None:
+            geeignet = geeignet_je_anforderung[anforderung] = kompetenzindex.kandidaten(*anforderung, plaetze=plaetze)
+        if len(geeignet) == 0:
+            continue
+
+        # Freie Stunden im Zeitraum nur für geeignete Personen, O(1) je Person;
+        # bei großen Kandidatenmengen ist die zusammenhängende Zeile schneller
+        if 4 * len(geeignet) > anzahl_personen:
+            verf_stunden = kapazitaet.frei(von, bis)[geeignet]
+        else:
+            verf_stunden = kapazitaet.frei(von, bis, geeignet)
+
+        rest = float(aufwand_stunden[a_idx])
+        kandidaten = geeignet[_beste_kandidaten(verf_stunden, rest)]
+        if len(kandidaten) == 0:
+            continue
+
+        # Monat für Monat belegen, bis der Aufwand gedeckt ist
+        frei = kapazitaet.monatlich(von, bis, kandidaten).T  # Kandidaten × Monate
+        flach = frei.ravel()
+        kumuliert = np.cumsum(flach)
+        schnitt = int(np.searchsorted(kumuliert, rest - RESTSTUNDEN_TOLERANZ))
+        anteil = np.zeros_like(flach)
+        anteil[:schnitt] = flach[:schnitt]
+        if schnitt < len(flach):
+            anteil[schnitt] = min(flach[schnitt], rest - (kumuliert[schnitt - 1] if schnitt > 0 else 0.0))
+        anteil = anteil.reshape(frei.shape)
+
+        kapazitaet.belege(von, kandidaten, anteil.T)
+        zugewiesen = anteil.sum(axis=1)
+        for k in np.flatnonzero(zugewiesen > 0):
+            ergebnisse.append((a_idx, int(kandidaten[k]), float(zugewiesen[k])))
+
+    return ergebnisse
+
+
+def stunden_eingaben_aus_snapshot(snapshot):
+    """
+    Argumente für verteile_stunden aus den Spalten eines Snapshots (siehe
+    snapshot.py); Aufgabenzeiträume liegen dort auf derselben Monatsachse wie
+    die Verfügbarkeit.
+
+    Returns:
+        tuple: (Personenränge, Ist-Stunden, Aufgabenränge, Fenster von, Fenster bis, Aufwand in Stunden)
+    """
+    return (
+        snapshot.person_rang,
+        stunden_kapazitaet(snapshot.verfuegbarkeit, snapshot.teilzeitfaktor),
+        snapshot.aufgabe_rang,
+        snapshot.start - snapshot.erster_monat,
+        snapshot.ende - snapshot.erster_monat,
+        (np.asarray(snapshot.aufwand) * STUNDEN_PRO_PM).astype(np.int64),
+    )
+
+
+def verteile_stunden_aus_snapshot(snapshot, fortschritt=None):
+    """
+    verteile_stunden mit den Spalten eines Snapshots.
+
+    Returns:
+        list: [(Aufgabenindex, Personenindex, zugewiesene Stunden), ...]
+    """
+    return verteile_stunden(
+        *stunden_eingaben_aus_snapshot(snapshot),
+        kompetenzindex=snapshot.kompetenzindex(),
+        anforderungen=snapshot.anforderungen(offen_ohne_anforderung=True),
+        fortschritt=fortschritt,
+    )
+
+
+def _beste_kandidaten(verf_stunden, bedarf, vorauswahl=64):
+    """
+    Liefert die Personen mit freier Zeit absteigend nach freien Stunden sortiert
+    (bei Gleichstand in ursprünglicher Reihenfolge), aber nur so viele, wie zur
+    Deckung des Bedarfs nötig sind. Statt alle Kandidaten zu sortieren, wird
+    zunächst eine Vorauswahl per argpartition getroffen.
+    """
+    kandidaten = np.flatnonzero(verf_stunden > RESTSTUNDEN_TOLERANZ)
+    werte = verf_stunden[kandidaten]
+    schluessel = sortierschluessel(werte)
+
+    if len(kandidaten) > vorauswahl:
+        schwelle = schluessel[np.argpartition(-schluessel, vorauswahl - 1)[vorauswahl - 1]]
+        oben = schluessel >= schwelle
+        if werte[oben].sum() >= bedarf:
+            kandidaten, werte, schluessel = kandidaten[oben], werte[oben], schluessel[oben]
+
+    reihenfolge = np.argsort(-schluessel, kind="stable")
+    kandidaten, werte = kandidaten[reihenfolge], werte[reihenfolge]
+
+    # Nur so viele Kandidaten, bis der Bedarf gedeckt ist
+    anzahl = int(np.searchsorted(np.cumsum(werte), bedarf - RESTSTUNDEN_TOLERANZ)) + 1
+    return kandidaten[:anzahl]
@@ -0,0 +1,144 @@
+import re
+import threading
+from collections import namedtuple
+
+import numpy as np
+
+# -----------------------------
+# Zwischengespeicherte Verfügbarkeitsmatrix (Personen × Monate)
+# -----------------------------
+
+MONAT_MUSTER = re.compile(r"(\d{2}/\d{4}):([\d.]+)")
+
+# Unveränderlicher Stand des Speichers; wird bei jeder Änderung neu erzeugt,
+# sodass laufende Berechnungen nie eine halb aktualisierte Matrix sehen.
+VerfuegbarkeitsMatrix = namedtuple("VerfuegbarkeitsMatrix", ["matrix", "index", "monate", "spalten"])
+
+
+def parse_verfuegbarkeit(verf_str):
+    """
+    Wandelt den Verfügbarkeitsstring aus der Datenbank (z. B. "01/2025:0.5,02/2025:1.0")
+    in ein Dictionary um: {"01/2025": 0.5, "02/2025": 1.0}
+    """
+    monate = {}
+    if not verf_str:
+        return monate
+    for eintrag in verf_str.split(","):
+        match = MONAT_MUSTER.match(eintrag.strip())
+        if match:
+            monat, wert = match.groups()
+            monate[monat] = float(wert)
+    return monate
+
+
+def _monat_sortierschluessel(label):
+    monat, jahr = label.split("/")
+    return int(jahr), int(monat)
+
+
+class Verfuegbarkeitsspeicher:
+    """
+    Hält die Verfügbarkeiten aller Personen als float32-Matrix (Personen × Monate)
+    zusammen mit einem Index Person-ID -> Zeile. Jeder Verfügbarkeitsstring wird
+    nur einmal geparst; Änderungen an Personen markieren einzelne Zeilen als
+    veraltet, die beim nächsten Zugriff neu eingelesen werden.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stand = VerfuegbarkeitsMatrix(np.zeros((0, 0), dtype=np.float32), {}, [], {})
+        self._veraltet = set()
+        self._gueltig = False
+
+    def invalidiere(self, person_id=None):
+        """Markiert eine Person (oder ohne Argument den gesamten Speicher) als veraltet."""
+        with self._lock:
+            if person_id is None:
+                self._gueltig = False
+            else:
+                self._veraltet.add(person_id)
+
+    def aktualisiere(self, personen):
+        """Schreibt die Verfügbarkeiten der übergebenen Personen direkt in den Speicher."""
+        if not isinstance(personen, (list, tuple)):
+            personen = [personen]
+        with self._lock:
+            if self._gueltig:
+                self._patche(personen)
+
+    def lade(self, personen):
+        """
+        Liefert einen Stand, der alle übergebenen Personen aktuell enthält.
+        Beim ersten Aufruf (oder nach vollständiger Invalidierung) wird die Matrix
+        komplett aus den Personen aufgebaut, sonst nur fehlende oder veraltete Zeilen.
+
+        Returns:
+            VerfuegbarkeitsMatrix: (matrix, index, monate, spalten)
+        """
+        with self._lock:
+            if not self._gueltig:
+                self._baue(personen)
+            else:
+                index = self._stand.index
+                fehlend = [p for p in personen if p.id not in index or p.id in self._veraltet]
+                if fehlend:
+                    self._patche(fehlend)
+            return self._stand
+
+    def _baue(self, personen):
+        geparst = [parse_verfuegbarkeit(p.verfuegbare_monate) for p in personen]
+        monate = sorted({m for verf in geparst for m in verf}, key=_monat_sortierschluessel)
+        spalten = {m: i for i, m in enumerate(monate)}
+
+        matrix = np.zeros((len(personen), len(monate)), dtype=np.float32)
+        for zeile, verf in enumerate(geparst):
+            for monat, wert in verf.items():
+                matrix[zeile, spalten[monat]] = wert
+
+        self._stand = VerfuegbarkeitsMatrix(matrix, {p.id: i for i, p in enumerate(personen)}, monate, spalten)
+        self._veraltet.clear()
+        self._gueltig = True
+
+    def _patche(self, personen):
+        stand = self._stand
+        geparst = [parse_verfuegbarkeit(p.verfuegbare_monate) for p in personen]
+
+        neue_monate = {m for verf in geparst for m in verf} - set(stand.spalten)
+        if neue_monate:
+            monate = sorted(set(stand.monate) | neue_monate, key=_monat_sortierschluessel)
+            spalten = {m: i for i, m in enumerate(monate)}
+            matrix = np.zeros((stand.matrix.shape[0], len(monate)), dtype=np.float32)
+            matrix[:, [spalten[m] for m in stand.monate]] = stand.matrix
+        else:
+            monate, spalten = stand.monate, stand.spalten
+            matrix = stand.matrix.copy()
+
+        index = dict(stand.index)
+        neue_ids = [p.id for p in personen if p.id not in index]
+        if neue_ids:
+            for pid in neue_ids:
+                index[pid] = len(index)
+            matrix = np.vstack([matrix, np.zeros((len(neue_ids), len(monate)), dtype=np.float32)])
+
+        for person, verf in zip(personen, geparst):
+            zeile = index[person.id]
+            matrix[zeile, :] = 0
+            for monat, wert in verf.items():
+                matrix[zeile, spalten[monat]] = wert
+            self._veraltet.discard(person.id)
+
+        self._stand = VerfuegbarkeitsMatrix(matrix, index, monate, spalten)
+
+
+verfuegbarkeits_speicher = Verfuegbarkeitsspeicher()
+
+
+def beobachte_personen(modell, speicher=verfuegbarkeits_speicher):
+    """Hängt Listener an das Person-Modell, die geänderte Personen im Speicher invalidieren."""
+    from sqlalchemy import event
+
+    def _invalidiere(mapper, connection, target):
+        speicher.invalidiere(target.id)
+
+    for ereignis in ("after_insert", "after_update", "after_delete"):
+        event.listen(modell, ereignis, _invalidiere)
@@ -0,0 +1,175 @@
+import threading
+from itertools import islice
+
+from sqlalchemy import event, inspect
+from sqlalchemy.exc import IntegrityError
+
+from .listen import erhoehe_versionen
+from .models import Person, db
+from .monate import monat_ordinal
+from .stundenplanung import STUNDEN_PRO_PM
+from .verfuegbarkeit import parse_verfuegbarkeit
+
+# -----------------------------
+# Normalisierte Verfügbarkeit: eine Zeile je (Person, Monat) statt Textspalte
+# -----------------------------
+
+BATCHGROESSE = 5000
+
+_nachgefuehrt = set()
+_lock = threading.Lock()
+
+
+class Verfuegbarkeit(db.Model):
+    """
+    Verfügbarkeit einer Person in einem Monat (in PM), normalisiert aus
+    Person.verfuegbare_monate. Gespeichert werden nur Monate mit Kapazität > 0.
+    Der Index (monat, person_id, kapazitaet) deckt Bereichsabfragen über
+    Monate ab, ohne die Tabelle selbst zu lesen.
+    """
+    __tablename__ = "verfuegbarkeit"
+
+    person_id = db.Column(db.Integer, db.ForeignKey(f"{Person.__tablename__}.id", ondelete="CASCADE"),
+                          primary_key=True)
+    monat = db.Column(db.Integer, primary_key=True)  # Monatsnummer (monat_ordinal)
+    kapazitaet = db.Column(db.Float, nullable=False)
+
+    __table_args__ = (db.Index("ix_verfuegbarkeit_monat_person", "monat", "person_id", "kapazitaet"),)
+
+
+def verfuegbarkeitszeilen(person_id, verf_str):
+    """Zeilen der Tabelle verfuegbarkeit zu einem Verfügbarkeitsstring."""
+    return [
+        {"person_id": person_id, "monat": monat_ordinal(monat), "kapazitaet": wert}
+        for monat, wert in parse_verfuegbarkeit(verf_str).items()
+        if wert > 0
+    ]
+
+
+def migriere_verfuegbarkeit(nur_fehlende=False, batchgroesse=BATCHGROESSE):
+    """
+    Überträgt Person.verfuegbare_monate in die Tabelle verfuegbarkeit.
+    Ohne nur_fehlende wird die Tabelle vollständig neu aufgebaut; mit
+    nur_fehlende werden nur Personen ohne Zeilen übernommen (z. B. nach einem
+    Massenimport, der keine ORM-Events auslöst).
+
+    Returns:
+        dict: {"personen", "zeilen"}
+    """
+    tabelle = Verfuegbarkeit.__table__
+    abfrage = db.session.query(Person.id, Person.verfuegbare_monate)
+    if nur_fehlende:
+        abfrage = abfrage.filter(~Person.id.in_(db.session.query(Verfuegbarkeit.person_id)))
+    else:
+        db.session.execute(tabelle.delete())
+
+    # Erst vollständig lesen, dann schreiben: kein offener Cursor während der Inserts
+    personen = abfrage.order_by(Person.id).all()
+    zeilen = (z for person_id, verf_str in personen for z in verfuegbarkeitszeilen(person_id, verf_str))
+    anzahl = 0
+    while True:
+        charge = list(islice(zeilen, batchgroesse))
+        if not charge:
+            break
+        db.session.execute(tabelle.insert(), charge)
+        anzahl += len(charge)
+    db.session.commit()
+    return {"personen": len(personen), "zeilen": anzahl}
+
+
+def stelle_nachgefuehrt_sicher():
+    """
+    Übernimmt beim ersten Aufruf je Prozess und Datenbank alle Personen ohne
+    Zeilen in die Tabelle verfuegbarkeit (migriere_verfuegbarkeit mit
+    nur_fehlende). Ohne diesen Schritt lieferten Solver und von/bis-Filter
+    auf einer nicht migrierten Datenbank stillschweigend keine Personen.
+    """
+    schluessel = id(db.engine)
+    if schluessel in _nachgefuehrt:
+        return
+    with _lock:
+        if schluessel in _nachgefuehrt:
+            return
+        try:
+            migriere_verfuegbarkeit(nur_fehlende=True)
+        except IntegrityError:
+            # Ein anderer Prozess hat dieselben Personen gleichzeitig übernommen;
+            # beim nächsten Aufruf wird der Rest geprüft
+            db.session.rollback()
+            return
+        _nachgefuehrt.add(schluessel)
+
+
+def _im_bereich(abfrage, von, bis):
+    if von is not None:
+        abfrage = abfrage.filter(Verfuegbarkeit.monat >= von)
+    if bis is not None:
+        abfrage = abfrage.filter(Verfuegbarkeit.monat <= bis)
+    return abfrage
+
+
+def freie_stunden(von=None, bis=None, min_stunden=None):
+    """
+    Verfügbare Stunden je Person im Monatsbereich [von, bis], in SQL
+    aggregiert (PM * STUNDEN_PRO_PM / Teilzeitfaktor wie in der
+    stundenbasierten Zuweisung). Enthält nur Personen mit Kapazität im Bereich.
+
+    Args:
+        von, bis (int): Monatsnummern, None = offen
+        min_stunden (float): nur Personen mit mindestens so vielen Stunden
+
+    Returns:
+        Query über (person_id, stunden)
+    """
+    stunden = (db.func.sum(Verfuegbarkeit.kapazitaet) * STUNDEN_PRO_PM / Person.teilzeitfaktor).label("stunden")
+    abfrage = _im_bereich(
+        db.session.query(Verfuegbarkeit.person_id, stunden).join(Person, Person.id == Verfuegbarkeit.person_id),
+        von, bis,
+    ).group_by(Verfuegbarkeit.person_id, Person.teilzeitfaktor)
+    if min_stunden is not None:
+        abfrage = abfrage.having(stunden >= min_stunden)
+    return abfrage
+
+
+def verfuegbare_personen_ids(von=None, bis=None, min_stunden=None):
+    """IDs der Personen mit Kapazität (bzw. mindestens min_stunden) im Bereich, als Unterabfrage."""
+    if min_stunden is None:
+        return _im_bereich(db.session.query(Verfuegbarkeit.person_id), von, bis).distinct()
+    return freie_stunden(von, bis, min_stunden).with_entities(Verfuegbarkeit.person_id)
+
+
+def verfuegbare_personen(von=None, bis=None, min_stunden=None):
+    """Personen mit Kapazität im Bereich [von, bis], nach ID sortiert."""
+    return Person.query.filter(Person.id.in_(verfuegbare_personen_ids(von, bis, min_stunden))).order_by(Person.id)
+
+
+def beobachte_personen(modell=Person):
+    """
+    Hängt Listener an das Person-Modell, die die Tabelle verfuegbarkeit in
+    derselben Transaktion nachführen, sobald sich verfuegbare_monate ändert.
+    Die Schreibzugriffe laufen an der Session vorbei und zählen deshalb die
+    Tabellenversion selbst hoch.
+    """
+    tabelle = Verfuegbarkeit.__table__
+
+    def _schreibe(connection, target):
+        connection.execute(tabelle.delete().where(tabelle.c.person_id == target.id))
+        zeilen = verfuegbarkeitszeilen(target.id, target.verfuegbare_monate)
+        if zeilen:
+            connection.execute(tabelle.insert(), zeilen)
+        erhoehe_versionen(connection, [tabelle.name])
+
+    def _nach_insert(mapper, connection, target):
+        _schreibe(connection, target)
+
+    def _nach_update(mapper, connection, target):
+        if inspect(target).attrs.verfuegbare_monate.history.has_changes():
+            _schreibe(connection, target)
+
+    def _vor_delete(mapper, connection, target):
+        connection.execute(tabelle.delete().where(tabelle.c.person_id == target.id))
+        erhoehe_versionen(connection, [tabelle.name])
+
+    event.listen(modell, "after_insert", _nach_insert)
+    event.listen(modell, "after_update", _nach_update)
+    event.listen(modell, "before_delete", _vor_delete)
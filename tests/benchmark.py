@@ -0,0 +1,271 @@
+"""
+Benchmark aller Löser über synthetische Datensätze wachsender Größe.
+
+Misst je Löser und Größe Laufzeit, Spitzenspeicher (tracemalloc) und
+Lösungsqualität, schreibt die Ergebnisse als JSON und meldet Regressionen
+gegenüber einer gespeicherten Baseline (Exit-Code 1):
+
+    python benchmark.py --groessen 10 100 1000 --ausgabe ergebnis.json
+    python benchmark.py --groessen 10 100 1000 --als-baseline
+
+benchmark_baseline.json enthält die Referenz für die kleinen Größen
+(10, 100, 1000); Laufzeit und Speicher hängen vom Rechner ab, auf einem
+anderen Rechner zuerst mit --als-baseline eine eigene Baseline erzeugen.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+
+HIER = os.path.dirname(os.path.abspath(__file__))
+WURZEL = os.path.dirname(HIER)
+sys.path[:0] = [HIER, WURZEL, os.path.join(WURZEL, "data")]
+
+from generator import generiere_datensatz  # noqa: E402
+from genetic_matching import evolve, MatchingContext  # noqa: E402
+from src.kostenmatrix import kostenmatrix_aus_arrays, loese_kostenmatrix  # noqa: E402
+from src.stundenplanung import verteile_stunden_aus_snapshot, stunden_eingaben_aus_snapshot, STUNDEN_PRO_PM  # noqa: E402
+from src.flussplanung import verteile_stunden_fluss  # noqa: E402
+from src.snapshot import Snapshot  # noqa: E402
+
+GROESSEN = [10, 100, 1000, 10000, 100000]
+BASELINE = os.path.join(HIER, "benchmark_baseline.json")
+
+# Toleranzen für die Regressionsprüfung
+TOLERANZ_ZEIT = 0.25
+TOLERANZ_SPEICHER = 0.25
+# Unterhalb dieser Laufzeit (s) bzw. dieses Speichers (MB) sind Abweichungen Rauschen
+MIN_ZEIT_S = 0.05
+MIN_SPEICHER_MB = 1.0
+
+
+# -----------------------------
+# Löser: Funktion(Snapshot, Optionen) -> dict mit "qualitaet" (höher ist besser)
+# -----------------------------
+
+def _kostenmatrix(snapshot):
+    return kostenmatrix_aus_arrays(snapshot.person_rang, snapshot.teilzeitfaktor,
+                                   snapshot.aufgabe_rang, snapshot.aufwand)
+
+
+def _qualitaet_zuweisung(kostenmatrix, p_idx, a_idx, anzahl_aufgaben):
+    kosten = float(kostenmatrix[p_idx, a_idx].sum())
+    return {
+        "qualitaet": round(len(a_idx) / anzahl_aufgaben, 6),
+        "zuweisungen": int(len(a_idx)),
+        "gesamtkosten": round(kosten, 6),
+    }
+
+
+def loese_kuhn_munkres(snapshot, optionen):
+    """Kuhn-Munkres auf der vollständigen Kostenmatrix."""
+    kostenmatrix, _ = _kostenmatrix(snapshot)
+    p_idx, a_idx = loese_kostenmatrix(kostenmatrix)
+    return _qualitaet_zuweisung(kostenmatrix, p_idx, a_idx, snapshot.anzahl_aufgaben)
+
+
+def loese_stundenbasiert(snapshot, optionen):
+    """Stundenbasierte Verteilung (NumPy-Engine); Qualität = gedeckter Anteil der Stunden."""
+    ergebnisse = verteile_stunden_aus_snapshot(snapshot)
+    gedeckt = sum(s for _, _, s in ergebnisse)
+    bedarf = float((np.asarray(snapshot.aufwand) * STUNDEN_PRO_PM).astype(np.int64).sum())
+    return {
+        "qualitaet": round(gedeckt / bedarf, 6) if bedarf else 1.0,
+        "zuweisungen": len(ergebnisse),
+        "gedeckte_stunden": round(gedeckt, 3),
+        "bedarf_stunden": bedarf,
+    }
+
+
+def loese_stundenbasiert_fluss(snapshot, optionen):
+    """Stundenbasierte Verteilung als ein LP (Fluss-Engine); Qualität = gedeckter Anteil der Stunden."""
+    ergebnisse, abdeckung = verteile_stunden_fluss(
+        *stunden_eingaben_aus_snapshot(snapshot), snapshot.teilzeitfaktor,
+        kompetenzindex=snapshot.kompetenzindex(), anforderungen=snapshot.anforderungen(offen_ohne_anforderung=True),
+    )
+    return {
+        "qualitaet": round(abdeckung["abdeckung"], 6),
+        "zuweisungen": len(ergebnisse),
+        "gedeckte_stunden": round(abdeckung["gedeckt_stunden"], 3),
+        "bedarf_stunden": abdeckung["bedarf_stunden"],
+    }
+
+
+def loese_genetisch(snapshot, optionen):
+    """
+    Genetisches Matching mit fester Generationenzahl (statt Zeitbudget),
+    damit die Qualität nicht von der Rechnergeschwindigkeit abhängt.
+    """
+    context = MatchingContext.from_snapshot(snapshot)
+    bericht = None
+    for bericht in evolve(None, None, population_size=optionen["population"],
+                          generations=optionen["generationen"], seed=optionen["seed"], context=context):
+        pass
+    zuordnung = bericht["best_assignment"]
+    passend = int(context.skill_match[zuordnung, np.arange(context.num_tasks)].sum())
+    return {
+        "qualitaet": round(bericht["best_fitness"], 6),
+        "passende_kompetenz": passend,
+        "generationen": bericht["generation"] + 1,
+    }
+
+
+# Name -> (Funktion, größte sinnvolle Personenzahl). Kuhn-Munkres und das
+# genetische Matching halten dichte Personen × Aufgaben-Matrizen und werden
+# oberhalb der Grenze übersprungen; Kuhn-Munkres braucht bei 10 000 Personen
+# (2500 Aufgaben) schon rund 500 MB Spitzenspeicher.
+LOESER = {
+    "kuhn-munkres": (loese_kuhn_munkres, 5_000),
+    "stundenbasiert": (loese_stundenbasiert, 100_000),
+    "stundenbasiert-fluss": (loese_stundenbasiert_fluss, 100_000),
+    "genetisch": (loese_genetisch, 10_000),
+}
+
+
+# -----------------------------
+# Messung und Regressionsprüfung
+# -----------------------------
+
+def messe(funktion, snapshot, optionen, speicher=True):
+    """
+    Führt den Löser einmal ohne Tracing (Laufzeit) und, falls gewünscht, ein
+    zweites Mal unter tracemalloc (Spitzenspeicher) aus. tracemalloc erfasst
+    auch die Allokationen von NumPy.
+    """
+    start = time.perf_counter()
+    ergebnis = funktion(snapshot, optionen)
+    ergebnis["zeit_s"] = round(time.perf_counter() - start, 6)
+
+    if speicher:
+        tracemalloc.start()
+        try:
+            funktion(snapshot, optionen)
+            _, spitze = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        ergebnis["speicher_spitze_mb"] = round(spitze / 2 ** 20, 3)
+    return ergebnis
+
+
+def fuehre_aus(groessen, loeser, optionen, speicher=True):
+    """
+    Führt alle Löser über alle Größen aus.
+
+    Returns:
+        list: ein dict je (Löser, Größe)
+    """
+    ergebnisse = []
+    for groesse in groessen:
+        # Alle Löser lesen denselben Snapshot, aufbereitet wird nur einmal je Größe
+        snapshot = Snapshot.aus_dataframes(
+            *generiere_datensatz(groesse, optionen["aufgaben_je_person"], optionen["seed"])[:2]
+        )
+        for name in loeser:
+            funktion, maximum = LOESER[name]
+            eintrag = {"loeser": name, "personen": groesse, "aufgaben": snapshot.anzahl_aufgaben}
+            if groesse > maximum:
+                eintrag["uebersprungen"] = f"mehr als {maximum} Personen"
+            else:
+                eintrag.update(messe(funktion, snapshot, optionen, speicher))
+            ergebnisse.append(eintrag)
+            print(_zeile(eintrag), flush=True)
+    return ergebnisse
+
+
+def _zeile(eintrag):
+    kopf = f"{eintrag['loeser']:<22} {eintrag['personen']:>7} Personen"
+    if "uebersprungen" in eintrag:
+        return f"{kopf}  übersprungen ({eintrag['uebersprungen']})"
+    speicher = f"{eintrag['speicher_spitze_mb']:>9.1f} MB" if "speicher_spitze_mb" in eintrag else ""
+    return f"{kopf}  {eintrag['zeit_s']:>9.3f} s{speicher}  Qualität {eintrag['qualitaet']:.4f}"
+
+
+def vergleiche(ergebnisse, baseline, toleranz_zeit=TOLERANZ_ZEIT, toleranz_speicher=TOLERANZ_SPEICHER):
+    """
+    Vergleicht Ergebnisse mit einer Baseline gleicher Struktur. Regression ist:
+    Laufzeit bzw. Spitzenspeicher über Baseline * (1 + Toleranz) (und über dem
+    Rauschniveau) oder eine schlechtere Qualität (Daten sind per Seed fest).
+
+    Returns:
+        list: Meldungen, leer wenn keine Regression
+    """
+    referenz = {(e["loeser"], e["personen"]): e for e in baseline.get("ergebnisse", [])}
+    meldungen = []
+    for e in ergebnisse:
+        alt = referenz.get((e["loeser"], e["personen"]))
+        if alt is None or "uebersprungen" in e or "uebersprungen" in alt:
+            continue
+        name = f"{e['loeser']} ({e['personen']} Personen)"
+
+        if e["zeit_s"] > max(alt["zeit_s"] * (1 + toleranz_zeit), alt["zeit_s"] + MIN_ZEIT_S):
+            meldungen.append(f"{name}: Laufzeit {e['zeit_s']:.3f} s statt {alt['zeit_s']:.3f} s")
+        if "speicher_spitze_mb" in e and "speicher_spitze_mb" in alt and e["speicher_spitze_mb"] > max(
+                alt["speicher_spitze_mb"] * (1 + toleranz_speicher), alt["speicher_spitze_mb"] + MIN_SPEICHER_MB):
+            meldungen.append(f"{name}: Speicher {e['speicher_spitze_mb']:.1f} MB "
+                             f"statt {alt['speicher_spitze_mb']:.1f} MB")
+        if e["qualitaet"] < alt["qualitaet"] - 1e-9 * max(1.0, abs(alt["qualitaet"])):
+            meldungen.append(f"{name}: Qualität {e['qualitaet']} statt {alt['qualitaet']}")
+    return meldungen
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Löser über synthetische Datensätze vergleichen")
+    parser.add_argument("--groessen", type=int, nargs="+", default=GROESSEN)
+    parser.add_argument("--loeser", nargs="+", choices=list(LOESER), default=list(LOESER))
+    parser.add_argument("--aufgaben-je-person", type=float, default=0.25)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--population", type=int, default=50)
+    parser.add_argument("--generationen", type=int, default=50)
+    parser.add_argument("--ohne-speicher", action="store_true", help="Spitzenspeicher nicht messen")
+    parser.add_argument("--ausgabe", default="benchmark_ergebnis.json")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--als-baseline", action="store_true", help="Ergebnis als neue Baseline speichern")
+    parser.add_argument("--toleranz-zeit", type=float, default=TOLERANZ_ZEIT)
+    parser.add_argument("--toleranz-speicher", type=float, default=TOLERANZ_SPEICHER)
+    args = parser.parse_args()
+
+    optionen = {
+        "aufgaben_je_person": args.aufgaben_je_person,
+        "seed": args.seed,
+        "population": args.population,
+        "generationen": args.generationen,
+    }
+    ergebnisse = fuehre_aus(args.groessen, args.loeser, optionen, speicher=not args.ohne_speicher)
+    bericht = {
+        "erstellt": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plattform": platform.platform(),
+        "optionen": optionen,
+        "ergebnisse": ergebnisse,
+    }
+
+    ziel = args.baseline if args.als_baseline else args.ausgabe
+    with open(ziel, "w", encoding="utf-8") as f:
+        json.dump(bericht, f, indent=2, ensure_ascii=False)
+    print(f"Ergebnisse gespeichert in '{ziel}'")
+    if args.als_baseline:
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"Keine Baseline unter '{args.baseline}' – Vergleich übersprungen")
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("optionen") != optionen:
+        print("Warnung: Baseline wurde mit anderen Optionen erstellt")
+    meldungen = vergleiche(ergebnisse, baseline, args.toleranz_zeit, args.toleranz_speicher)
+    for meldung in meldungen:
+        print(f"REGRESSION {meldung}")
+    if not meldungen:
+        print("Keine Regressionen gegenüber der Baseline")
+    return 1 if meldungen else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
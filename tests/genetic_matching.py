@@ -1,23 +1,176 @@
+import os
+import sys
 import time
 import pandas as pd
 import numpy as np
 import random
+import multiprocessing
+import hashlib
+from collections import OrderedDict
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict, Tuple, Optional
-from copy import deepcopy
 
-def calculate_fitness(assignment, teilaufgaben_df, personen_df, belegungen=None):
+# The competence index and month helpers live in src/ (repository root on the path)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.kompetenzindex import Kompetenzindex, fachkompetenzen  # noqa: E402
+from src.monate import monat_ordinal, Monatsachse  # noqa: E402
+
+class MatchingContext:
+    """
+    Per-person and per-task arrays on a shared month axis, built once per dataset.
+
+    availability: people x months, taken from the verfuegbarkeit_MM/YYYY columns
+    occupation:   people x months project codes from projektbelegung_MM/YYYY (0 = "Frei")
+    task_start / task_end: month columns of each task window (end inclusive)
+    """
+
+    def __init__(self, teilaufgaben_df, personen_df):
+        availability_columns = {
+            monat_ordinal(c.split("_", 1)[1]): c
+            for c in personen_df.columns if c.startswith("verfuegbarkeit_")
+        }
+        occupation_columns = {
+            monat_ordinal(c.split("_", 1)[1]): c
+            for c in personen_df.columns if c.startswith("projektbelegung_")
+        }
+        task_start = np.array([monat_ordinal(v) for v in teilaufgaben_df["start"]], dtype=np.int64)
+        task_end = np.array([monat_ordinal(v) for v in teilaufgaben_df["ende"]], dtype=np.int64)
+
+        axis = Monatsachse.umfassend(
+            list(availability_columns) + list(occupation_columns) + list(task_start) + list(task_end)
+        )
+        self.first_month = axis.start if len(axis) else 0
+        self.num_months = len(axis)
+        self.num_people = len(personen_df)
+
+        self.availability = np.zeros((self.num_people, self.num_months), dtype=np.float64)
+        for ordinal, column in availability_columns.items():
+            self.availability[:, ordinal - self.first_month] = personen_df[column].fillna(0).to_numpy(dtype=np.float64)
+
+        # Project codes: 0 is reserved for "Frei"
+        self.project_codes = {"Frei": 0}
+        self.occupation = np.zeros((self.num_people, self.num_months), dtype=np.int32)
+        for ordinal, column in occupation_columns.items():
+            values = personen_df[column].fillna("Frei")
+            self.occupation[:, ordinal - self.first_month] = [
+                self.project_codes.setdefault(v, len(self.project_codes)) for v in values
+            ]
+
+        self.person_index = {pid: i for i, pid in enumerate(personen_df["id"])}
+        self.task_start = task_start - self.first_month
+        self.task_end = task_end - self.first_month
+        self.task_project = np.array(
+            [self.project_codes.get(v, -1) for v in teilaufgaben_df["projekt_id"]], dtype=np.int32
+        )
+        task_months = np.maximum(self.task_end - self.task_start + 1, 1)
+        self.task_effort = teilaufgaben_df["aufwand"].to_numpy(dtype=np.float64)
+        self.task_monthly_effort = self.task_effort / task_months
+        self.num_tasks = len(teilaufgaben_df)
+        self.zeitbudget = personen_df["zeitbudget"].to_numpy(dtype=np.float64)
+
+        # Skill match: people x tasks from the competence index, one bitset
+        # intersection per distinct requirement ("Optik, KI" needs both skills)
+        skill_index = Kompetenzindex.aus_merkmalen(kompetenz_listen=personen_df["kompetenzen_liste"].tolist())
+        self.skill_match = skill_index.eignung(
+            [(None, fachkompetenzen(skill)) if fachkompetenzen(skill) else (0, ())
+             for skill in teilaufgaben_df["kompetenz"]]
+        )
+        self._build_masks()
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        """
+        Build the context from a columnar snapshot (src/snapshot.py) instead of
+        DataFrames: the arrays are used as they are, skills come from the CSR
+        columns without splitting any strings
+        """
+        context = cls.__new__(cls)
+        context.first_month = snapshot.erster_monat
+        context.availability = np.asarray(snapshot.verfuegbarkeit, dtype=np.float64)
+        context.num_people, context.num_months = context.availability.shape
+        context.occupation = np.asarray(snapshot.belegung, dtype=np.int32)
+        context.project_codes = {str(key): code for code, key in enumerate(snapshot.projekte)}
+        context.person_index = {pid: i for i, pid in enumerate(snapshot.person_id.tolist())}
+        context.task_start = snapshot.start - context.first_month
+        context.task_end = snapshot.ende - context.first_month
+        # Projects nobody is booked on behave like unknown projects (-1)
+        booked = np.unique(context.occupation)
+        context.task_project = np.where(
+            np.isin(snapshot.aufgabe_projekt, booked), snapshot.aufgabe_projekt, -1
+        ).astype(np.int32)
+        task_months = np.maximum(context.task_end - context.task_start + 1, 1)
+        context.task_effort = np.asarray(snapshot.aufwand, dtype=np.float64)
+        context.task_monthly_effort = context.task_effort / task_months
+        context.num_tasks = len(context.task_effort)
+        context.zeitbudget = np.asarray(snapshot.teilzeitfaktor, dtype=np.float64)
+
+        # Skill match from the snapshot's competence index (-1 = unknown skill, nobody matches)
+        skill_names = [str(name) for name in snapshot.kompetenzen]
+        context.skill_match = snapshot.kompetenzindex().eignung(
+            [(None, (skill_names[k],)) if k >= 0 else (0, ()) for k in np.asarray(snapshot.aufgabe_kompetenz).tolist()]
+        )
+        context._build_masks()
+        return context
+
+    def _build_masks(self):
+        """
+        Project-conflict and task-window masks derived from the base arrays
+        """
+        # Project-conflict mask per task project: people x months, True = month usable
+        self.allowed_by_project = {
+            code: (self.occupation == 0) | (self.occupation == code)
+            for code in set(self.task_project.tolist())
+        }
+
+        # Same masks stacked for gathering across different tasks at once
+        project_slots = {code: i for i, code in enumerate(self.allowed_by_project)}
+        self.allowed_stack = np.stack([self.allowed_by_project[code] for code in project_slots]) \
+            if project_slots else np.zeros((0, self.num_people, self.num_months), dtype=bool)
+        self.task_project_slot = np.array([project_slots[c] for c in self.task_project.tolist()], dtype=np.int32)
+        months = np.arange(self.num_months)
+        self.window_mask = (months[None, :] >= self.task_start[:, None]) & (months[None, :] <= self.task_end[:, None])
+
+    def window(self, task_idx):
+        """
+        Slice of month columns covered by a task
+        """
+        return slice(int(self.task_start[task_idx]), int(self.task_end[task_idx]) + 1)
+
+    def allowed_months(self, person_idx, task_idx):
+        """
+        Months of the task window without a conflicting project occupation
+        """
+        return self.allowed_by_project[int(self.task_project[task_idx])][person_idx, self.window(task_idx)]
+
+    def initial_usage(self, belegungen=None):
+        """
+        Convert a {person_id: {"MM/YYYY": usage}} dict into a people x months array
+        """
+        usage = np.zeros_like(self.availability)
+        for person_id, months in (belegungen or {}).items():
+            row = self.person_index.get(person_id)
+            if row is None:
+                continue
+            for label, value in months.items():
+                col = monat_ordinal(label) - self.first_month
+                if 0 <= col < self.num_months:
+                    usage[row, col] += value
+        return usage
+
+def calculate_fitness(assignment, teilaufgaben_df, personen_df, belegungen=None, context=None):
     """
     Calculate fitness score for a given assignment
     Higher score = better assignment
     """
-    if belegungen is None:
-        belegungen = {}
+    if context is None:
+        context = MatchingContext(teilaufgaben_df, personen_df)
     
     total_score = 0
     constraint_penalty = 0
     
-    # Create temporary availability tracker
-    temp_belegungen = deepcopy(belegungen)
+    # Create temporary availability tracker (people x months)
+    temp_belegungen = context.initial_usage(belegungen)
     
     for task_idx, person_idx in enumerate(assignment):
         if person_idx >= len(personen_df):
@@ -26,50 +179,30 @@ def calculate_fitness(assignment, teilaufgaben_df, personen_df, belegungen=None)
         ta = teilaufgaben_df.iloc[task_idx]
         person = personen_df.iloc[person_idx]
         
-        # Check skill match
-        if ta["kompetenz"] not in person["kompetenzen_liste"]:
+        # Check skill match (same competence index as the batched path: every skill of the task)
+        if not context.skill_match[person_idx, task_idx]:
             constraint_penalty += 1000  # Heavy penalty for skill mismatch
             continue
         
-        # Check availability
-        ta_start = int(ta["start"].split("/")[0])
-        ta_ende = int(ta["ende"].split("/")[0])
-        ta_monate = ta_ende - ta_start + 1
-        ta_monatsaufwand = ta["aufwand"] / ta_monate
+        # Check availability over the task window (month columns, across years)
+        window = context.window(task_idx)
+        allowed = context.allowed_months(person_idx, task_idx)
         
-        person_id = person["id"]
-        if person_id not in temp_belegungen:
-            temp_belegungen[person_id] = {}
+        # Check project conflicts
+        constraint_penalty += 500 * int(np.count_nonzero(~allowed))  # Penalty for project conflict
         
         # Check monthly availability
-        available_hours = 0
-        for monat in range(ta_start, ta_ende + 1):
-            monat_label = f"{monat:02d}/2025"
-            
-            # Check project conflicts
-            belegung_label = f"projektbelegung_{monat_label}"
-            aktuelle_belegung = person.get(belegung_label, "Frei")
-            
-            if aktuelle_belegung not in ["Frei", ta["projekt_id"]]:
-                constraint_penalty += 500  # Penalty for project conflict
-                continue
-            
-            # Check availability
-            verfügbarkeit = person.get(f"verfuegbarkeit_{monat_label}", 0)
-            belegt = temp_belegungen[person_id].get(monat_label, 0)
-            rest = max(0, verfügbarkeit - belegt)
-            available_hours += rest
+        rest = np.maximum(0, context.availability[person_idx, window] - temp_belegungen[person_idx, window])
+        available_hours = rest[allowed].sum()
         
         if available_hours >= ta["aufwand"]:
             # Good assignment - calculate positive score
-            skill_bonus = 2.0 if ta["kompetenz"] in person["kompetenzen_liste"] else 1.0
+            skill_bonus = 2.0
             availability_score = available_hours * person["zeitbudget"] * skill_bonus
             total_score += availability_score
             
             # Update availability
-            for monat in range(ta_start, ta_ende + 1):
-                monat_label = f"{monat:02d}/2025"
-                temp_belegungen[person_id][monat_label] = temp_belegungen[person_id].get(monat_label, 0) + ta_monatsaufwand
+            temp_belegungen[person_idx, window] += context.task_monthly_effort[task_idx]
         else:
             constraint_penalty += 200  # Penalty for insufficient availability
     
@@ -77,14 +210,297 @@ def calculate_fitness(assignment, teilaufgaben_df, personen_df, belegungen=None)
     assigned_workload = sum(
         row["aufwand"]
         for i, (_, row) in enumerate(teilaufgaben_df.iterrows())
-        if assignment[i] < len(personen_df)
-        and row["kompetenz"] in personen_df.iloc[assignment[i]]["kompetenzen_liste"]
+        if assignment[i] < len(personen_df) and context.skill_match[assignment[i], i]
     )
     total_workload = teilaufgaben_df["aufwand"].sum()
     coverage_bonus = (assigned_workload / total_workload) * 1000
 
     return total_score + coverage_bonus - constraint_penalty
 
+def evaluate_population(population, context, belegungen=None, return_gene_scores=False):
+    """
+    Score a whole population in one batched pass
+
+    Args:
+        population: int array (population x tasks), gene = person index
+        context: MatchingContext of the dataset
+        belegungen: optional pre-existing usage {person_id: {"MM/YYYY": usage}}
+        return_gene_scores: also return the contribution of every gene
+
+    Returns:
+        np.ndarray: fitness per individual, identical to calculate_fitness
+        (and the population x tasks gene contributions if requested)
+    """
+    population = np.asarray(population, dtype=np.int32)
+    num_individuals, num_tasks = population.shape
+    rows = np.arange(num_individuals)
+
+    # Only people that occur in the population get a usage track
+    valid = population < context.num_people
+    genes = np.where(valid, population, 0)
+    used_people, compact = np.unique(genes, return_inverse=True)
+    compact = compact.reshape(genes.shape)
+    usage = np.broadcast_to(
+        context.initial_usage(belegungen)[used_people], (num_individuals, len(used_people), context.num_months)
+    ).copy()
+
+    total_score = np.zeros(num_individuals)
+    constraint_penalty = np.zeros(num_individuals)
+    assigned_workload = np.zeros(num_individuals)
+    gene_scores = np.zeros((num_individuals, num_tasks)) if return_gene_scores else None
+
+    for task_idx in range(num_tasks):
+        person = genes[:, task_idx]
+        slot = compact[:, task_idx]
+
+        # Check skill match
+        matched = valid[:, task_idx] & context.skill_match[person, task_idx]
+        constraint_penalty += np.where(valid[:, task_idx] & ~matched, 1000, 0)
+        assigned_workload += np.where(matched, context.task_effort[task_idx], 0)
+
+        # Check project conflicts
+        window = context.window(task_idx)
+        allowed = context.allowed_by_project[int(context.task_project[task_idx])][person, window]
+        constraint_penalty += np.where(matched, 500 * np.count_nonzero(~allowed, axis=1), 0)
+
+        # Check monthly availability
+        rest = np.maximum(0, context.availability[person, window] - usage[rows, slot, window])
+        available_hours = np.where(allowed, rest, 0).sum(axis=1)
+
+        good = matched & (available_hours >= context.task_effort[task_idx])
+        total_score += np.where(good, available_hours * context.zeitbudget[person] * 2.0, 0)
+        constraint_penalty += np.where(matched & ~good, 200, 0)
+
+        # Update availability
+        usage[rows[good], slot[good], window] += context.task_monthly_effort[task_idx]
+
+        if return_gene_scores:
+            gene_scores[:, task_idx] = _gene_score(
+                valid[:, task_idx], matched, good, np.count_nonzero(~allowed, axis=1),
+                available_hours * context.zeitbudget[person] * 2.0
+            )
+
+    coverage_bonus = (assigned_workload / context.task_effort.sum()) * 1000
+    fitness = total_score + coverage_bonus - constraint_penalty
+    if return_gene_scores:
+        return fitness, gene_scores
+    return fitness
+
+def _gene_score(valid, matched, good, conflicts, availability_score):
+    """
+    Contribution of single genes to the fitness (positive score minus penalties)
+    """
+    return (
+        np.where(valid & ~matched, -1000, 0)
+        + np.where(matched, -500 * conflicts, 0)
+        + np.where(good, availability_score, 0)
+        + np.where(matched & ~good, -200, 0)
+    )
+
+def workload_coverage(population, context):
+    """
+    Workload coverage bonus for each individual
+    """
+    population = np.asarray(population)
+    valid = population < context.num_people
+    genes = np.where(valid, population, 0)
+    matched = valid & context.skill_match[genes, np.arange(population.shape[1])]
+    assigned_workload = np.where(matched, context.task_effort, 0).sum(axis=1)
+    return (assigned_workload / context.task_effort.sum()) * 1000
+
+def person_gene_scores(population, individuals, people, context):
+    """
+    Recompute the gene contributions of selected (individual, person) pairs.
+
+    Tasks of different people never interact, so only the genes assigned to a
+    person have to be replayed when that person's tasks change. The pairs are
+    processed in lock-step: step j handles the j-th task (in task order) of
+    every pair, so the loop runs over the largest per-person task count instead
+    of over all tasks.
+
+    Returns:
+        tuple: (individual index, task index, gene score) per recomputed gene
+    """
+    genes = population[individuals]
+    pair_idx, task_idx = np.nonzero(genes == people[:, None])
+    if len(pair_idx) == 0:
+        return pair_idx, task_idx, np.zeros(0)
+
+    first = np.searchsorted(pair_idx, np.arange(len(individuals)))
+    rank = np.arange(len(pair_idx)) - first[pair_idx]
+    usage = np.zeros((len(individuals), context.num_months))
+    scores = np.empty(len(pair_idx))
+
+    order = np.argsort(rank, kind="stable")
+    steps = np.split(order, np.flatnonzero(np.diff(rank[order])) + 1)
+    for entries in steps:
+        pair = pair_idx[entries]
+        task = task_idx[entries]
+        person = people[pair]
+
+        matched = context.skill_match[person, task]
+        window = context.window_mask[task]
+        allowed = context.allowed_stack[context.task_project_slot[task], person] & window
+        conflicts = np.count_nonzero(window & ~allowed, axis=1)
+
+        rest = np.maximum(0, context.availability[person] - usage[pair])
+        available_hours = np.where(allowed, rest, 0).sum(axis=1)
+        good = matched & (available_hours >= context.task_effort[task])
+
+        usage[pair[good]] += window[good] * context.task_monthly_effort[task[good], None]
+        scores[entries] = _gene_score(
+            np.ones(len(entries), dtype=bool), matched, good, conflicts,
+            available_hours * context.zeitbudget[person] * 2.0
+        )
+
+    return individuals[pair_idx], task_idx, scores
+
+class FitnessCache:
+    """
+    Bounded LRU cache of fitness values and gene contributions, keyed by a
+    hash of the chromosome
+    """
+
+    def __init__(self, max_size=4096):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(chromosome):
+        return hashlib.blake2b(np.ascontiguousarray(chromosome, dtype=np.int32).tobytes(), digest_size=16).digest()
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key, fitness, gene_scores):
+        self.entries[key] = (fitness, gene_scores)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+class CachedEvaluator:
+    """
+    Population evaluation with fitness memoization and incremental delta scoring.
+
+    Chromosomes seen before are served from the LRU cache. Children that differ
+    from one of their parents in only a few genes reuse that parent's gene
+    contributions and replay just the people whose tasks changed; everything
+    else is scored with evaluate_population. Delta scores agree with a full
+    evaluation up to floating point rounding.
+    """
+
+    def __init__(self, cache_size=4096, max_delta_fraction=0.25):
+        self.cache = FitnessCache(cache_size)
+        self.max_delta_fraction = max_delta_fraction
+        self.previous_population = None
+        self.previous_gene_scores = None
+        self.full_evaluations = 0
+        self.delta_evaluations = 0
+        self.individuals = 0
+        self.elapsed = 0.0
+        self.batch_cost = None
+        self.reference_size = 1
+
+    def evaluate(self, population, context, parents=None):
+        """
+        Args:
+            population: int array (population x tasks)
+            context: MatchingContext of the dataset
+            parents: optional (population x 2) indices into the previously evaluated population
+
+        Returns:
+            np.ndarray: fitness per individual
+        """
+        start = time.perf_counter()
+        num_individuals, num_tasks = population.shape
+        fitness = np.empty(num_individuals)
+        gene_scores = np.empty((num_individuals, num_tasks))
+        keys = [FitnessCache.key(row) for row in population]
+
+        missing = []
+        for i, key in enumerate(keys):
+            entry = self.cache.get(key)
+            if entry is None:
+                missing.append(i)
+            else:
+                fitness[i], gene_scores[i] = entry
+        missing = np.array(missing, dtype=np.intp)
+
+        delta = np.zeros(len(missing), dtype=bool)
+        if parents is not None and self.previous_population is not None and len(missing):
+            # Closest parent of every missing child
+            candidates = self.previous_population[parents[missing]]
+            differences = (candidates != population[missing][:, None, :]).sum(axis=2)
+            closest = np.argmin(differences, axis=1)
+            source = parents[missing, closest]
+            delta = differences[np.arange(len(missing)), closest] <= self.max_delta_fraction * num_tasks
+
+        if delta.any():
+            children = missing[delta]
+            gene_scores[children] = self.previous_gene_scores[source[delta]]
+            changed = population[children] != self.previous_population[source[delta]]
+            pair_child, pair_task = np.nonzero(changed)
+            people = np.concatenate([
+                population[children[pair_child], pair_task],
+                self.previous_population[source[delta][pair_child], pair_task],
+            ])
+            owners = np.concatenate([children[pair_child]] * 2)
+            pairs = np.unique(np.stack([owners, people], axis=1), axis=0)
+            pairs = pairs[pairs[:, 1] < context.num_people]
+            rows, tasks, scores = person_gene_scores(population, pairs[:, 0], pairs[:, 1], context)
+            gene_scores[rows, tasks] = scores
+            # Genes of invalid people carry no contribution
+            invalid = population[children] >= context.num_people
+            gene_scores[children] = np.where(invalid, 0, gene_scores[children])
+            fitness[children] = gene_scores[children].sum(axis=1) + workload_coverage(population[children], context)
+            self.delta_evaluations += len(children)
+
+        full = missing[~delta]
+        if len(full):
+            full_start = time.perf_counter()
+            fitness[full], gene_scores[full] = evaluate_population(population[full], context, return_gene_scores=True)
+            self.full_evaluations += len(full)
+            if len(full) == num_individuals:
+                # Reference cost of scoring the whole population without cache
+                self.batch_cost = time.perf_counter() - full_start
+
+        for i in missing:
+            self.cache.put(keys[i], fitness[i], gene_scores[i].copy())
+
+        self.previous_population = population
+        self.previous_gene_scores = gene_scores
+        self.individuals += num_individuals
+        self.elapsed += time.perf_counter() - start
+        self.reference_size = num_individuals
+        return fitness
+
+    @property
+    def time_saved(self):
+        """
+        Estimated evaluation time saved compared to scoring every generation
+        with a full evaluate_population pass
+        """
+        if self.batch_cost is None:
+            return 0.0
+        return self.individuals / self.reference_size * self.batch_cost - self.elapsed
+
+    def summary(self):
+        return (f"Cache: hit rate {self.cache.hit_rate:.1%}, delta {self.delta_evaluations}, "
+                f"full {self.full_evaluations}, saved ~{self.time_saved:.3f}s")
+
 def create_initial_population(population_size, num_tasks, num_people):
     """
     Create initial population of random assignments
@@ -133,8 +549,241 @@ def mutate(assignment, mutation_rate=0.1, num_people=None):
     
     return mutated
 
+def random_population(rng, population_size, num_tasks, num_people):
+    """
+    Create a random population as int32 array (population x tasks)
+    """
+    return rng.integers(0, num_people, size=(population_size, num_tasks), dtype=np.int32)
+
+def next_generation(rng, population, fitness_scores, num_people, mutation_rate=0.1,
+                    crossover_rate=0.8, tournament_size=3, return_parents=False):
+    """
+    Build the next population with array operations: elitism, tournament
+    selection, single-point crossover and mutation for all children at once
+
+    With return_parents the (population x 2) parent indices of every new
+    individual are returned as well, which enables delta scoring.
+    """
+    population_size, num_tasks = population.shape
+    num_pairs = population_size // 2  # enough children to refill after the elite
+
+    # Tournament selection (without replacement inside a tournament)
+    tournament_size = min(tournament_size, population_size)
+    contenders = rng.random((2 * num_pairs, population_size)).argpartition(tournament_size - 1, axis=1)
+    contenders = contenders[:, :tournament_size]
+    winners = contenders[np.arange(2 * num_pairs), np.argmax(fitness_scores[contenders], axis=1)]
+    parent1 = population[winners[:num_pairs]]
+    parent2 = population[winners[num_pairs:]]
+
+    # Single-point crossover
+    if num_tasks > 1:
+        do_crossover = rng.random(num_pairs) <= crossover_rate
+        points = rng.integers(1, num_tasks, size=num_pairs)
+        head = (np.arange(num_tasks)[None, :] < points[:, None]) | ~do_crossover[:, None]
+        child1 = np.where(head, parent1, parent2)
+        child2 = np.where(head, parent2, parent1)
+    else:
+        child1, child2 = parent1.copy(), parent2.copy()
+    children = np.concatenate([child1, child2])
+
+    # Mutation
+    mutation_mask = rng.random(children.shape) < mutation_rate
+    children[mutation_mask] = rng.integers(0, num_people, size=int(mutation_mask.sum()), dtype=np.int32)
+
+    # Elitism: keep best individual
+    elite_idx = int(np.argmax(fitness_scores))
+    new_population = np.concatenate([population[elite_idx][None, :], children])[:population_size]
+    if not return_parents:
+        return new_population
+
+    first, second = winners[:num_pairs], winners[num_pairs:]
+    parents = np.concatenate([
+        [[elite_idx, elite_idx]],
+        np.stack([first, second], axis=1),
+        np.stack([second, first], axis=1),
+    ])[:population_size]
+    return new_population, parents
+
+def greedy_assignment(context):
+    """
+    Fast constructive solution: every task (in order) goes to the qualified person
+    with the best availability score in the task window, consuming that capacity
+    """
+    assignment = np.zeros(context.num_tasks, dtype=np.int32)
+    usage = np.zeros_like(context.availability)
+    
+    for task_idx in range(context.num_tasks):
+        window = context.window(task_idx)
+        allowed = context.allowed_by_project[int(context.task_project[task_idx])][:, window]
+        rest = np.maximum(0, context.availability[:, window] - usage[:, window])
+        available_hours = np.where(allowed, rest, 0).sum(axis=1)
+        
+        qualified = context.skill_match[:, task_idx]
+        good = qualified & (available_hours >= context.task_effort[task_idx])
+        candidates = good if good.any() else qualified
+        if not candidates.any():
+            assignment[task_idx] = int(np.argmax(available_hours))
+            continue
+        
+        score = np.where(candidates, available_hours * context.zeitbudget, -np.inf)
+        person = int(np.argmax(score))
+        assignment[task_idx] = person
+        if good[person]:
+            usage[person, window] += context.task_monthly_effort[task_idx]
+    
+    return assignment
+
+def hungarian_assignment(context):
+    """
+    One-to-one solution of the Hungarian method on the static gene scores
+    (availability score, minus penalties for missing skills and project conflicts).
+    Tasks left over when there are fewer people than tasks keep the greedy choice.
+    """
+    from scipy.optimize import linear_sum_assignment
+    
+    value = np.empty((context.num_people, context.num_tasks))
+    for task_idx in range(context.num_tasks):
+        window = context.window(task_idx)
+        allowed = context.allowed_by_project[int(context.task_project[task_idx])][:, window]
+        available_hours = np.where(allowed, context.availability[:, window], 0).sum(axis=1)
+        good = available_hours >= context.task_effort[task_idx]
+        value[:, task_idx] = (
+            np.where(good, available_hours * context.zeitbudget * 2.0, -200)
+            - 500 * np.count_nonzero(~allowed, axis=1)
+        )
+    value[~context.skill_match] = -1000
+    
+    assignment = greedy_assignment(context)
+    people, tasks = linear_sum_assignment(value, maximize=True)
+    assignment[tasks] = people
+    return assignment
+
+SEEDING_STRATEGIES = {
+    "greedy": greedy_assignment,
+    "hungarian": hungarian_assignment,
+}
+
+def seeded_population(rng, seed_assignment, population_size, num_people, mutation_rate=0.1):
+    """
+    Initial population around a constructive solution: the seed itself, mutated
+    copies of it for the first half and random chromosomes for diversity
+    """
+    population = random_population(rng, population_size, len(seed_assignment), num_people)
+    num_copies = max(1, population_size // 2)
+    copies = np.broadcast_to(seed_assignment, (num_copies, len(seed_assignment))).copy()
+    mask = rng.random(copies.shape) < mutation_rate
+    mask[0] = False
+    copies[mask] = rng.integers(0, num_people, size=int(mask.sum()), dtype=np.int32)
+    population[:num_copies] = copies
+    return population
+
+class NullInstrumentation:
+    """
+    Default instrumentation hooks: do nothing. Any object with the same two
+    methods can be passed instead, e.g. the metrics registry in src/metriken.py
+    """
+
+    def phase(self, name, **labels):
+        return nullcontext()
+
+    def zaehle(self, name, value=1, **labels):
+        pass
+
+NULL_INSTRUMENTATION = NullInstrumentation()
+
+def evolve(teilaufgaben_df, personen_df, population_size=50, generations=100, mutation_rate=0.1,
+           crossover_rate=0.8, tournament_size=3, seed=None, time_budget=None, patience=None,
+           min_improvement=0.0, seeding="random", context=None, instrumentation=None):
+    """
+    Anytime genetic algorithm: a generator that yields the best-so-far solution
+    after every generation, so the caller can stop at any point.
+    
+    Stops after generations, when time_budget seconds have passed, or when the
+    best fitness has not improved by more than min_improvement for patience
+    generations. At least one generation is always evaluated.
+    
+    Args:
+        seeding: "random", "greedy" or "hungarian" initial population
+        context: optional prebuilt MatchingContext
+        instrumentation: hooks timing the phases (context, seeding, evaluate,
+                         breed) and counting generations, see NullInstrumentation
+        
+    Yields:
+        dict: generation, best_fitness, best_assignment, avg_fitness, worst_fitness,
+              elapsed, stop_reason (None until the last report), evaluator
+    """
+    start_time = time.time()
+    hooks = instrumentation or NULL_INSTRUMENTATION
+    labels = {"algorithmus": "genetisch"}
+    if context is None:
+        with hooks.phase("context", **labels):
+            context = MatchingContext(teilaufgaben_df, personen_df)
+    rng = np.random.default_rng(seed)
+    
+    # Create initial population (population x tasks)
+    if seeding not in ("random", *SEEDING_STRATEGIES):
+        raise ValueError(f"Unknown seeding strategy: {seeding}")
+    with hooks.phase("seeding", seeding=seeding, **labels):
+        if seeding == "random":
+            population = random_population(rng, population_size, context.num_tasks, context.num_people)
+        else:
+            population = seeded_population(
+                rng, SEEDING_STRATEGIES[seeding](context), population_size, context.num_people, mutation_rate
+            )
+    parents = None
+    evaluator = CachedEvaluator()
+    
+    best_fitness = float('-inf')
+    best_assignment = None
+    last_improvement = 0
+    
+    for generation in range(generations):
+        # Calculate fitness for all individuals (cached / delta / batched)
+        with hooks.phase("evaluate", **labels):
+            fitness_scores = evaluator.evaluate(population, context, parents)
+        hooks.zaehle("generationen", 1, **labels)
+        
+        # Track best solution
+        best_idx = int(np.argmax(fitness_scores))
+        if fitness_scores[best_idx] > best_fitness:
+            if fitness_scores[best_idx] - best_fitness > min_improvement:
+                last_improvement = generation
+            best_fitness = float(fitness_scores[best_idx])
+            best_assignment = population[best_idx].copy()
+        
+        elapsed = time.time() - start_time
+        stop_reason = None
+        if generation == generations - 1:
+            stop_reason = "generations"
+        elif time_budget is not None and elapsed >= time_budget:
+            stop_reason = "time_budget"
+        elif patience is not None and generation - last_improvement >= patience:
+            stop_reason = "stagnation"
+        
+        yield {
+            "generation": generation,
+            "best_fitness": best_fitness,
+            "best_assignment": best_assignment,
+            "avg_fitness": float(np.mean(fitness_scores)),
+            "worst_fitness": float(fitness_scores.min()),
+            "elapsed": elapsed,
+            "stop_reason": stop_reason,
+            "evaluator": evaluator,
+        }
+        if stop_reason:
+            return
+        
+        # Create new population
+        with hooks.phase("breed", **labels):
+            population, parents = next_generation(
+                rng, population, fitness_scores, context.num_people,
+                mutation_rate, crossover_rate, tournament_size, return_parents=True
+            )
+
 def genetic_algorithm_matching(teilaufgaben_df, personen_df, population_size=50, generations=100, 
-                             mutation_rate=0.1, crossover_rate=0.8, tournament_size=3):
+                             mutation_rate=0.1, crossover_rate=0.8, tournament_size=3, seed=None,
+                             time_budget=None, patience=None, seeding="random", callback=None,
+                             instrumentation=None):
     """
     Genetic Algorithm for optimal assignment
     
@@ -146,6 +795,12 @@ def genetic_algorithm_matching(teilaufgaben_df, personen_df, population_size=50,
         mutation_rate: Probability of mutation
         crossover_rate: Probability of crossover
         tournament_size: Size of tournament for selection
+        seed: Seed for the random generator
+        time_budget: Wall-clock limit in seconds
+        patience: Stop after this many generations without improvement
+        seeding: Initial population ("random", "greedy" or "hungarian")
+        callback: Called with every generation report; returning False stops the run
+        instrumentation: Phase timing / counter hooks passed on to evolve
         
     Returns:
         tuple: (list of matching results, execution time)
@@ -153,72 +808,58 @@ def genetic_algorithm_matching(teilaufgaben_df, personen_df, population_size=50,
     print("\n=== Genetic Algorithm ===")
     start_time = time.time()
     
-    num_tasks = len(teilaufgaben_df)
-    num_people = len(personen_df)
-    
-    # Create initial population
-    population = create_initial_population(population_size, num_tasks, num_people)
-    
-    best_fitness = float('-inf')
-    best_assignment = None
-    
     print(f"Population size: {population_size}")
     print(f"Generations: {generations}")
-    print(f"Tasks: {num_tasks}, People: {num_people}")
+    print(f"Tasks: {len(teilaufgaben_df)}, People: {len(personen_df)}")
     
-    # Evolution loop
-    for generation in range(generations):
-        # Calculate fitness for all individuals
-        fitness_scores = []
-        for assignment in population:
-            fitness = calculate_fitness(assignment, teilaufgaben_df, personen_df)
-            fitness_scores.append(fitness)
-            
-            # Track best solution
-            if fitness > best_fitness:
-                best_fitness = fitness
-                best_assignment = assignment.copy()
-        
-        # Create new population
-        new_population = []
-        
-        # Elitism: keep best individual
-        best_idx = fitness_scores.index(max(fitness_scores))
-        new_population.append(population[best_idx])
-        
-        # Generate rest of population
-        while len(new_population) < population_size:
-            # Selection
-            parent1 = tournament_selection(population, fitness_scores, tournament_size)
-            parent2 = tournament_selection(population, fitness_scores, tournament_size)
-            
-            # Crossover
-            child1, child2 = crossover(parent1, parent2, crossover_rate)
-            
-            # Mutation
-            child1 = mutate(child1, mutation_rate, num_people)
-            child2 = mutate(child2, mutation_rate, num_people)
-            
-            new_population.extend([child1, child2])
-        
-        # Trim to population size
-        population = new_population[:population_size]
+    report = None
+    for report in evolve(teilaufgaben_df, personen_df, population_size, generations, mutation_rate,
+                         crossover_rate, tournament_size, seed, time_budget, patience, seeding=seeding,
+                         instrumentation=instrumentation):
+        generation = report["generation"]
+        stopped = callback is not None and callback(report) is False
         
         # Progress reporting
-        if generation % 20 == 0 or generation == generations - 1:
-            avg_fitness = np.mean(fitness_scores)
-            worst_fitness = min(fitness_scores)
+        if generation % 20 == 0 or report["stop_reason"] or stopped:
+            best_fitness = report["best_fitness"]
+            avg_fitness = report["avg_fitness"]
+            worst_fitness = report["worst_fitness"]
             if best_fitness == worst_fitness:
                 best_grade = avg_grade = 1.0
             else:
                 best_grade = 1.0
                 avg_grade = 1.0 + 4.0 * (worst_fitness - avg_fitness) / (worst_fitness - best_fitness)
                 avg_grade = min(max(avg_grade, 1.0), 5.0)
-            print(f"Generation {generation}: Best={best_fitness:.1f} (Note: {best_grade:.2f}), Avg={avg_fitness:.1f} (Note: {avg_grade:.2f})")
+            print(f"Generation {generation}: Best={best_fitness:.1f} (Note: {best_grade:.2f}), Avg={avg_fitness:.1f} (Note: {avg_grade:.2f}), {report['evaluator'].summary()}")
+        
+        if stopped:
+            print("Stopped by callback")
+            break
+        if report["stop_reason"] and report["stop_reason"] != "generations":
+            print(f"Stopped early ({report['stop_reason']}) after {generation + 1} generations")
     
     # Convert best assignment to results format
+    best_fitness = report["best_fitness"] if report else float('-inf')
+    best_assignment = report["best_assignment"] if report else None
+    if best_assignment is None:
+        matching_results = []
+    else:
+        matching_results = assignment_to_results(best_assignment, best_fitness, teilaufgaben_df, personen_df)
+    
+    execution_time = time.time() - start_time
+    
+    print(f"Execution time: {execution_time:.3f} seconds")
+    print(f"Best fitness: {best_fitness:.1f}")
+    print(f"Found assignments: {len(matching_results)}")
+    
+    return matching_results, execution_time
+
+def assignment_to_results(assignment, fitness, teilaufgaben_df, personen_df):
+    """
+    Convert a chromosome into the list of matching result dicts
+    """
     matching_results = []
-    for task_idx, person_idx in enumerate(best_assignment):
+    for task_idx, person_idx in enumerate(assignment):
         if person_idx < len(personen_df):
             ta = teilaufgaben_df.iloc[task_idx]
             person = personen_df.iloc[person_idx]
@@ -231,60 +872,205 @@ def genetic_algorithm_matching(teilaufgaben_df, personen_df, population_size=50,
                 "person_id": person["id"],
                 "name": person["name"],
                 "zugewiesener_aufwand": ta["aufwand"],
-                "score": best_fitness
+                "score": fitness
             })
+    return matching_results
+
+# Island parameters: one sub-population per parameter set
+DEFAULT_ISLANDS = [
+    {"population_size": 50, "generations": 100, "mutation_rate": 0.1},
+    {"population_size": 100, "generations": 150, "mutation_rate": 0.05},
+    {"population_size": 75, "generations": 200, "mutation_rate": 0.15},
+]
+
+CACHE_COUNTERS = ("hits", "misses", "delta")
+
+# Read-only dataset of the island workers; inherited on fork, otherwise set once per worker
+_island_context = None
+
+# Fitness caches of the islands evolved in this process, by island id. They never
+# cross the process boundary; an island scheduled on another worker starts with
+# an empty cache there.
+_island_evaluators = {}
+
+def _init_island_worker(context):
+    global _island_context
+    _island_context = context
+    _island_evaluators.clear()
+
+def _cache_counters(evaluator):
+    return np.array([evaluator.cache.hits, evaluator.cache.misses, evaluator.delta_evaluations])
+
+def _evolve_island(island, generations):
+    """
+    Evolve one island for a number of generations (runs inside a worker process).
+    Only the individuals, their scores, the random generator and the best
+    chromosome are sent back and forth; the fitness cache stays in the worker.
     
-    execution_time = time.time() - start_time
+    Returns:
+        dict: population, fitness, rng, best_fitness, best_assignment and the
+              cache counters of this call (cache_delta)
+    """
+    context = _island_context
+    params = island["params"]
+    rng = island["rng"]
+    population = island["population"]
+    best_fitness = island["best_fitness"]
+    best_assignment = island["best_assignment"]
+    evaluator = _island_evaluators.get(island["id"])
+    if evaluator is None:
+        evaluator = _island_evaluators[island["id"]] = CachedEvaluator(params.get("cache_size", 1024))
+    counters = _cache_counters(evaluator)
+    parents = None
     
-    print(f"Execution time: {execution_time:.3f} seconds")
-    print(f"Best fitness: {best_fitness:.1f}")
-    print(f"Found assignments: {len(matching_results)}")
+    for _ in range(generations):
+        fitness_scores = evaluator.evaluate(population, context, parents)
+        best_idx = int(np.argmax(fitness_scores))
+        if fitness_scores[best_idx] > best_fitness:
+            best_fitness = float(fitness_scores[best_idx])
+            best_assignment = population[best_idx].copy()
+        population, parents = next_generation(
+            rng, population, fitness_scores, context.num_people,
+            params.get("mutation_rate", 0.1), params.get("crossover_rate", 0.8),
+            params.get("tournament_size", 3), return_parents=True
+        )
     
-    return matching_results, execution_time
+    # The last generation is evaluated for migration anyway; it may hold the best individual
+    fitness_scores = evaluator.evaluate(population, context, parents)
+    best_idx = int(np.argmax(fitness_scores))
+    if fitness_scores[best_idx] > best_fitness:
+        best_fitness = float(fitness_scores[best_idx])
+        best_assignment = population[best_idx].copy()
+    
+    return {
+        "rng": rng,
+        "population": population,
+        "fitness": fitness_scores,
+        "best_fitness": best_fitness,
+        "best_assignment": best_assignment,
+        "cache_delta": _cache_counters(evaluator) - counters,
+    }
 
-def genetic_matching_with_elite(teilaufgaben_df, personen_df, population_size=100, generations=200):
+def _migrate(islands, num_migrants):
     """
-    Enhanced genetic algorithm with elite preservation and adaptive parameters
+    Ring migration: the best individuals of each island replace the worst of the next one
     """
-    print("\n=== Enhanced Genetic Algorithm ===")
-    start_time = time.time()
+    emigrants = [
+        island["population"][np.argsort(island["fitness"])[::-1][:num_migrants]].copy()
+        for island in islands
+    ]
+    for i, island in enumerate(islands):
+        incoming = emigrants[i - 1]
+        worst = np.argsort(island["fitness"])[:len(incoming)]
+        island["population"][worst] = incoming
+
+def _print_epoch(epoch, states):
+    """
+    Progress line after each migration epoch, including fitness cache statistics
+    """
+    best_fitness = max(state["best_fitness"] for state in states)
+    hits, misses, delta = sum(state["cache"] for state in states)
+    lookups = hits + misses
+    hit_rate = hits / lookups if lookups else 0.0
+    print(f"Epoch {epoch}: Best={best_fitness:.1f}, Cache: hit rate {hit_rate:.1%}, delta {delta}")
+
+def island_model_matching(teilaufgaben_df, personen_df, islands=None, generations=200,
+                          migration_interval=20, num_migrants=2, workers=None, seed=None):
+    """
+    Island-model GA: several sub-populations with different parameters evolve in
+    parallel worker processes and exchange elite individuals every migration_interval
+    generations. An island with fewer generations than the others stops evolving
+    and leaves the migration ring once it is done.
     
-    # Run multiple times with different parameters and keep best result
-    best_result = None
-    best_fitness = float('-inf')
+    The MatchingContext (NumPy arrays only) is handed to each worker once, either
+    inherited through fork or via the pool initializer; islands never pickle DataFrames.
+    Per epoch only populations, scores and random generators cross the process
+    boundary.
+    
+    Args:
+        teilaufgaben_df: DataFrame with tasks
+        personen_df: DataFrame with people
+        islands: list of parameter dicts (population_size, generations, mutation_rate,
+                 crossover_rate, tournament_size)
+        generations: generations of islands that do not set their own
+        migration_interval: generations between migrations
+        num_migrants: individuals sent to the neighbouring island per migration
+        workers: worker processes (None = one per island, 1 = run in this process)
+        seed: seed for the island random generators
+        
+    Returns:
+        tuple: (best chromosome, best fitness, execution time)
+    """
+    start_time = time.time()
+    islands = islands or DEFAULT_ISLANDS
+    context = MatchingContext(teilaufgaben_df, personen_df)
+    rngs = [np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(len(islands))]
     
-    # Parameter combinations to try
-    param_combinations = [
-        {"population_size": 50, "generations": 100, "mutation_rate": 0.1},
-        {"population_size": 100, "generations": 150, "mutation_rate": 0.05},
-        {"population_size": 75, "generations": 200, "mutation_rate": 0.15},
+    states = [
+        {
+            "id": island_id,
+            "params": params,
+            "rng": rng,
+            "population": random_population(rng, params.get("population_size", 50), context.num_tasks, context.num_people),
+            "best_fitness": float('-inf'),
+            "best_assignment": None,
+            "remaining": params.get("generations", generations),
+            "cache": np.zeros(len(CACHE_COUNTERS), dtype=np.int64),
+        }
+        for island_id, (params, rng) in enumerate(zip(islands, rngs))
     ]
     
-    for i, params in enumerate(param_combinations):
-        print(f"\nTrying parameter set {i+1}/{len(param_combinations)}")
-        results, _ = genetic_algorithm_matching(
-            teilaufgaben_df, personen_df, **params
-        )
-        
-        # Calculate fitness of this result
-        assignment = []
-        for result in results:
-            task_idx = teilaufgaben_df[teilaufgaben_df['teilaufgabe_id'] == result['teilaufgabe_id']].index[0]
-            person_idx = personen_df[personen_df['id'] == result['person_id']].index[0]
-            assignment.append(person_idx)
-        
-        # Pad assignment if needed
-        while len(assignment) < len(teilaufgaben_df):
-            assignment.append(random.randint(0, len(personen_df) - 1))
-        
-        fitness = calculate_fitness(assignment, teilaufgaben_df, personen_df)
-        
-        if fitness > best_fitness:
-            best_fitness = fitness
-            best_result = results
+    def run_epochs(evolve_all):
+        epoch = 0
+        while True:
+            active = [state for state in states if state["remaining"] > 0]
+            if not active:
+                return
+            epoch_generations = [min(migration_interval, state["remaining"]) for state in active]
+            jobs = [{key: state[key] for key in ("id", "params", "rng", "population", "best_fitness", "best_assignment")}
+                    for state in active]
+            for state, count, result in zip(active, epoch_generations, evolve_all(jobs, epoch_generations)):
+                state["remaining"] -= count
+                state["cache"] = state["cache"] + result.pop("cache_delta")
+                state.update(result)
+            _print_epoch(epoch, states)
+            active = [state for state in active if state["remaining"] > 0]
+            if len(active) > 1:
+                _migrate(active, num_migrants)
+            epoch += 1
     
-    execution_time = time.time() - start_time
-    return best_result, execution_time
+    if workers == 1:
+        _init_island_worker(context)
+        run_epochs(lambda jobs, counts: list(map(_evolve_island, jobs, counts)))
+    else:
+        methods = multiprocessing.get_all_start_methods()
+        mp_context = multiprocessing.get_context("fork" if "fork" in methods else None)
+        with ProcessPoolExecutor(max_workers=workers or len(states), mp_context=mp_context,
+                                 initializer=_init_island_worker, initargs=(context,)) as pool:
+            run_epochs(lambda jobs, counts: list(pool.map(_evolve_island, jobs, counts)))
+    
+    best = max(states, key=lambda state: state["best_fitness"])
+    return best["best_assignment"], best["best_fitness"], time.time() - start_time
+
+def genetic_matching_with_elite(teilaufgaben_df, personen_df, population_size=None, generations=None, workers=None):
+    """
+    Enhanced genetic algorithm with elite preservation and adaptive parameters,
+    run as island model with one island per parameter set (DEFAULT_ISLANDS).
+    population_size and generations override the per-island values when given.
+    """
+    print("\n=== Enhanced Genetic Algorithm ===")
+    
+    overrides = {key: value for key, value in (("population_size", population_size), ("generations", generations))
+                 if value is not None}
+    islands = [{**params, **overrides} for params in DEFAULT_ISLANDS]
+    best_assignment, best_fitness, execution_time = island_model_matching(
+        teilaufgaben_df, personen_df, islands=islands, workers=workers
+    )
+    
+    print(f"Execution time: {execution_time:.3f} seconds")
+    print(f"Best fitness: {best_fitness:.1f}")
+    
+    return assignment_to_results(best_assignment, best_fitness, teilaufgaben_df, personen_df), execution_time
 
 if __name__ == "__main__":
     # Test the algorithm
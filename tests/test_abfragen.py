@@ -0,0 +1,63 @@
+import pytest
+
+pytest.importorskip("flask_sqlalchemy")
+# Die Routen brauchen das installierte Paket "app" samt Datenbankmodellen
+models = pytest.importorskip("app.models")
+
+from flask import Flask  # noqa: E402
+
+from app.abfragen import AbfrageLimitUeberschritten, abfrage_limit  # noqa: E402
+
+# Erwartete SQL-Abfragen je Listen-Endpunkt, unabhängig von der Zeilenzahl
+ABFRAGEN_JE_ENDPUNKT = {
+    "/personen": 2,
+    "/projekte": 2,
+    "/aufgaben": 2,
+    "/zuweisungen": 2,
+}
+
+
+def _app(anzahl):
+    from app.routes import bp
+
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    app.testing = True
+    models.db.init_app(app)
+    app.register_blueprint(bp)
+
+    @app.route("/zu-viele-abfragen")
+    @abfrage_limit(1)
+    def zu_viele_abfragen():
+        models.Person.query.count()
+        models.Aufgabe.query.count()
+        return {}
+
+    with app.app_context():
+        models.db.create_all()
+        for i in range(anzahl):
+            models.db.session.add(models.Projekt(projektname=f"P{i}", projektstart="01.01.25",
+                                                 projektende="31.12.25", anzahl_aufgaben=1, kompetenz="A"))
+            models.db.session.add(models.Person(vorname=f"V{i}", nachname=f"N{i}", kompetenz="C",
+                                                teilzeitfaktor=1.0, verfuegbare_monate="01/2025:1.0,02/2025:1.0"))
+            models.db.session.add(models.Aufgabe(projekt_id=i + 1, aufgabe=f"A{i}", startmonat="01.01.25",
+                                                 endmonat="28.02.25", minimale_kompetenz="B", arbeitsaufwand=0.5))
+        models.db.session.commit()
+    return app
+
+
+@pytest.mark.parametrize("anzahl", [3, 30])
+def test_abfragen_je_endpunkt(anzahl):
+    client = _app(anzahl).test_client()
+    assert client.post("/zuweisungen/automatisch").status_code == 200
+
+    for pfad, erwartet in ABFRAGEN_JE_ENDPUNKT.items():
+        antwort = client.get(pfad)
+        assert antwort.status_code == 200, pfad
+        assert int(antwort.headers["X-Anzahl-Abfragen"]) == erwartet, pfad
+
+
+def test_ueberschreitung_schlaegt_fehl():
+    client = _app(1).test_client()
+    with pytest.raises(AbfrageLimitUeberschritten):
+        client.get("/zu-viele-abfragen")
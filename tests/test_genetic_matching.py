@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+
+from genetic_matching import MatchingContext, calculate_fitness, evaluate_population
+
+
+def _daten():
+    personen = pd.DataFrame({
+        "id": ["p1", "p2", "p3"],
+        "name": ["Eins", "Zwei", "Drei"],
+        "kompetenzen": ["Optik, KI", "Optik", "KI, Stochastik"],
+        "zeitbudget": [1.0, 0.8, 0.5],
+        "verfuegbarkeit_01/2025": [1.0, 1.0, 1.0],
+        "verfuegbarkeit_02/2025": [1.0, 0.5, 1.0],
+        "projektbelegung_01/2025": ["Frei", "Frei", "Frei"],
+        "projektbelegung_02/2025": ["Frei", "Frei", "Frei"],
+    })
+    personen["kompetenzen_liste"] = personen["kompetenzen"].str.split(r",\s*")
+    aufgaben = pd.DataFrame({
+        "bezeichnung": ["Mehrfach", "Einfach"],
+        "kompetenz": ["Optik, KI", "Stochastik"],
+        "aufwand": [0.5, 0.5],
+        "teilaufgabe_id": ["t1", "t2"],
+        "projekt_id": ["X", "X"],
+        "start": ["01/2025", "01/2025"],
+        "ende": ["02/2025", "02/2025"],
+    })
+    return aufgaben, personen
+
+
+def test_skalar_und_batch_gleich_bei_mehrfachkompetenz():
+    aufgaben, personen = _daten()
+    context = MatchingContext(aufgaben, personen)
+    # "Optik, KI" verlangt beide Fachkompetenzen: nur p1 ist geeignet
+    assert context.skill_match[:, 0].tolist() == [True, False, False]
+
+    population = np.array([[a, b] for a in range(4) for b in range(4)], dtype=np.int32)
+    batched = evaluate_population(population, context)
+    skalar = [calculate_fitness(individuum, aufgaben, personen, context=context) for individuum in population]
+    np.testing.assert_allclose(batched, skalar)
@@ -0,0 +1,83 @@
+import os
+import sys
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src.inkrementell import betroffene_projekte, eingaben_aufgaben, eingaben_personen, geaendert  # noqa: E402
+from src.kompetenzindex import Kompetenzindex  # noqa: E402
+from src.projektloesung import loese_projekte  # noqa: E402
+
+
+def _person(id, kompetenz, teilzeitfaktor=1.0):
+    return SimpleNamespace(id=id, kompetenz=kompetenz, teilzeitfaktor=teilzeitfaktor)
+
+
+def _aufgabe(id, projekt_id, minimale_kompetenz, arbeitsaufwand=1.0):
+    return SimpleNamespace(id=id, projekt_id=projekt_id, minimale_kompetenz=minimale_kompetenz,
+                           arbeitsaufwand=arbeitsaufwand)
+
+
+def test_fachkompetenz_aenderung_betrifft_projekt():
+    # "KI, Optik" -> "KI": die Person verliert die Eignung für die Optik-Aufgabe
+    aufgaben = eingaben_aufgaben([_aufgabe(1, 10, "Optik"), _aufgabe(2, 20, "Stochastik")])
+    alt = eingaben_personen([_person(1, "KI, Optik")])
+    neu = eingaben_personen([_person(1, "KI")])
+
+    assert geaendert(alt, neu) == {1}
+    assert betroffene_projekte(alt, neu, aufgaben, aufgaben) == {10}
+
+
+def test_reihenfolge_der_fachkompetenzen_ist_keine_aenderung():
+    alt = eingaben_personen([_person(1, "KI, Optik")])
+    neu = eingaben_personen([_person(1, "Optik,KI")])
+    assert geaendert(alt, neu) == set()
+
+
+def test_kompetenzstufen_wie_bisher():
+    aufgaben = eingaben_aufgaben([_aufgabe(1, 10, "B"), _aufgabe(2, 20, "D"), _aufgabe(3, 30, "KI")])
+    alt = eingaben_personen([_person(1, "C")])
+    neu = eingaben_personen([_person(1, "C", teilzeitfaktor=0.5)])
+    assert betroffene_projekte(alt, neu, aufgaben, aufgaben) == {10}
+
+
+def _loese(personen, aufgaben, projekte=None):
+    """Zuweisung je Projekt wie berechne_zuweisung_pro_projekt (ohne Pool), nur für die angegebenen Projekte."""
+    personen = sorted(personen, key=lambda p: p.id)
+    index = Kompetenzindex.aus_personen(personen)
+    je_projekt = {}
+    for a in sorted(aufgaben, key=lambda a: a.id):
+        if projekte is None or a.projekt_id in projekte:
+            je_projekt.setdefault(a.projekt_id, []).append(a)
+    ergebnis = {}
+    for projekt_id, zuweisungen, _ in loese_projekte(personen, je_projekt, index,
+                                                      index.plaetze([p.id for p in personen]), worker=1):
+        assert not isinstance(zuweisungen, Exception), zuweisungen
+        ergebnis[projekt_id] = sorted(zuweisungen)
+    return ergebnis
+
+
+def test_inkrementell_gleich_vollstaendig():
+    # Aufwände und Teilzeitfaktoren ohne Gleichstände, damit die Optima eindeutig sind
+    personen = [_person(1, "C", 1.0), _person(2, "B", 0.8), _person(3, "KI, Optik", 0.9), _person(4, "A", 0.7)]
+    aufgaben = [
+        _aufgabe(1, 10, "A", 1.3), _aufgabe(2, 10, "B", 2.1), _aufgabe(3, 10, "C", 0.7),
+        _aufgabe(4, 10, "A", 1.9), _aufgabe(5, 10, "B", 2.6),  # mehr Aufgaben als Personen
+        _aufgabe(6, 20, "KI", 1.1), _aufgabe(7, 20, "A", 0.4),
+        _aufgabe(8, 30, "Optik", 3.2),
+        _aufgabe(9, 40, "D", 1.7),
+    ]
+    alt = _loese(personen, aufgaben)
+
+    # Änderungen: Fachkompetenz entfällt, Aufwand ändert sich, eine Person ist für nichts geeignet
+    neue_personen = [_person(1, "C", 1.0), _person(2, "B", 0.8), _person(3, "KI", 0.9), _person(4, "A", 0.7),
+                     _person(5, "Zauberei", 0.6)]
+    neue_aufgaben = [a if a.id != 7 else _aufgabe(7, 20, "A", 0.9) for a in aufgaben]
+
+    betroffen = betroffene_projekte(eingaben_personen(personen), eingaben_personen(neue_personen),
+                                    eingaben_aufgaben(aufgaben), eingaben_aufgaben(neue_aufgaben))
+    assert betroffen == {20, 30}
+
+    inkrementell = {p: z for p, z in alt.items() if p not in betroffen}
+    inkrementell.update(_loese(neue_personen, neue_aufgaben, betroffen))
+    assert inkrementell == _loese(neue_personen, neue_aufgaben)
@@ -0,0 +1,51 @@
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+HIER = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HIER, ".."))
+sys.path.insert(0, os.path.join(HIER, "..", "data"))
+
+from generator import generiere_datensatz  # noqa: E402
+from src.kompetenzindex import Kompetenzindex  # noqa: E402
+from src.stundenengines import verteile_numpy, verteile_python  # noqa: E402
+from src.verfuegbarkeit import Verfuegbarkeitsspeicher  # noqa: E402
+
+
+def _zeilen(anzahl_personen, seed):
+    """Person- und Aufgabe-Zeilen wie nach dem Import eines generierten Datensatzes."""
+    personen_df, teilaufgaben_df, _ = generiere_datensatz(anzahl_personen, aufgaben_je_person=0.5, seed=seed)
+    verf_spalten = [c for c in personen_df.columns if c.startswith("verfuegbarkeit_")]
+    personen = [
+        SimpleNamespace(
+            id=nr, kompetenz=zeile["kompetenzen"], teilzeitfaktor=zeile["zeitbudget"],
+            verfuegbare_monate=",".join(f"{c.split('_', 1)[1]}:{zeile[c]}" for c in verf_spalten),
+        )
+        for nr, zeile in enumerate(personen_df.to_dict("records"), start=1)
+    ]
+    aufgaben = [
+        SimpleNamespace(
+            id=nr, minimale_kompetenz=zeile["kompetenz"], arbeitsaufwand=zeile["aufwand"],
+            startmonat=zeile["start"], endmonat=zeile["ende"],
+        )
+        for nr, zeile in enumerate(teilaufgaben_df.to_dict("records"), start=1)
+    ]
+    return personen, aufgaben
+
+
+@pytest.mark.parametrize("anzahl_personen, seed", [(50, 1), (200, 2), (500, 3)])
+def test_python_und_numpy_gleich(anzahl_personen, seed):
+    personen, aufgaben = _zeilen(anzahl_personen, seed)
+    verfuegbarkeit = Verfuegbarkeitsspeicher().lade(personen)
+    zeilen = [verfuegbarkeit.index[p.id] for p in personen]
+    index = Kompetenzindex.aus_personen(personen)
+    plaetze = index.plaetze([p.id for p in personen])
+
+    python = verteile_python(personen, aufgaben, verfuegbarkeit, zeilen, index, plaetze)
+    matrix = verteile_numpy(personen, aufgaben, verfuegbarkeit, zeilen, index, plaetze)
+
+    assert python
+    assert [(p.id, a.id) for p, a, _ in python] == [(p.id, a.id) for p, a, _ in matrix]
+    assert [s for _, _, s in python] == pytest.approx([s for _, _, s in matrix], abs=1e-6)